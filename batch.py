@@ -0,0 +1,202 @@
+"""
+목록 파일(CSV/JSON) 기반 대량 PDF 생성
+사진별 글귀, 비율, 출력 이름을 목록 파일로 받아 모든 CPU 코어에서 나눠 처리합니다.
+
+CSV 예 (첫 줄은 머리글, caption/ratio/output은 생략 가능):
+    image,caption,ratio,output
+    사진/001.jpg,사랑합니다,60,어머니.pdf
+
+JSON 예:
+    [{"image": "사진/001.jpg", "caption": "사랑합니다", "ratio": 60, "output": "어머니.pdf"}]
+"""
+import csv
+import json
+import os
+import signal
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import renderer
+import timing
+from fonts import setup_pdf_font
+from text_layout import get_metrics
+
+# 목록 한 줄 (image는 절대 경로, output은 출력 폴더 기준 파일 이름)
+BatchJob = namedtuple('BatchJob', 'image caption ratio output')
+
+# 작업 결과 (error가 None이면 성공)
+BatchResult = namedtuple('BatchResult', 'job error seconds truncated')
+
+
+def load_manifest(path, default_ratio=50):
+    """CSV 또는 JSON 목록 파일 읽기 (사진 경로는 목록 파일 위치 기준)"""
+    base_dir = os.path.dirname(os.path.abspath(path))
+
+    if path.lower().endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            rows = json.load(f)
+        if isinstance(rows, dict):
+            rows = rows.get('pages', [])
+        if not isinstance(rows, list):
+            raise ValueError(f"{path}: 항목 목록(JSON 배열)이 아닙니다.")
+    else:
+        # 엑셀에서 저장한 CSV의 BOM도 처리
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.DictReader(f))
+
+    jobs = []
+    used_names = set()
+    for number, row in enumerate(rows, 1):
+        if not isinstance(row, dict):
+            raise ValueError(f"{path} {number}번째 항목이 {{\"image\": ...}} 형식이 아닙니다.")
+        image = (row.get('image') or '').strip()
+        if not image:
+            raise ValueError(f"{path} {number}번째 항목에 image가 없습니다.")
+
+        ratio = row.get('ratio')
+        ratio = int(ratio) if ratio not in (None, '') else default_ratio
+        if not 20 <= ratio <= 80:
+            raise ValueError(f"{path} {number}번째 항목의 ratio는 20에서 80 사이여야 합니다.")
+
+        output = (row.get('output') or '').strip()
+        if not output:
+            output = os.path.splitext(os.path.basename(image))[0] + '.pdf'
+        if not is_inside_output(output):
+            raise ValueError(f"{path} {number}번째 항목의 출력 이름은 출력 폴더 안의 경로여야 합니다: {output}")
+        # Windows에서는 대소문자만 다른 이름도 같은 파일
+        key = os.path.normcase(os.path.normpath(output))
+        if key in used_names:
+            raise ValueError(f"{path} {number}번째 항목의 출력 이름이 중복됩니다: {output}")
+        used_names.add(key)
+
+        jobs.append(BatchJob(
+            os.path.join(base_dir, image),
+            row.get('caption') or '',
+            ratio,
+            output,
+        ))
+    return jobs
+
+
+def is_inside_output(output):
+    """출력 이름이 출력 폴더 안을 가리키는지 (절대 경로나 ..로 벗어나는 경로 거부)"""
+    drive, _ = os.path.splitdrive(output)
+    if drive or os.path.isabs(output):
+        return False
+    parts = os.path.normpath(output).replace('\\', '/').split('/')
+    return parts[0] not in ('..', '.', '')
+
+
+def output_path(output_dir, output):
+    """출력 폴더 기준 파일 경로 (링크를 따라가도 폴더 밖이면 ValueError)"""
+    root = os.path.realpath(output_dir)
+    path = os.path.realpath(os.path.join(root, output))
+    if not is_inside_output(output) or os.path.commonpath([root, path]) != root or path == root:
+        raise ValueError(f"출력 이름이 출력 폴더를 벗어납니다: {output}")
+    return path
+
+
+# 작업 프로세스 설정 (프로세스마다 한 번 초기화)
+_worker_options = {}
+
+
+def _init_worker(output_dir, pagesize, dpi, quality, trace_path=None):
+    """작업 프로세스 초기화: 한글 폰트를 한 번만 등록하고 폭 표를 준비"""
+    # Ctrl+C는 부모 프로세스가 받아 풀을 정리함
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if trace_path:
+        timing.enable(trace_path)
+    _worker_options.update(
+        output_dir=output_dir,
+        pagesize=pagesize,
+        dpi=dpi,
+        quality=quality,
+    )
+    get_metrics(setup_pdf_font())
+
+
+def _render_job(job):
+    """작업 프로세스에서 PDF 한 개 생성 (파일은 작업 프로세스가 직접 저장)"""
+    start = time.perf_counter()
+    try:
+        extra = {}
+        data = renderer.render_pdf(
+            job.image, job.caption, job.ratio,
+            _worker_options['pagesize'],
+            dpi=_worker_options['dpi'],
+            quality=_worker_options['quality'],
+            extra=extra
+        )
+        out_path = output_path(_worker_options['output_dir'], job.output)
+        os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+        with open(out_path, 'wb') as f:
+            f.write(data)
+        fit = extra['layout'].fit
+        return BatchResult(job, None, time.perf_counter() - start, bool(fit and fit.truncated))
+    except Exception as e:
+        return BatchResult(job, str(e), time.perf_counter() - start, False)
+
+
+def start_pool(output_dir, pagesize, dpi, quality, workers):
+    """폰트를 미리 준비한 작업 프로세스 풀 (_render_job을 넣어 사용)"""
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(output_dir, pagesize, dpi, quality, timing.log_path()),
+    )
+
+
+def run_batch(jobs, output_dir, pagesize='A4', dpi=renderer.DEFAULT_DPI,
+              quality=renderer.DEFAULT_JPEG_QUALITY, workers=None, progress=None):
+    """목록의 모든 작업을 프로세스 풀에서 실행하고 BatchResult 목록 반환
+
+    progress가 있으면 작업이 끝날 때마다 (완료 수, 전체 수, BatchResult)로 호출합니다.
+    """
+    pagesize = renderer.resolve_page_size(pagesize)
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    results = []
+    with start_pool(output_dir, pagesize, dpi, quality, workers) as pool:
+        futures = [pool.submit(_render_job, job) for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if progress:
+                progress(len(results), len(jobs), result)
+    return results
+
+
+def run_manifest(args, pagesize):
+    """명령줄 --manifest 처리, 종료 코드 반환"""
+    try:
+        jobs = load_manifest(args.manifest, args.ratio)
+    except (OSError, ValueError) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+
+    def progress(done, total, result):
+        if result.error:
+            print(f"❌ [{done}/{total}] {result.job.image}: {result.error}", file=sys.stderr)
+        else:
+            print(f"✅ [{done}/{total}] {result.job.image} -> {result.job.output}")
+            if result.truncated:
+                print(f"⚠️ {result.job.image}: 글귀가 길어 일부가 잘렸습니다")
+
+    start = time.perf_counter()
+    results = run_batch(
+        jobs, args.output, pagesize,
+        dpi=args.dpi, quality=args.quality,
+        workers=args.workers, progress=progress
+    )
+    elapsed = time.perf_counter() - start
+
+    failures = [r for r in results if r.error]
+    done = len(results) - len(failures)
+    rate = done / elapsed if elapsed > 0 else 0.0
+    print(f"\n완료 {done}장, 실패 {len(failures)}장, {elapsed:.2f}초 ({rate:.1f}장/초)")
+    for result in failures:
+        print(f"  실패: {result.job.image} ({result.error})")
+    return 1 if failures else 0
@@ -0,0 +1,371 @@
+"""
+성능 측정 (벤치마크)
+화면 없이 실행되며, 합성 사진(1~100메가픽셀 JPEG/PNG)과 글귀(0~5000자 한글/영문)로
+디코딩, 미리보기, 줄바꿈, 글자 크기 맞춤, PDF 저장 시간과 결과 크기, 최대 메모리를 잽니다.
+결과는 JSON으로 저장하고, 기준 결과와 비교해 느려졌으면 종료 코드 1을 돌려줍니다.
+
+사용 예:
+    python benchmark.py --quick -o 결과.json
+    python benchmark.py --save-baseline 기준.json
+    python benchmark.py --baseline 기준.json --threshold 0.2
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+# 합성 사진 크기 (메가픽셀)
+PHOTO_SIZES = (1, 12, 50, 100)
+QUICK_PHOTO_SIZES = (1, 12)
+PHOTO_FORMATS = ('JPEG', 'PNG')
+
+# 글귀 길이 (글자 수)
+CAPTION_LENGTHS = (0, 100, 1000, 5000)
+CAPTION_LANGUAGES = ('ko', 'en')
+
+# 사진 측정에 함께 넣는 글귀 길이
+PHOTO_CAPTION_LENGTH = 200
+
+# 기준 대비 이 비율 넘게 나빠지면 실패
+DEFAULT_THRESHOLD = 0.25
+
+# 이보다 작은 차이는 측정 오차로 보고 무시
+MIN_TIME_DELTA = 0.005          # 초
+MIN_BYTES_DELTA = 256 * 1024    # 바이트
+
+# 글귀 생성용 낱말
+_WORDS = {
+    'ko': ("사랑하는", "우리", "어머니", "생신을", "진심으로", "축하드립니다.",
+           "언제나", "건강하시고", "행복한", "하루", "되세요.", "고맙습니다."),
+    'en': ("Dear", "mother,", "happy", "birthday", "and", "thank", "you",
+           "for", "everything.", "Stay", "healthy", "always."),
+}
+
+# 디코딩 측정 시 화면 미리보기 크기 (display_image와 같은 범위)
+DISPLAY_SIZE = (560, 110)
+
+
+def make_caption(language, length):
+    """정해진 길이의 글귀 생성 (매번 같은 결과, 약 200자마다 줄바꿈)"""
+    words = _WORDS[language]
+    parts = []
+    total = 0
+    i = 0
+    while total < length:
+        word = words[i % len(words)]
+        sep = "\n" if i and i % 40 == 0 else " "
+        parts.append((sep if parts else "") + word)
+        total += len(parts[-1])
+        i += 1
+    return "".join(parts)[:length]
+
+
+def make_photo(folder, megapixels, fmt):
+    """합성 사진 파일 생성 (있으면 재사용), 경로 반환
+
+    그러데이션 두 채널과 잡음 한 채널을 합쳐 실제 사진처럼 압축이 덜 되게 만듭니다.
+    """
+    ext = '.jpg' if fmt == 'JPEG' else '.png'
+    path = os.path.join(folder, f"photo_{megapixels}mp{ext}")
+    if os.path.exists(path):
+        return path
+
+    from PIL import Image
+
+    width = int(round(math.sqrt(megapixels * 1e6 * 4 / 3)))
+    height = int(round(width * 3 / 4))
+    gradient = Image.linear_gradient('L')
+    red = gradient.resize((width, height))
+    green = gradient.rotate(90).resize((width, height))
+    blue = Image.effect_noise((width, height), 48)
+    image = Image.merge('RGB', (red, green, blue))
+
+    os.makedirs(folder, exist_ok=True)
+    tmp = path + '.tmp'
+    if fmt == 'JPEG':
+        image.save(tmp, 'JPEG', quality=90)
+    else:
+        image.save(tmp, 'PNG', compress_level=6)
+    os.replace(tmp, path)
+    return path
+
+
+def _median_time(func, repeat):
+    """func를 repeat번 실행한 시간의 중앙값 (초)과 마지막 결과"""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def _peak_rss():
+    """현재 프로세스 최대 메모리 사용량 (바이트, 측정할 수 없으면 None)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _photo_case(path, caption, repeat):
+    """사진 한 장 측정 (별도 프로세스에서 실행해 최대 메모리를 따로 잼)"""
+    import tempfile
+
+    # 사용자의 축소본 캐시를 건드리지 않도록 임시 캐시 폴더 사용
+    cache = tempfile.TemporaryDirectory(prefix="benchmark_cache_")
+    os.environ['PHOTO_PDF_CACHE'] = cache.name
+
+    import image_asset
+    import renderer
+    import thumb_cache
+
+    # 폰트 준비는 측정에서 제외
+    renderer.warm_up()
+    result = {'file_bytes': os.path.getsize(path)}
+
+    def decode():
+        image_asset.clear_cache()
+        thumb_cache.clear_cache()
+        return image_asset.get_asset(path).fit(*DISPLAY_SIZE)
+
+    def reopen():
+        # 다음 날 같은 사진을 다시 여는 경우 (디스크 축소본 사용)
+        image_asset.clear_cache()
+        return image_asset.get_asset(path).fit(*DISPLAY_SIZE)
+
+    result['decode_s'], _ = _median_time(decode, repeat)
+    result['reopen_s'], _ = _median_time(reopen, repeat)
+
+    # 이후 측정은 세션처럼 디코딩된 사진을 재사용
+    image_asset.get_asset(path).fit(*DISPLAY_SIZE)
+    result['preview_s'], _ = _median_time(
+        lambda: renderer.render_preview(path, caption, 50), repeat)
+    result['pdf_write_s'], data = _median_time(
+        lambda: renderer.render_pdf(path, caption, 50), repeat)
+    result['pdf_bytes'] = len(data)
+    result['peak_rss_bytes'] = _peak_rss()
+    image_asset.clear_cache()
+    cache.cleanup()
+    return result
+
+
+def _text_case(caption, photo, repeat):
+    """글귀 하나 측정: 줄바꿈, 글자 크기 맞춤, PDF 저장"""
+    import tracemalloc
+
+    import renderer
+    from text_layout import clear_wrap_cache, get_metrics, fit_text, wrap_text
+
+    metrics = get_metrics(renderer.warm_up())
+    width, height = renderer.A4
+    max_width = width - 50
+    max_height = (height - 75) / 2
+
+    def cold(func):
+        # 문단 캐시 없이 처음부터 나누는 시간
+        def run():
+            clear_wrap_cache()
+            return func()
+        return run
+
+    result = {}
+    result['layout_s'], lines = _median_time(
+        cold(lambda: wrap_text(caption, metrics, 12, max_width)), repeat)
+    result['lines'] = len(lines)
+    result['fit_s'], fit = _median_time(
+        cold(lambda: fit_text(caption, metrics, max_width, max_height)), repeat)
+    result['font_size'] = fit.font_size
+
+    # 글귀 가운데에 한 글자씩 입력할 때 (앞선 입력의 문단 캐시 사용)
+    middle = len(caption) // 2
+    edits = [caption[:middle] + caption[middle:middle + 1] * k + caption[middle:]
+             for k in range(1, repeat + 2)]
+    fit_text(edits[0], metrics, max_width, max_height)
+    edits = iter(edits[1:])
+    result['edit_s'], _ = _median_time(
+        lambda: fit_text(next(edits), metrics, max_width, max_height), repeat)
+    result['pdf_write_s'], data = _median_time(
+        lambda: renderer.render_pdf(photo, caption, 50), repeat)
+    result['pdf_bytes'] = len(data)
+
+    # 파이썬 객체 최대 메모리 (줄바꿈/맞춤 과정)
+    tracemalloc.start()
+    clear_wrap_cache()
+    fit_text(caption, metrics, max_width, max_height)
+    result['peak_alloc_bytes'] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result
+
+
+def _font_case():
+    """새 프로세스에서 한글 폰트 준비 시간 (디스크 캐시 포함)"""
+    start = time.perf_counter()
+    import renderer
+    renderer.warm_up()
+    return {'font_load_s': time.perf_counter() - start}
+
+
+def _in_child(func, *args):
+    """새 프로세스에서 func 실행 (캐시와 메모리 측정을 케이스마다 분리)"""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(func, *args).result()
+
+
+def run_benchmarks(work_dir, sizes=PHOTO_SIZES, lengths=CAPTION_LENGTHS,
+                   repeat=3, log=print):
+    """모든 측정 실행, {케이스 이름: {지표: 값}} 반환"""
+    cases = {}
+
+    log("폰트 준비 측정")
+    cases['font'] = _in_child(_font_case)
+
+    photo_caption = make_caption('ko', PHOTO_CAPTION_LENGTH)
+    for megapixels in sizes:
+        for fmt in PHOTO_FORMATS:
+            name = f"photo-{megapixels}mp-{fmt.lower()}"
+            log(f"{name}: 사진 준비 중")
+            path = make_photo(work_dir, megapixels, fmt)
+            log(f"{name}: 측정 중")
+            cases[name] = _in_child(_photo_case, path, photo_caption, repeat)
+
+    small_photo = make_photo(work_dir, min(sizes), 'JPEG')
+    for language in CAPTION_LANGUAGES:
+        for length in lengths:
+            name = f"text-{language}-{length}"
+            log(f"{name}: 측정 중")
+            cases[name] = _in_child(_text_case, make_caption(language, length), small_photo, repeat)
+    return cases
+
+
+def environment_info():
+    """측정 환경 정보"""
+    import PIL
+    import reportlab
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'pillow': PIL.__version__,
+        'reportlab': reportlab.Version,
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """기준 대비 나빠진 지표 목록 [(케이스, 지표, 기준값, 현재값)]"""
+    regressions = []
+    for case, metrics in current.items():
+        base_metrics = baseline.get(case)
+        if not base_metrics:
+            continue
+        for metric, value in metrics.items():
+            base = base_metrics.get(metric)
+            if value is None or base is None:
+                continue
+            if metric.endswith('_s'):
+                floor = MIN_TIME_DELTA
+            elif metric.endswith('_bytes'):
+                floor = MIN_BYTES_DELTA
+            else:
+                continue  # 줄 수, 글자 크기 등은 참고용
+            if value > base * (1 + threshold) and value - base > floor:
+                regressions.append((case, metric, base, value))
+    return regressions
+
+
+def format_value(metric, value):
+    """지표 값을 읽기 쉬운 문자열로"""
+    if value is None:
+        return "-"
+    if metric.endswith('_s'):
+        return f"{value * 1000:.1f}ms"
+    if metric.endswith('_bytes'):
+        import renderer
+        return renderer.format_size(value)
+    return str(value)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="benchmark.py",
+        description="사진 PDF 출력기 성능 측정 (화면 없이 실행)"
+    )
+    parser.add_argument("-o", "--output", default="benchmark.json",
+                        help="결과 JSON 파일 (기본 benchmark.json)")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON")
+    parser.add_argument("--save-baseline", metavar="파일",
+                        help="이번 결과를 기준 결과로도 저장")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"실패로 볼 악화 비율 (기본 {DEFAULT_THRESHOLD})")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="지표마다 반복 횟수, 중앙값 사용 (기본 3)")
+    parser.add_argument("--quick", action="store_true",
+                        help=f"작은 사진({', '.join(map(str, QUICK_PHOTO_SIZES))}MP)만 측정")
+    parser.add_argument("--sizes", help="사진 크기 목록 (메가픽셀, 쉼표 구분, 예: 1,12,50)")
+    parser.add_argument("--work-dir", default=os.path.join("benchmark_data"),
+                        help="합성 사진을 보관할 폴더 (다음 실행에 재사용)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.sizes:
+        sizes = tuple(int(s) for s in args.sizes.split(',') if s.strip())
+    else:
+        sizes = QUICK_PHOTO_SIZES if args.quick else PHOTO_SIZES
+
+    def log(message):
+        print(message, file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    cases = run_benchmarks(args.work_dir, sizes, repeat=max(1, args.repeat), log=log)
+    report = {
+        'environment': environment_info(),
+        'repeat': args.repeat,
+        'elapsed_s': time.perf_counter() - start,
+        'cases': cases,
+    }
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    for case, metrics in cases.items():
+        values = ", ".join(f"{m}={format_value(m, v)}" for m, v in metrics.items())
+        print(f"{case:<20} {values}")
+    print(f"\n결과 저장: {args.output} ({report['elapsed_s']:.1f}초)")
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(cases, baseline.get('cases', {}), args.threshold)
+    if not regressions:
+        print(f"✅ 기준({args.baseline}) 대비 {args.threshold:.0%} 넘게 나빠진 지표가 없습니다.")
+        return 0
+
+    print(f"❌ 기준({args.baseline}) 대비 {args.threshold:.0%} 넘게 나빠진 지표 {len(regressions)}개:")
+    for case, metric, base, value in regressions:
+        print(f"  {case} {metric}: {format_value(metric, base)} -> {format_value(metric, value)} "
+              f"(+{(value / base - 1) * 100:.0f}%)")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,326 @@
+"""
+명령줄 일괄 변환 모드
+GUI 없이 여러 장의 사진을 PDF(또는 미리보기 PNG)로 변환합니다.
+
+사용 예:
+    python main.py 사진1.jpg 사진2.jpg --text "사랑합니다" -o 출력폴더
+    python main.py *.jpg --text-file 글귀.txt --ratio 60 --page A5
+    python main.py 앨범/*.jpg --album 앨범.pdf
+    python main.py 영정.jpg --text "삼가 고인의 명복을 빕니다" --copies 20 --per-sheet 4
+    python main.py 앨범/*.jpg --album 앨범.pdf --max-size 1MB
+    python main.py --manifest 목록.csv -o 출력폴더 --workers 16
+    python main.py --watch 받은사진 -o 완성PDF --print
+    python main.py --serve 8765 --workers 4
+"""
+import argparse
+import os
+import sys
+import time
+
+import renderer
+
+
+def build_parser():
+    """명령줄 인자 정의"""
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="사진과 글귀로 PDF를 일괄 생성합니다. (인자가 없으면 GUI 실행)"
+    )
+    parser.add_argument("images", nargs="*", help="변환할 사진 파일")
+    parser.add_argument("--manifest", metavar="목록.csv|목록.json",
+                        help="사진별 글귀/비율/출력 이름이 담긴 목록 파일 (여러 프로세스로 처리)")
+    parser.add_argument("--watch", metavar="입력폴더",
+                        help="폴더를 계속 감시하며 들어오는 사진마다 PDF 생성 (Ctrl+C로 종료)")
+    parser.add_argument("--print", nargs="?", const="", default=None, metavar="인쇄방식",
+                        help="--watch에서 만든 PDF를 바로 인쇄 (예: cups:프린터, spool:폴더, 생략 시 기본 프린터)")
+    parser.add_argument("--serve", metavar="[호스트:]포트",
+                        help="사진을 받아 PDF/미리보기를 돌려주는 로컬 HTTP 서비스 실행 (예: 8765)")
+    parser.add_argument("--max-queue", type=int, default=None, metavar="N",
+                        help="--serve에서 작업자 외에 기다릴 수 있는 요청 수 (기본: 작업자 수의 2배)")
+    text_group = parser.add_mutually_exclusive_group()
+    text_group.add_argument("--text", default="", help="모든 페이지에 넣을 글귀")
+    text_group.add_argument("--text-file", help="글귀가 들어 있는 텍스트 파일 (UTF-8)")
+    parser.add_argument("--ratio", type=int, default=50,
+                        help="사진 크기 비율 20~80 (기본 50)")
+    parser.add_argument("--page", default="A4",
+                        help=f"용지 크기 ({', '.join(renderer.PAGE_SIZES)})")
+    parser.add_argument("--dpi", type=int, default=renderer.DEFAULT_DPI,
+                        help=f"인쇄용 사진 해상도 (예: 150/300/600, 0이면 원본 그대로, 기본 {renderer.DEFAULT_DPI})")
+    parser.add_argument("--quality", type=int, default=renderer.DEFAULT_JPEG_QUALITY,
+                        help=f"사진 JPEG 품질 1~95 (기본 {renderer.DEFAULT_JPEG_QUALITY})")
+    parser.add_argument("--max-size", metavar="크기",
+                        help="PDF 파일 최대 크기 (예: 1MB, 500KB). 넘치면 사진 해상도/품질/흑백을 골라 줄임")
+    parser.add_argument("-o", "--output", default=".",
+                        help="출력 폴더 (기본: 현재 폴더)")
+    parser.add_argument("--preview", action="store_true",
+                        help="PDF 대신 인쇄 미리보기 PNG 저장")
+    parser.add_argument("--album", metavar="파일이름.pdf",
+                        help="모든 사진을 한 장씩 담은 여러 페이지 PDF 하나로 저장")
+    parser.add_argument("--copies", type=int, default=1,
+                        help=f"사진마다 인쇄할 매수 1~{renderer.MAX_COPIES} (사진은 한 번만 넣음, 기본 1)")
+    parser.add_argument("--per-sheet", type=int, default=1, choices=sorted(renderer.SHEET_LAYOUTS),
+                        help="용지 한 장에 넣을 장수 (2장이면 A5, 4장이면 A6 크기 카드, 기본 1)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="동시에 처리할 작업 수 (기본: CPU 코어 수)")
+    parser.add_argument("--trace", nargs="?", const="1", metavar="기록.jsonl",
+                        help="단계별 처리 시간을 JSON Lines로 기록 (경로 생략 시 캐시 폴더의 trace.jsonl)")
+    parser.add_argument("--memory-mb", type=int, default=None, metavar="MB",
+                        help="사진 한 장을 풀 때 쓸 최대 메모리 (기본 512, 넘으면 줄여서 읽음)")
+    return parser
+
+
+def run(argv=None):
+    """일괄 변환 실행, 종료 코드 반환"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if not args.images and not args.manifest and not args.watch and not args.serve:
+        parser.error("사진 파일, --manifest 목록 파일, --watch 폴더 또는 --serve 포트를 지정하세요.")
+
+    if args.trace:
+        import timing
+        print(f"단계별 시간 기록: {timing.enable(args.trace)}")
+
+    if args.memory_mb:
+        import large_image
+        # 작업 프로세스도 같은 한도를 쓰도록 환경 변수로 전달
+        os.environ["PHOTO_PDF_MEMORY_MB"] = str(args.memory_mb)
+        large_image.set_memory_budget(args.memory_mb)
+
+    if not 20 <= args.ratio <= 80:
+        print("오류: --ratio 값은 20에서 80 사이여야 합니다.", file=sys.stderr)
+        return 2
+
+    if not 1 <= args.copies <= renderer.MAX_COPIES:
+        print(f"오류: --copies 값은 1에서 {renderer.MAX_COPIES} 사이여야 합니다.", file=sys.stderr)
+        return 2
+
+    text = args.text
+    if args.text_file:
+        with open(args.text_file, encoding="utf-8") as f:
+            text = f.read()
+
+    try:
+        pagesize = renderer.resolve_page_size(args.page)
+    except ValueError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+
+    if args.dpi < 0 or not 1 <= args.quality <= 95:
+        print("오류: --dpi는 0 이상, --quality는 1에서 95 사이여야 합니다.", file=sys.stderr)
+        return 2
+
+    import size_budget
+    try:
+        args.max_bytes = size_budget.parse_size(args.max_size)
+    except ValueError as e:
+        print(f"오류: --max-size {e}", file=sys.stderr)
+        return 2
+    if args.max_bytes and (args.manifest or args.watch or args.serve or args.preview):
+        print("오류: --max-size는 사진 파일이나 --album으로 PDF를 만들 때만 쓸 수 있습니다.", file=sys.stderr)
+        return 2
+
+    os.makedirs(args.output, exist_ok=True)
+
+    sheets = args.copies > 1 or args.per_sheet > 1
+    if sheets and (args.manifest or args.preview):
+        print("오류: --copies/--per-sheet는 --manifest, --preview와 함께 쓸 수 없습니다.", file=sys.stderr)
+        return 2
+
+    if args.serve:
+        if args.images or args.manifest or args.watch or args.album or args.preview or sheets:
+            print("오류: --serve는 사진 파일, --manifest, --watch, --album, --preview, "
+                  "--copies/--per-sheet와 함께 쓸 수 없습니다.", file=sys.stderr)
+            return 2
+        return run_serve(args, pagesize)
+    if args.max_queue is not None:
+        print("오류: --max-queue는 --serve와 함께 써야 합니다.", file=sys.stderr)
+        return 2
+
+    if args.watch:
+        if args.images or args.manifest or args.album or args.preview or sheets:
+            print("오류: --watch는 사진 파일, --manifest, --album, --preview, --copies/--per-sheet와 "
+                  "함께 쓸 수 없습니다.", file=sys.stderr)
+            return 2
+        return run_watch(args, text, pagesize)
+    if args.print is not None:
+        print("오류: --print는 --watch와 함께 써야 합니다.", file=sys.stderr)
+        return 2
+
+    if args.manifest:
+        if args.images or args.album or args.preview:
+            print("오류: --manifest는 사진 파일, --album, --preview와 함께 쓸 수 없습니다.", file=sys.stderr)
+            return 2
+        import batch
+        return batch.run_manifest(args, pagesize)
+
+    if args.album:
+        if args.preview:
+            print("오류: --album과 --preview는 함께 쓸 수 없습니다.", file=sys.stderr)
+            return 2
+        return run_album(args, text, pagesize)
+    ext = ".png" if args.preview else ".pdf"
+
+    done = 0
+    failures = []
+    original_bytes = 0
+    embedded_bytes = 0
+    start = time.perf_counter()
+
+    for image_path in args.images:
+        stem = os.path.splitext(os.path.basename(image_path))[0]
+        out_path = os.path.join(args.output, stem + ext)
+        try:
+            if args.preview:
+                preview = renderer.render_preview(image_path, text, args.ratio, pagesize=pagesize)
+                preview.save(out_path)
+                truncated = preview.info['truncated']
+            elif sheets:
+                data, extra = render_limited(args, image_path, lambda dpi, quality, gray, extra, reencode: (
+                    renderer.render_copies_pdf(
+                        [(image_path, text, args.ratio)], args.copies, args.per_sheet, pagesize,
+                        dpi=dpi, quality=quality, extra=extra, gray=gray, reencode=reencode
+                    )))
+                with open(out_path, "wb") as f:
+                    f.write(data)
+                original_bytes += extra['embeds'][0].original_bytes
+                embedded_bytes += extra['embeds'][0].embedded_bytes
+                fit = extra['layouts'][0].fit
+                truncated = bool(fit and fit.truncated)
+            else:
+                data, extra = render_limited(args, image_path, lambda dpi, quality, gray, extra, reencode: (
+                    renderer.render_pdf(
+                        image_path, text, args.ratio, pagesize,
+                        dpi=dpi, quality=quality, extra=extra, gray=gray, reencode=reencode
+                    )))
+                with open(out_path, "wb") as f:
+                    f.write(data)
+                original_bytes += extra['embed'].original_bytes
+                embedded_bytes += extra['embed'].embedded_bytes
+                truncated = bool(extra['layout'].fit and extra['layout'].fit.truncated)
+            done += 1
+            print(f"✅ {image_path} -> {out_path}")
+            if truncated:
+                print(f"⚠️ {image_path}: 글귀가 길어 일부가 잘렸습니다")
+        except Exception as e:
+            failures.append(image_path)
+            print(f"❌ {image_path}: {e}", file=sys.stderr)
+
+    elapsed = time.perf_counter() - start
+    rate = done / elapsed if elapsed > 0 else 0.0
+    print(f"\n완료 {done}장, 실패 {len(failures)}장, {elapsed:.2f}초 ({rate:.1f}장/초)")
+    if embedded_bytes < original_bytes:
+        print(f"사진 용량 {renderer.format_size(original_bytes)} -> "
+              f"{renderer.format_size(embedded_bytes)} "
+              f"({renderer.format_size(original_bytes - embedded_bytes)} 절약)")
+    return 1 if failures else 0
+
+
+def run_album(args, text, pagesize):
+    """모든 사진을 여러 페이지 PDF 하나로 저장"""
+    out_path = os.path.join(args.output, args.album)
+    pages = [(image_path, text, args.ratio) for image_path in args.images]
+    start = time.perf_counter()
+
+    def render(dpi, quality, gray, extra, reencode):
+        if args.copies > 1 or args.per_sheet > 1:
+            return renderer.render_copies_pdf(
+                pages, args.copies, args.per_sheet, pagesize,
+                dpi=dpi, quality=quality,
+                workers=args.workers, extra=extra, gray=gray, reencode=reencode
+            )
+        return renderer.render_album_pdf(
+            pages, pagesize,
+            dpi=dpi, quality=quality,
+            workers=args.workers, extra=extra, gray=gray, reencode=reencode
+        )
+
+    try:
+        data, extra = render_limited(args, out_path, render)
+        with open(out_path, "wb") as f:
+            f.write(data)
+    except Exception as e:
+        print(f"❌ {out_path}: {e}", file=sys.stderr)
+        return 1
+
+    elapsed = time.perf_counter() - start
+    for image_path, layout in zip(args.images, extra['layouts']):
+        if layout.fit and layout.fit.truncated:
+            print(f"⚠️ {image_path}: 글귀가 길어 일부가 잘렸습니다")
+
+    embed = renderer.total_embed(extra['embeds'])
+    rate = len(pages) / elapsed if elapsed > 0 else 0.0
+    print(f"✅ {len(pages)}쪽 -> {out_path}")
+    print(f"\n{elapsed:.2f}초 ({rate:.1f}쪽/초), PDF {renderer.format_size(len(data))}")
+    if embed.embedded_bytes < embed.original_bytes:
+        print(f"사진 용량 {renderer.format_size(embed.original_bytes)} -> "
+              f"{renderer.format_size(embed.embedded_bytes)}")
+    return 0
+
+
+def render_limited(args, label, render):
+    """render(dpi, quality, gray, extra, reencode)로 PDF 생성 -> (바이트, extra)
+
+    --max-size가 있으면 그 크기 안에 들도록 설정을 골라 다시 만들고 고른 설정을 출력합니다.
+    """
+    if not args.max_bytes:
+        extra = {}
+        return render(args.dpi, args.quality, False, extra, False), extra
+
+    import size_budget
+
+    data, extra, choice = size_budget.render_within(render, args.max_bytes, args.dpi, args.quality)
+    if choice.attempts > 1:
+        print(f"📦 {label}: {size_budget.describe(choice)}")
+    return data, extra
+
+
+def run_watch(args, text, pagesize):
+    """핫 폴더 감시 모드 (Ctrl+C까지 실행)"""
+    import watch
+
+    if not os.path.isdir(args.watch):
+        print(f"오류: 입력 폴더가 없습니다: {args.watch}", file=sys.stderr)
+        return 2
+    if os.path.abspath(args.watch) == os.path.abspath(args.output):
+        print("오류: 입력 폴더와 출력 폴더는 달라야 합니다.", file=sys.stderr)
+        return 2
+
+    backend = None
+    if args.print is not None:
+        import printing
+        try:
+            backend = printing.get_backend(args.print or None)
+        except printing.PrintError as e:
+            print(f"오류: {e}", file=sys.stderr)
+            return 2
+
+    service = watch.HotFolder(
+        args.watch, args.output, text=text, ratio=args.ratio, pagesize=pagesize,
+        dpi=args.dpi, quality=args.quality, workers=args.workers, backend=backend)
+    service.run()
+    return 1 if service.failed else 0
+
+
+def run_serve(args, pagesize):
+    """로컬 HTTP 변환 서비스 (Ctrl+C까지 실행)"""
+    import server
+
+    try:
+        host, port = server.parse_address(args.serve)
+    except ValueError as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+    if args.max_queue is not None and args.max_queue < 0:
+        print("오류: --max-queue는 0 이상이어야 합니다.", file=sys.stderr)
+        return 2
+    try:
+        return server.serve(host, port, pagesize=pagesize, dpi=args.dpi, quality=args.quality,
+                            workers=args.workers, max_queue=args.max_queue)
+    except OSError as e:
+        print(f"오류: {host}:{port}에서 서비스를 열 수 없습니다: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(run())
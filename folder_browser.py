@@ -0,0 +1,354 @@
+"""
+폴더 사진 둘러보기 창
+폴더 안의 사진을 축소본 격자로 보여줘 파일 대화상자를 여러 번 열지 않고 고를 수 있습니다.
+
+축소본은 화면에 보이는 칸(과 위아래 몇 줄)만, 보이는 곳에 가까운 줄부터
+정해진 수의 작업 스레드에서 만듭니다. 스크롤해서 벗어난 칸의 작업은
+시작 전이면 취소됩니다. 큰 사진은 디스크 축소본 캐시를 거치므로
+고른 사진을 화면에 띄울 때 원본을 다시 디코딩하지 않습니다.
+"""
+import os
+import threading
+import tkinter as tk
+
+# 격자 칸 크기 (픽셀): 축소본 + 파일 이름
+THUMB_SIZE = 128
+CELL_WIDTH = THUMB_SIZE + 16
+CELL_HEIGHT = THUMB_SIZE + 36
+
+# 축소본을 만드는 작업 스레드 수
+THUMB_WORKERS = 2
+
+# 보이는 줄 위아래로 미리 만들 줄 수
+PREFETCH_ROWS = 2
+
+# 선택한 칸 테두리 색
+SELECTED_COLOR = "#2196F3"
+
+
+def list_images(folder, extensions):
+    """폴더 안의 사진 파일 경로 (이름순)"""
+    try:
+        names = sorted(os.listdir(folder), key=str.lower)
+    except OSError:
+        return []
+    return [
+        os.path.join(folder, name) for name in names
+        if name.lower().endswith(extensions) and os.path.isfile(os.path.join(folder, name))
+    ]
+
+
+def make_thumbnail(path, size=THUMB_SIZE):
+    """격자에 보여줄 축소본 (PIL 이미지)
+
+    세션 사진 캐시를 밀어내지 않도록 자원을 따로 열고 바로 닫습니다.
+    """
+    from image_asset import ImageAsset
+
+    asset = ImageAsset.from_path(path)
+    try:
+        return asset.fit(size, size)
+    finally:
+        asset.close()
+
+
+class ThumbnailLoader:
+    """요청한 순서대로 축소본을 만드는 작업 스레드 묶음
+
+    request()로 새 목록을 주면 아직 시작하지 않은 이전 요청은 버립니다.
+    결과는 Tk 메인 스레드에서 on_ready(경로, 이미지 또는 None)로 전달됩니다.
+    """
+
+    def __init__(self, root, on_ready, size=THUMB_SIZE, workers=THUMB_WORKERS):
+        self.root = root
+        self.on_ready = on_ready
+        self.size = size
+        self._cond = threading.Condition()
+        self._wanted = []       # 처리할 경로 (앞에서부터)
+        self._started = set()   # 시작했거나 끝난 경로 (다시 만들지 않음)
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._run, name=f"thumb-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def request(self, paths):
+        """만들 축소본 목록 교체 (목록에 없는 대기 작업은 취소)"""
+        with self._cond:
+            self._wanted = [p for p in paths if p not in self._started]
+            self._cond.notify_all()
+
+    def reset(self):
+        """대기 작업과 처리 기록 모두 지우기 (다른 폴더를 열 때)"""
+        with self._cond:
+            self._wanted = []
+            self._started = set()
+
+    def close(self):
+        """작업 스레드 종료"""
+        with self._cond:
+            self._closed = True
+            self._wanted = []
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._wanted and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                path = self._wanted.pop(0)
+                self._started.add(path)
+
+            try:
+                image = make_thumbnail(path, self.size)
+            except Exception:
+                image = None  # 읽을 수 없는 사진은 칸에 표시만
+
+            try:
+                self.root.after(0, self.on_ready, path, image)
+            except RuntimeError:
+                return  # 메인 루프가 이미 종료됨
+
+
+class FolderBrowser:
+    """폴더 사진 격자 창
+
+    사진을 눌러 고르고(다시 누르면 해제) "선택한 사진 사용"을 누르거나,
+    사진을 두 번 눌러 그 사진 한 장으로 바로 시작합니다.
+    on_open은 고른 사진 경로 목록으로 호출됩니다.
+    """
+
+    def __init__(self, root, on_open, extensions):
+        self.root = root
+        self.on_open = on_open
+        self.extensions = extensions
+        self.paths = []
+        self.selected = []
+        self.columns = 1
+        self._cells = {}       # 경로 -> (테두리, 이미지, 이름) 캔버스 항목
+        self._photos = {}      # 경로 -> ImageTk.PhotoImage (참조 유지)
+        self._update_pending = False
+
+        self.window = tk.Toplevel(root)
+        self.window.title("폴더에서 사진 고르기")
+        self.window.geometry("820x640")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        toolbar = tk.Frame(self.window)
+        toolbar.pack(fill="x", padx=10, pady=8)
+
+        folder_button = tk.Button(
+            toolbar,
+            text="📂 다른 폴더",
+            font=('맑은 고딕', 12),
+            command=self.choose_folder,
+            cursor="hand2"
+        )
+        folder_button.pack(side="left")
+
+        self.folder_label = tk.Label(toolbar, text="", font=('맑은 고딕', 11), fg="gray", anchor="w")
+        self.folder_label.pack(side="left", fill="x", expand=True, padx=10)
+
+        self.open_button = tk.Button(
+            toolbar,
+            text="선택한 사진 사용",
+            font=('맑은 고딕', 12, 'bold'),
+            command=self.open_selected,
+            bg="#4CAF50",
+            fg="white",
+            cursor="hand2",
+            state="disabled"
+        )
+        self.open_button.pack(side="right")
+
+        grid_frame = tk.Frame(self.window)
+        grid_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+        self.canvas = tk.Canvas(grid_frame, bg="white", highlightthickness=0)
+        self.scrollbar = tk.Scrollbar(grid_frame, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self.on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.canvas.bind("<Configure>", lambda event: self.relayout())
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<Double-Button-1>", self.on_double_click)
+        # 마우스 휠 (Windows/macOS는 MouseWheel, Linux는 Button-4/5)
+        self.canvas.bind("<MouseWheel>", lambda event: self.scroll(-1 if event.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda event: self.scroll(-1))
+        self.canvas.bind("<Button-5>", lambda event: self.scroll(1))
+
+        self.loader = ThumbnailLoader(root, self.on_thumbnail)
+
+    @property
+    def closed(self):
+        return self.loader is None
+
+    def show(self, folder):
+        """폴더 열기 (창을 앞으로)"""
+        self.window.deiconify()
+        self.window.lift()
+        self.load_folder(folder)
+
+    def choose_folder(self):
+        from tkinter import filedialog
+
+        folder = filedialog.askdirectory(title="사진 폴더를 선택하세요", parent=self.window)
+        if folder:
+            self.load_folder(folder)
+
+    def load_folder(self, folder):
+        """폴더의 사진 목록으로 격자 다시 만들기"""
+        self.loader.reset()
+        self.paths = list_images(folder, self.extensions)
+        self.selected = []
+        self._photos = {}
+        self.folder_label.config(text=f"{folder}  ({len(self.paths)}장)")
+        self.update_open_button()
+        self.canvas.yview_moveto(0)
+        self.relayout(force=True)
+
+    def relayout(self, force=False):
+        """창 너비에 맞춰 칸 배치 (사진 수만큼 빈 칸을 먼저 그림)"""
+        columns = max(1, self.canvas.winfo_width() // CELL_WIDTH)
+        if columns == self.columns and not force:
+            self.schedule_update()
+            return
+        self.columns = columns
+
+        self.canvas.delete("all")
+        self._cells = {}
+        for index, path in enumerate(self.paths):
+            x, y = self.cell_origin(index)
+            border = self.canvas.create_rectangle(
+                x + 2, y + 2, x + CELL_WIDTH - 2, y + CELL_HEIGHT - 2,
+                outline=SELECTED_COLOR if path in self.selected else "#DDDDDD",
+                width=3 if path in self.selected else 1
+            )
+            image = self.canvas.create_image(
+                x + CELL_WIDTH // 2, y + 8 + THUMB_SIZE // 2,
+                image=self._photos.get(path, "")
+            )
+            name = os.path.basename(path)
+            if len(name) > 18:
+                name = name[:8] + "…" + name[-8:]
+            label = self.canvas.create_text(
+                x + CELL_WIDTH // 2, y + THUMB_SIZE + 22,
+                text=name, font=('맑은 고딕', 9)
+            )
+            self._cells[path] = (border, image, label)
+
+        self.canvas.configure(
+            scrollregion=(0, 0, self.columns * CELL_WIDTH, self.row_count() * CELL_HEIGHT))
+        self.schedule_update()
+
+    def row_count(self):
+        return (len(self.paths) + self.columns - 1) // self.columns
+
+    def cell_origin(self, index):
+        row, col = divmod(index, self.columns)
+        return col * CELL_WIDTH, row * CELL_HEIGHT
+
+    def index_at(self, event):
+        """클릭한 위치의 사진 번호 (칸 밖이면 None)"""
+        x = self.canvas.canvasx(event.x)
+        y = self.canvas.canvasy(event.y)
+        col, row = int(x // CELL_WIDTH), int(y // CELL_HEIGHT)
+        if col >= self.columns:
+            return None
+        index = row * self.columns + col
+        return index if 0 <= index < len(self.paths) else None
+
+    def scroll(self, units):
+        self.canvas.yview_scroll(units, "units")
+
+    def on_scroll(self, first, last):
+        """캔버스가 움직이면 스크롤바 갱신 후 보이는 칸 다시 요청"""
+        self.scrollbar.set(first, last)
+        self.schedule_update()
+
+    def schedule_update(self):
+        """스크롤이 멈춘 뒤 한 번만 보이는 칸 갱신"""
+        if not self._update_pending:
+            self._update_pending = True
+            self.window.after_idle(self.update_visible)
+
+    def update_visible(self):
+        """보이는 줄에 가까운 순서로 축소본 요청 (벗어난 칸은 취소)"""
+        self._update_pending = False
+        if self.closed or not self.paths:
+            return
+        top = self.canvas.canvasy(0)
+        bottom = self.canvas.canvasy(self.canvas.winfo_height())
+        first = int(top // CELL_HEIGHT)
+        last = int(bottom // CELL_HEIGHT)
+        rows = self.row_count()
+
+        def distance(row):
+            # 보이는 줄은 0, 그 밖은 보이는 범위에서 떨어진 줄 수
+            return max(first - row, row - last, 0)
+
+        wanted_rows = range(max(0, first - PREFETCH_ROWS), min(rows, last + PREFETCH_ROWS + 1))
+        ordered = sorted(wanted_rows, key=lambda row: (distance(row), row))
+        paths = []
+        for row in ordered:
+            start = row * self.columns
+            paths.extend(p for p in self.paths[start:start + self.columns] if p not in self._photos)
+        self.loader.request(paths)
+
+    def on_thumbnail(self, path, image):
+        """작업 스레드에서 만든 축소본을 칸에 표시 (메인 스레드)"""
+        if self.closed or path not in self._cells:
+            return  # 다른 폴더로 바뀜
+        border, item, label = self._cells[path]
+        if image is None:
+            self.canvas.itemconfig(label, fill="#C62828")
+            return
+        from PIL import ImageTk
+        photo = self._photos[path] = ImageTk.PhotoImage(image)
+        self.canvas.itemconfig(item, image=photo)
+
+    def on_click(self, event):
+        """사진 선택/해제"""
+        index = self.index_at(event)
+        if index is None:
+            return
+        path = self.paths[index]
+        if path in self.selected:
+            self.selected.remove(path)
+        else:
+            self.selected.append(path)
+        border = self._cells[path][0]
+        chosen = path in self.selected
+        self.canvas.itemconfig(border, outline=SELECTED_COLOR if chosen else "#DDDDDD",
+                               width=3 if chosen else 1)
+        self.update_open_button()
+
+    def on_double_click(self, event):
+        """두 번 누른 사진 한 장으로 바로 시작"""
+        index = self.index_at(event)
+        if index is not None:
+            self.on_open([self.paths[index]])
+
+    def update_open_button(self):
+        count = len(self.selected)
+        self.open_button.config(
+            text=f"선택한 사진 사용 ({count}장)" if count else "선택한 사진 사용",
+            state="normal" if count else "disabled"
+        )
+
+    def open_selected(self):
+        """고른 사진을 폴더 순서대로 넘겨 작업 시작"""
+        chosen = set(self.selected)
+        self.on_open([p for p in self.paths if p in chosen])
+
+    def close(self):
+        """창 닫기 (작업 스레드 종료)"""
+        if self.loader is not None:
+            self.loader.close()
+            self.loader = None
+        self.window.destroy()
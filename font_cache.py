@@ -0,0 +1,243 @@
+"""
+폰트 디스크 캐시
+맑은 고딕처럼 큰 TrueType 폰트를 실행할 때마다 다시 해석하지 않도록
+해석한 표(글리프 위치, 문자 대응, 글자 폭)와 자주 쓰는 글리프 부분집합을
+사용자 캐시 폴더에 저장해 두고 다음 실행부터 바로 읽습니다.
+
+캐시 항목은 폰트 경로, 파일 크기, 수정 시각, reportlab 버전(과 ttfonts 모듈 파일)과
+CACHE_VERSION으로 구분하므로 폰트나 라이브러리가 바뀌면 자동으로 새로 만듭니다.
+복원한 폰트는 PDF 글꼴 객체를 한 번 만들어 확인하고, 조금이라도 맞지 않으면
+캐시를 버리고 평소처럼 TTFont로 해석합니다.
+PHOTO_PDF_CACHE 환경 변수로 캐시 폴더를 바꾸거나 off로 끌 수 있습니다.
+"""
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+
+# 저장 형식이 바뀌면 올려서 예전 캐시를 무시
+CACHE_VERSION = 1
+
+# 디스크에 보관할 글리프 부분집합 파일 수 (넘으면 오래된 것부터 삭제)
+SUBSET_CACHE_LIMIT = 256
+
+_lock = threading.Lock()
+_width_tables = {}   # 폰트 이름 -> 캐시에서 읽은 글자 폭 표
+
+
+def cache_dir(*parts):
+    """프로그램 캐시 폴더 경로 (꺼져 있으면 None)"""
+    base = os.environ.get("PHOTO_PDF_CACHE")
+    if base and base.lower() in ("0", "off", "no"):
+        return None
+    if not base:
+        if sys.platform == "win32":
+            root = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        else:
+            root = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+        base = os.path.join(root, "imgtxttopdf")
+    return os.path.join(base, *parts)
+
+
+def _font_key(path):
+    """폰트 파일 식별 키 (경로, 크기, 수정 시각, 라이브러리 버전)"""
+    import reportlab
+    from reportlab.pdfbase import ttfonts
+
+    st = os.stat(path)
+    # 같은 버전 번호로 바뀐 라이브러리(개발판, 패치 적용)도 구분
+    lib = os.stat(ttfonts.__file__)
+    raw = "|".join(map(str, (
+        CACHE_VERSION, reportlab.Version, lib.st_size, lib.st_mtime_ns,
+        os.path.normcase(os.path.abspath(path)), st.st_size, st.st_mtime_ns,
+    )))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def write_atomic(path, data):
+    """임시 파일에 쓴 뒤 교체 (여러 프로세스가 동시에 써도 깨지지 않음)"""
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _pdf_scale(units_per_em):
+    """글리프 단위 -> PDF 단위 변환 함수 (reportlab이 폰트마다 만드는 것과 같음)"""
+    if units_per_em == 1000:
+        return lambda x: x
+    mult = 1000 / units_per_em
+    return lambda x: x * mult
+
+
+def _restore(name, path, entry):
+    """캐시 항목으로 해석이 끝난 TTFont 복원 (파일 해석 생략)"""
+    from weakref import WeakKeyDictionary
+    from reportlab.pdfbase.ttfonts import TTFont, TTFontFace
+
+    face = TTFontFace.__new__(TTFontFace)
+    face.__dict__.update(entry["face"])
+    face._pdfScale = _pdf_scale(face.unitsPerEm)
+    # 원본 바이트는 부분집합을 만들 때 필요 (읽기만 하므로 빠름)
+    with open(path, "rb") as f:
+        face._ttf_data = f.read()
+
+    font = TTFont.__new__(TTFont)
+    font.__dict__.update(entry["font"])
+    font.fontName = name
+    font.face = face
+    font.state = WeakKeyDictionary()
+    return font
+
+
+def _validate(font):
+    """복원한 TTFont로 글자 나누기와 PDF 글꼴 객체 만들기를 미리 해 봄
+
+    reportlab 내부 속성이 캐시와 맞지 않으면 PDF를 쓸 때가 아니라 여기서 예외가 납니다.
+    """
+    from reportlab.pdfbase.pdfdoc import PDFDocument
+
+    doc = PDFDocument()
+    font.splitString("Aa1 가", doc)
+    font.addObjects(doc)
+    font.stringWidth("Aa1 가", 10)
+
+
+def _snapshot(font):
+    """TTFont에서 저장할 상태만 추리기 (문서별 상태와 원본 바이트 제외)"""
+    from text_layout import build_width_table
+
+    face_state = {
+        k: v for k, v in font.face.__dict__.items()
+        if k not in ("_ttf_data", "_pdfScale", "makeSubset")
+    }
+    font_state = {
+        k: v for k, v in font.__dict__.items()
+        if k not in ("face", "state", "fontName")
+    }
+    return {
+        "version": CACHE_VERSION,
+        "font": font_state,
+        "face": face_state,
+        "widths": build_width_table(font.face),
+    }
+
+
+def load_ttfont(name, path):
+    """TTFont 생성 (캐시가 있으면 해석 없이 복원, 없으면 해석 후 저장)"""
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    folder = cache_dir("fonts")
+    if folder is None:
+        return TTFont(name, path)
+
+    key = _font_key(path)
+    entry_path = os.path.join(folder, key + ".pickle")
+    font = None
+    entry = None
+    try:
+        with open(entry_path, "rb") as f:
+            entry = pickle.load(f)
+        if entry.get("version") == CACHE_VERSION:
+            font = _restore(name, path, entry)
+            _validate(font)
+    except Exception:
+        font = None  # 없거나 깨졌거나 라이브러리와 맞지 않는 캐시는 새로 만듦
+
+    if font is None:
+        font = TTFont(name, path)
+        entry = _snapshot(font)
+        try:
+            write_atomic(entry_path, pickle.dumps(entry, pickle.HIGHEST_PROTOCOL))
+        except OSError:
+            pass  # 캐시 폴더에 쓸 수 없어도 동작에는 문제 없음
+
+    with _lock:
+        _width_tables[name] = entry["widths"]
+    _install_subset_cache(font.face, os.path.join(folder, "subsets", key))
+    return font
+
+
+def cached_widths(font_name):
+    """캐시에서 읽은 글자 폭 표 (없으면 None)"""
+    with _lock:
+        return _width_tables.get(font_name)
+
+
+def _install_subset_cache(face, folder):
+    """글리프 부분집합 생성 결과를 메모리와 디스크에 캐시
+
+    부분집합 파일도 같은 키(폰트와 라이브러리) 폴더에 두므로 라이브러리가 바뀌면 새로 만듭니다.
+    """
+    make_subset = getattr(face, "makeSubset", None)
+    if not callable(make_subset):
+        return  # 라이브러리 구조가 다르면 캐시 없이 사용
+    memory = {}
+
+    def cached_make_subset(subset):
+        digest = hashlib.sha1(repr(tuple(subset)).encode("ascii")).hexdigest()
+        data = memory.get(digest)
+        if data is not None:
+            return data
+
+        path = os.path.join(folder, digest + ".ttf")
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            data = make_subset(subset)
+            try:
+                write_atomic(path, data)
+                _prune(folder, SUBSET_CACHE_LIMIT)
+            except OSError:
+                pass
+        else:
+            try:
+                os.utime(path)  # 최근 사용 표시 (오래된 것부터 정리)
+            except OSError:
+                pass
+
+        with _lock:
+            if len(memory) < SUBSET_CACHE_LIMIT:
+                memory[digest] = data
+        return data
+
+    face.makeSubset = cached_make_subset
+
+
+def _prune(folder, limit):
+    """부분집합 파일이 limit개를 넘으면 오래 쓰지 않은 것부터 삭제"""
+    try:
+        entries = [e for e in os.scandir(folder) if e.name.endswith(".ttf")]
+    except OSError:
+        return
+    if len(entries) <= limit:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    for entry in entries[:len(entries) - limit]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def clear_cache():
+    """디스크의 폰트 캐시 삭제"""
+    import shutil
+
+    folder = cache_dir("fonts")
+    if folder and os.path.isdir(folder):
+        shutil.rmtree(folder, ignore_errors=True)
+    with _lock:
+        _width_tables.clear()
@@ -0,0 +1,60 @@
+"""
+폰트 관리
+PDF용 한글 폰트 등록과 미리보기용 폰트 객체 캐시를 담당합니다.
+폰트 파일은 처음 필요할 때 읽습니다 (프로그램 시작 시 읽지 않음).
+"""
+import os
+import threading
+from functools import lru_cache
+
+# 한글 폰트 (Windows 기본 맑은 고딕, 환경 변수로 변경 가능)
+FONT_PATH = os.environ.get("PHOTO_PDF_FONT", "C:/Windows/Fonts/malgun.ttf")
+
+# 미리보기 폰트 캐시 크기 (경로+크기 조합 수)
+FONT_CACHE_SIZE = 64
+
+_pdf_font = None
+_pdf_font_lock = threading.Lock()
+
+
+def setup_pdf_font():
+    """PDF용 한글 폰트 등록 (프로세스당 한 번만 수행, 여러 스레드에서 호출 가능)"""
+    global _pdf_font
+    with _pdf_font_lock:
+        if _pdf_font is None:
+            try:
+                if os.path.exists(FONT_PATH):
+                    from reportlab.pdfbase import pdfmetrics
+                    from font_cache import load_ttfont
+                    # 해석한 폰트 표는 디스크에 캐시 (두 번째 실행부터 빠름)
+                    pdfmetrics.registerFont(load_ttfont('korean', FONT_PATH))
+                    _pdf_font = 'korean'
+                else:
+                    _pdf_font = 'Helvetica'
+            except Exception:
+                _pdf_font = 'Helvetica'
+    return _pdf_font
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def _load_font(path, size):
+    from PIL import ImageFont
+    try:
+        return ImageFont.truetype(path, size)
+    except Exception:
+        return ImageFont.load_default()
+
+
+def get_font(size, path=None):
+    """미리보기/래스터 출력용 폰트 (경로+크기별로 캐시, 크기는 0.1 단위)"""
+    return _load_font(path or FONT_PATH, max(1.0, round(float(size), 1)))
+
+
+def font_cache_info():
+    """폰트 캐시 적중/실패 횟수 (functools CacheInfo)"""
+    return _load_font.cache_info()
+
+
+def clear_font_cache():
+    """폰트 캐시 비우기"""
+    _load_font.cache_clear()
@@ -0,0 +1,338 @@
+"""
+사진 파일 공유 자원
+사진 한 장을 세션 동안 한 번만 읽고 디코딩해 미리보기/PDF에서 함께 사용합니다.
+Pillow는 시작 시간을 줄이려고 처음 쓸 때 불러옵니다.
+"""
+import io
+import math
+import mmap
+import os
+import threading
+from collections import OrderedDict
+
+import thumb_cache
+import timing
+from large_image import (
+    ImageTooLargeError, budget_scale, check_pixels, decode_in_strips,
+    decoded_bytes, jpeg_draft_scale, memory_budget, pillow_pixel_limit, reducible,
+    too_large_message,
+)
+
+# 이 크기 이상의 파일은 메모리 매핑으로 읽음
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+# 작업용 축소본의 긴 변 길이 (작은 것부터, 디스크 캐시 크기 포함)
+WORKING_SIZES = (256, thumb_cache.THUMB_EDGE, 2048)
+
+# 동시에 유지할 사진 수
+CACHE_SIZE = 8
+
+
+class _MemoryReader(io.RawIOBase):
+    """메모리 버퍼를 복사 없이 읽는 파일 객체 (독자마다 위치를 따로 가짐)"""
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer)
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        n = max(0, min(len(b), len(self._view) - self._pos))
+        b[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        else:
+            self._pos = len(self._view) + offset
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def close(self):
+        self._view.release()
+        super().close()
+
+
+class ImageAsset:
+    """사진 한 장의 원본 바이트, 메타데이터, 작업용 축소본"""
+
+    def __init__(self, data, key=None, name=None):
+        self.key = key
+        self.name = name
+        self._lock = threading.Lock()
+        self._working = {}
+
+        self.data = data
+        with self.open() as img:
+            self.size = img.size
+            self.format = img.format
+            self.mode = img.mode
+        check_pixels(self.size, name)
+
+    @classmethod
+    def from_path(cls, path):
+        """파일에서 자원 생성 (큰 파일은 메모리 매핑)"""
+        with timing.span('read'):
+            st = os.stat(path)
+            key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+            if st.st_size >= MMAP_THRESHOLD:
+                # 매핑은 파일 핸들을 따로 복제해 두므로 파일은 바로 닫아도 됨
+                with open(path, 'rb') as f:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                return cls(data, key, path)
+            with open(path, 'rb') as f:
+                return cls(f.read(), key, path)
+
+    @property
+    def width(self):
+        return self.size[0]
+
+    @property
+    def height(self):
+        return self.size[1]
+
+    def stream(self):
+        """원본 바이트를 읽는 새 파일 객체"""
+        if isinstance(self.data, bytes):
+            return io.BytesIO(self.data)
+        return io.BufferedReader(_MemoryReader(self.data))
+
+    @property
+    def byte_size(self):
+        """원본 파일 크기 (바이트)"""
+        return len(self.data)
+
+    def open(self):
+        """원본 이미지 열기 (디코딩은 호출자가 필요할 때 수행)"""
+        from PIL import Image
+        # 화소 수 제한은 check_pixels와 메모리 한도로 처리 (Pillow 검사는 여는 동안만 완화)
+        with pillow_pixel_limit():
+            return Image.open(self.stream())
+
+    def pdf_source(self):
+        """reportlab drawImage에 넘길 원본 (이미 읽은 바이트 사용, 파일을 다시 읽지 않음)
+        JPEG는 디코딩 없이 원본 바이트 그대로 삽입되게 함"""
+        from reportlab.lib.utils import ImageReader
+        with pillow_pixel_limit():
+            if self.format == 'JPEG':
+                return _jpeg_reader(self.stream())
+            return ImageReader(self.stream())
+
+    def resized(self, target_size, gray=False):
+        """원본을 target_size 픽셀로 맞춘 RGB/L 이미지 (인쇄용, gray면 흑백)"""
+        from PIL import Image
+
+        # 목표의 2배까지는 축소 디코딩해도 LANCZOS 결과와 차이가 없음
+        img = flatten(self.open_reduced(target_size, reducing_gap=2.0))
+        if gray and img.mode != 'L':
+            img = img.convert('L')  # 한 채널만 줄이고 인코딩
+        if img.size != tuple(target_size):
+            with timing.span('resample'):
+                img = img.resize(target_size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+        return img
+
+    def encode_jpeg(self, target_size, quality, gray=False):
+        """원본을 target_size 픽셀로 줄여 JPEG 바이트로 인코딩 (인쇄용, gray면 흑백)"""
+        img = self.resized(target_size, gray)
+        buffer = io.BytesIO()
+        with timing.span('encode'):
+            img.save(buffer, 'JPEG', quality=quality)
+        return buffer.getvalue()
+
+    def working_copy(self, max_edge):
+        """긴 변이 max_edge 이상인 가장 작은 작업용 축소본 (공유 객체이므로 수정 금지)
+
+        필요한 단계만 만들며, 원본 전체를 디코딩하지 않고 축소 디코딩합니다.
+        """
+        levels = sorted(WORKING_SIZES)
+        edge = next((e for e in levels if e >= max_edge), levels[-1])
+        with self._lock:
+            img = self._working.get(edge)
+            if img is None:
+                img = self._working[edge] = self._make_working_copy(edge)
+            return img
+
+    def _make_working_copy(self, edge):
+        """긴 변 edge 크기의 축소본 생성"""
+        from PIL import Image
+
+        # 이미 만든 더 큰 축소본이 있으면 원본 대신 그것을 줄임
+        larger = [e for e in self._working if e > edge]
+        if larger:
+            img = self._working[min(larger)].copy()
+        elif (edge <= thumb_cache.THUMB_EDGE and self.key is not None
+                and max(self.size) >= 2 * thumb_cache.THUMB_EDGE):
+            # 화면용 크기는 디스크 축소본에서 (없으면 한 번 만들어 저장)
+            # 작은 사진은 원본을 바로 푸는 편이 빠르므로 저장하지 않음
+            thumb = thumb_cache.load(self.key)
+            if thumb is None:
+                thumb = self.open_reduced((thumb_cache.THUMB_EDGE,) * 2)
+                if max(thumb.size) > thumb_cache.THUMB_EDGE:
+                    with timing.span('resample'):
+                        thumb.thumbnail((thumb_cache.THUMB_EDGE,) * 2, Image.Resampling.LANCZOS)
+                thumb_cache.store(self.key, thumb)
+            if edge == thumb_cache.THUMB_EDGE:
+                return thumb
+            self._working[thumb_cache.THUMB_EDGE] = thumb
+            img = thumb.copy()
+        else:
+            img = self.open_reduced((edge, edge))
+        if max(img.size) > edge:
+            with timing.span('resample'):
+                img.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        return img
+
+    def open_reduced(self, size, reducing_gap=1.0):
+        """size 상자보다 작아지지 않는 선에서 줄여서 디코딩한 이미지
+
+        JPEG는 디코더의 축소 디코딩(draft)을, 그 밖의 형식은
+        디코딩 직후 Image.reduce(박스 평균)를 사용합니다.
+        reducing_gap만큼 여유를 두면 이후 LANCZOS 축소 품질이 좋아집니다.
+        원본을 풀면 메모리 한도를 넘는 사진은 한도 안에 들도록 더 줄이며,
+        이때 원본 전체를 풀지 않고 디코딩하면서 줄입니다.
+        """
+        limit = budget_scale(self.size, self.mode)
+        scale = min(min(size[0] / self.width, size[1] / self.height) * reducing_gap, limit)
+        target = (max(1, int(self.width * scale)), max(1, int(self.height * scale)))
+
+        img = self.open()
+        try:
+            with timing.span('decode'):
+                if scale >= 1.0:
+                    img.load()
+                elif self.format == 'JPEG':
+                    draft = jpeg_draft_scale(self.size, target, self.mode)
+                    if draft is None:
+                        raise ImageTooLargeError(too_large_message(self))
+                    img.draft(None, (self.width // draft, self.height // draft))
+                    img.load()
+                elif limit >= 1.0:
+                    img.load()
+                    factor = int(1.0 / scale)
+                    if factor >= 2:
+                        img = reducible(img).reduce(factor)
+                else:
+                    # 한도를 넘는 사진: 줄 묶음씩 풀면서 줄임
+                    factor = max(int(1.0 / scale), math.ceil(1.0 / limit))
+                    img = decode_in_strips(self, img, factor)
+        except MemoryError:
+            raise ImageTooLargeError(too_large_message(self, "메모리가 부족합니다."))
+        return img
+
+    def fit_size(self, max_width, max_height):
+        """비율을 유지하며 주어진 상자에 맞춘 픽셀 크기 (원본보다 키우지 않음)"""
+        scale = min(max_width / self.width, max_height / self.height, 1.0)
+        return (max(1, int(self.width * scale)), max(1, int(self.height * scale)))
+
+    def fit(self, max_width, max_height):
+        """비율을 유지하며 주어진 상자에 맞춘 새 이미지 (원본은 다시 디코딩하지 않음)"""
+        from PIL import Image
+
+        target = self.fit_size(max_width, max_height)
+        source = self.working_copy(max(target))
+        if source.size == target:
+            return source.copy()
+        with timing.span('resample'):
+            return source.resize(target, Image.Resampling.LANCZOS)
+
+    def close(self):
+        """메모리 매핑 해제 (이 자원을 더 쓰지 않을 때만 호출)"""
+        with self._lock:
+            self._working.clear()
+        if isinstance(self.data, mmap.mmap):
+            try:
+                self.data.close()
+            except BufferError:
+                pass  # 아직 읽는 중인 객체가 있으면 GC에 맡김
+
+
+_JpegReader = None
+
+
+def _jpeg_reader(stream):
+    """JPEG를 풀지 않고 넣는 ImageReader
+
+    drawImage는 같은 사진을 한 번만 넣으려고 getRGBData() 결과로 이름(해시)을 만드는데,
+    기본 ImageReader는 이때 원본 전체를 디코딩합니다. 여기서는 화소 대신 JPEG 바이트를
+    돌려주며, PDF에는 jpeg_fh()로 원본 바이트가 그대로 들어갑니다.
+    """
+    global _JpegReader
+    if _JpegReader is None:
+        from reportlab.lib.utils import ImageReader
+
+        class JpegReader(ImageReader):
+            def getRGBData(self):
+                fp = self.jpeg_fh()
+                if fp is None:  # Pillow가 JPEG로 보지 않음: 보통처럼 풂
+                    return ImageReader.getRGBData(self)
+                self._dataA = None  # 투명 채널 없음 (drawImage가 읽음)
+                return fp.getvalue()
+
+        _JpegReader = JpegReader
+    return _JpegReader(stream)
+
+
+def flatten(img):
+    """JPEG로 저장할 수 있게 투명 영역은 흰 종이색으로 채우고 RGB/L로 변환"""
+    from PIL import Image
+
+    if img.mode in ('RGB', 'L'):
+        return img
+    if img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info:
+        rgba = img.convert('RGBA')
+        background = Image.new('RGB', rgba.size, 'white')
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        return background
+    return img.convert('RGB')
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_asset(path):
+    """경로의 사진 자원 (경로+수정시각+크기가 같으면 재사용)"""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    with _cache_lock:
+        asset = _cache.get(key)
+        if asset is not None:
+            _cache.move_to_end(key)
+            return asset
+
+    asset = ImageAsset.from_path(path)
+
+    with _cache_lock:
+        _cache[asset.key] = asset
+        _cache.move_to_end(asset.key)
+        while len(_cache) > CACHE_SIZE:
+            # 닫지 않고 캐시에서만 뺌: 다른 스레드가 아직 쓰고 있을 수 있으므로
+            # 메모리 매핑은 마지막 사용자가 놓을 때 함께 해제됨
+            _cache.popitem(last=False)
+    return asset
+
+
+def load_asset(image):
+    """파일 경로, 바이트, ImageAsset 중 무엇이든 ImageAsset으로 변환"""
+    if isinstance(image, ImageAsset):
+        return image
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return ImageAsset(bytes(image))
+    return get_asset(os.fspath(image))
+
+
+def clear_cache():
+    """캐시된 사진 자원 모두 놓기 (쓰는 중인 것은 다 쓴 뒤 해제됨)"""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,162 @@
+"""
+저장/인쇄 작업 대기열
+PDF 만들기와 인쇄를 작업 스레드에서 처리해 창이 멈추지 않게 합니다.
+앞 작업이 인코딩 중이어도 다음 사진 작업을 바로 넣을 수 있고,
+대기 중이거나 진행 중인 작업을 취소할 수 있습니다.
+"""
+import itertools
+import queue
+import threading
+import time
+
+# 동시에 처리할 작업 수 (사진 인코딩은 Pillow가 GIL을 풀고 수행)
+JOB_WORKERS = 2
+
+# 작업 상태
+QUEUED = "대기"
+RUNNING = "진행 중"
+DONE = "완료"
+FAILED = "실패"
+CANCELLED = "취소됨"
+
+
+class JobCancelled(Exception):
+    """작업이 취소되어 중단됨"""
+
+
+class Job:
+    """대기열 작업 하나
+
+    work는 작업 스레드에서 work(job)로 호출되며 완료 메시지를 돌려줍니다.
+    work 안에서는 job.report(비율)로 진행률을 알리고 취소 여부를 확인합니다.
+    """
+
+    def __init__(self, label, work):
+        self.id = None
+        self.label = label
+        self.work = work
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = ""
+        self.seconds = 0.0
+        self.output = None       # 저장한 파일 경로 (저장 작업만)
+        self._cancel = threading.Event()
+        self._owner = None
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """취소 요청 (진행 중이면 다음 확인 지점에서 중단)"""
+        self._cancel.set()
+
+    def check(self):
+        """취소됐으면 JobCancelled 발생"""
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def report(self, fraction):
+        """진행률 알림 후 취소 여부 확인 (작업 스레드에서 호출)"""
+        self.check()
+        self.progress = max(0.0, min(1.0, fraction))
+        if self._owner is not None:
+            self._owner._notify(self)
+
+    def describe(self):
+        """목록에 보여줄 한 줄 설명"""
+        text = f"#{self.id} {self.label} - {self.status}"
+        if self.status == RUNNING and self.progress:
+            text += f" {self.progress * 100:.0f}%"
+        if self.message:
+            text += f" ({self.message})"
+        return text
+
+
+class JobQueue:
+    """작업 스레드에서 Job을 차례로 실행하고 상태 변화를 메인 스레드로 전달"""
+
+    def __init__(self, root, on_update, workers=JOB_WORKERS):
+        """on_update: Tk 메인 스레드에서 변경된 Job으로 호출되는 함수"""
+        self.root = root
+        self.on_update = on_update
+        self.jobs = []
+        self._queue = queue.Queue()
+        self._ids = itertools.count(1)
+        self._closed = False
+        self._lock = threading.Lock()   # 상태 전환 보호 (대기 -> 진행/취소)
+        self._threads = [
+            threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, job):
+        """작업 추가 (바로 돌아옴)"""
+        job.id = next(self._ids)
+        job._owner = self
+        self.jobs.append(job)
+        self._queue.put(job)
+        self._notify(job)
+        return job
+
+    def cancel(self, job):
+        """작업 취소 (대기 중이면 바로 취소 처리)"""
+        with self._lock:
+            if job.finished:
+                return
+            job.cancel()
+            if job.status != QUEUED:
+                return
+            job.status = CANCELLED
+        self._notify(job)
+
+    def pending(self):
+        """아직 끝나지 않은 작업 수"""
+        return sum(1 for job in self.jobs if not job.finished)
+
+    def clear_finished(self):
+        """끝난 작업을 목록에서 제거"""
+        self.jobs = [job for job in self.jobs if not job.finished]
+
+    def close(self):
+        """작업 스레드 종료 (남은 작업은 취소)"""
+        self._closed = True
+        for job in self.jobs:
+            job.cancel()
+        for _ in self._threads:
+            self._queue.put(None)
+
+    def _notify(self, job):
+        try:
+            self.root.after(0, self.on_update, job)
+        except RuntimeError:
+            pass  # 메인 루프가 이미 종료됨
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None or self._closed:
+                return
+            with self._lock:
+                if job.cancelled:
+                    continue  # cancel()에서 이미 취소 처리됨
+                job.status = RUNNING
+            self._notify(job)
+            start = time.perf_counter()
+            try:
+                job.message = job.work(job) or ""
+                job.status = DONE
+            except JobCancelled:
+                job.status = CANCELLED
+            except Exception as e:
+                job.status = FAILED
+                job.message = str(e)
+            job.seconds = time.perf_counter() - start
+            job.progress = 1.0 if job.status == DONE else job.progress
+            self._notify(job)
@@ -0,0 +1,324 @@
+"""
+큰 사진 메모리 한도 처리
+포스터 스캔이나 파노라마처럼 1억 화소가 넘는 사진도 정해진 메모리 한도 안에서
+줄여 읽습니다. 원본 전체를 한 번에 풀지 않고 다음 방법으로 디코딩과 동시에 줄입니다.
+
+- JPEG: 디코더의 축소 디코딩 (1/2, 1/4, 1/8)
+- PNG(8비트, 비월 주사 아님): 줄 묶음(스트립)씩 풀어서 바로 줄이기
+- 압축하지 않은 BMP/TIFF 등: 파일에서 줄 묶음씩 읽어서 바로 줄이기
+
+그 밖의 형식이 한도를 넘으면 이유를 알려 주는 ImageTooLargeError를 냅니다.
+한도는 PHOTO_PDF_MEMORY_MB 환경 변수(또는 명령줄 --memory-mb)로 바꿀 수 있습니다.
+"""
+import math
+import os
+import struct
+import threading
+import zlib
+from contextlib import contextmanager
+
+# 사진 한 장을 풀 때 쓸 수 있는 최대 메모리 (MB)
+DEFAULT_MEMORY_MB = 512
+
+# 받아들이는 최대 화소 수 (이보다 크면 파일이 잘못됐거나 압축 폭탄으로 봄)
+# A1 포스터 600dpi 스캔(약 2.8억 화소)이나 긴 파노라마까지 받아들임
+MAX_PIXELS = 300_000_000
+
+# 줄 묶음 하나의 크기 (한도 대비 비율)
+STRIP_FRACTION = 0.125
+
+# 모드별 화소당 바이트 (디코딩 결과 기준)
+_MODE_BYTES = {
+    '1': 1, 'L': 1, 'P': 1, 'LA': 2, 'La': 2, 'PA': 2,
+    'I;16': 2, 'I;16B': 2, 'I;16L': 2, 'I': 4, 'F': 4,
+    'RGB': 4, 'RGBA': 4, 'RGBa': 4, 'RGBX': 4, 'CMYK': 4, 'YCbCr': 4, 'LAB': 4, 'HSV': 4,
+}
+
+# 압축하지 않은 원본의 화소당 비트 수 (줄 단위로 파일을 읽을 때 사용)
+_RAW_BITS = {
+    '1': 1, '1;I': 1, 'L': 8, 'P': 8, 'LA': 16,
+    'RGB': 24, 'BGR': 24, 'RGBA': 32, 'BGRA': 32, 'RGBX': 32, 'BGRX': 32,
+    'CMYK': 32, 'I;16': 16, 'I;16B': 16,
+}
+
+_budget = None
+_pillow_lock = threading.Lock()
+
+
+class ImageTooLargeError(ValueError):
+    """메모리 한도 안에서 처리할 수 없는 사진"""
+
+
+def memory_budget():
+    """사진 한 장 디코딩에 쓸 수 있는 최대 바이트"""
+    global _budget
+    if _budget is None:
+        try:
+            mb = int(os.environ.get("PHOTO_PDF_MEMORY_MB", DEFAULT_MEMORY_MB))
+        except ValueError:
+            mb = DEFAULT_MEMORY_MB
+        _budget = max(16, mb) * 1024 * 1024
+    return _budget
+
+
+def set_memory_budget(mb):
+    """메모리 한도 변경 (MB)"""
+    global _budget
+    _budget = max(16, int(mb)) * 1024 * 1024
+
+
+def decoded_bytes(size, mode):
+    """size 크기 이미지를 풀었을 때 메모리 (바이트)"""
+    return size[0] * size[1] * _MODE_BYTES.get(mode, 4)
+
+
+@contextmanager
+def pillow_pixel_limit():
+    """이 안에서 여는 사진만 Pillow 화소 수 검사를 MAX_PIXELS 기준으로 완화
+
+    Pillow의 한도(MAX_IMAGE_PIXELS)는 전역 설정이므로 잠금 안에서 잠시 올렸다가
+    끝나면 되돌립니다. 헤더만 읽는 Image.open처럼 짧은 작업에만 씁니다.
+    한도의 2배를 넘어 Pillow가 거부한 사진은 ImageTooLargeError로 바꿉니다.
+    """
+    from PIL import Image
+
+    with _pillow_lock:
+        saved = Image.MAX_IMAGE_PIXELS
+        if saved is not None:
+            Image.MAX_IMAGE_PIXELS = max(saved, MAX_PIXELS)
+        try:
+            yield
+        except Image.DecompressionBombError:
+            raise ImageTooLargeError(
+                f"사진이 너무 큽니다. {MAX_PIXELS / 1e8:.0f}억 화소 이하로 줄여 주세요."
+            ) from None
+        finally:
+            Image.MAX_IMAGE_PIXELS = saved
+
+
+def check_pixels(size, name=None):
+    """화소 수가 너무 많으면 ImageTooLargeError"""
+    pixels = size[0] * size[1]
+    if pixels > MAX_PIXELS:
+        raise ImageTooLargeError(
+            f"{_label(name)}사진이 너무 큽니다 ({size[0]}×{size[1]}, {pixels / 1e8:.1f}억 화소). "
+            f"{MAX_PIXELS / 1e8:.0f}억 화소 이하로 줄여 주세요."
+        )
+
+
+def budget_scale(size, mode):
+    """메모리 한도 안에서 풀 수 있는 최대 배율 (1.0이면 원본 그대로 가능)"""
+    full = decoded_bytes(size, mode)
+    budget = memory_budget()
+    if full <= budget:
+        return 1.0
+    return math.sqrt(budget / full)
+
+
+def limit_size(size, mode='RGB'):
+    """메모리 한도를 넘지 않도록 비율을 유지하며 줄인 크기"""
+    scale = budget_scale(size, mode)
+    if scale >= 1.0:
+        return tuple(size)
+    return (max(1, int(size[0] * scale)), max(1, int(size[1] * scale)))
+
+
+def too_large_message(asset, detail=""):
+    """처리할 수 없을 때 사용자에게 보여줄 설명"""
+    need = decoded_bytes(asset.size, asset.mode) / (1024 * 1024)
+    budget = memory_budget() / (1024 * 1024)
+    message = (
+        f"{_label(asset.name)}사진이 너무 커서 처리할 수 없습니다 "
+        f"({asset.width}×{asset.height}, 풀면 약 {need:,.0f}MB, 한도 {budget:,.0f}MB)."
+    )
+    if detail:
+        message += f"\n{detail}"
+    return message + "\nJPEG로 저장하거나 크기를 줄인 뒤 다시 시도해 주세요."
+
+
+def _label(name):
+    return f"{os.path.basename(name)}: " if name else ""
+
+
+def reduced_mode(img):
+    """Image.reduce를 쓸 수 있는 모드 (팔레트 -> RGB(A), 1비트 -> L, 16비트 -> I)"""
+    if img.mode in ('P', 'PA'):
+        return 'RGBA' if img.mode == 'PA' or 'transparency' in img.info else 'RGB'
+    if img.mode == '1':
+        return 'L'
+    if img.mode.startswith('I;16'):
+        return 'I'
+    return img.mode
+
+
+def reducible(img):
+    """Image.reduce를 쓸 수 있는 모드로 변환"""
+    mode = reduced_mode(img)
+    return img if mode == img.mode else img.convert(mode)
+
+
+def jpeg_draft_scale(size, target, mode):
+    """JPEG 축소 디코딩 배율 (1, 2, 4, 8 중 목표보다 작아지지 않으면서 한도 안인 값)
+
+    8배로 줄여도 한도를 넘으면 None
+    """
+    budget = memory_budget()
+    for scale in (8, 4, 2, 1):
+        if size[0] // scale >= target[0] and size[1] // scale >= target[1]:
+            break
+    while scale <= 8:
+        reduced = (math.ceil(size[0] / scale), math.ceil(size[1] / scale))
+        if decoded_bytes(reduced, mode) <= budget:
+            return scale
+        scale *= 2
+    return None
+
+
+def decode_in_strips(asset, img, factor):
+    """원본 전체를 풀지 않고 줄 묶음씩 풀어 factor배 줄인 이미지
+
+    형식이 지원되지 않으면 ImageTooLargeError
+    """
+    tile = img.tile
+    if img.format == 'PNG' and len(tile) == 1 and tile[0][0] == 'zip':
+        return _png_strips(asset, img, factor)
+    if tile and all(t[0] == 'raw' for t in tile):
+        return _raw_strips(asset, img, factor)
+    raise ImageTooLargeError(too_large_message(
+        asset, f"{img.format} 형식은 나눠 읽을 수 없습니다."))
+
+
+def _strip_rows(width, mode, factor):
+    """줄 묶음 하나의 줄 수 (factor의 배수)"""
+    row_bytes = width * _MODE_BYTES.get(mode, 4)
+    rows = int(memory_budget() * STRIP_FRACTION // max(1, row_bytes))
+    return max(factor, rows - rows % factor)
+
+
+def _new_output(img, factor, mode):
+    from PIL import Image
+    return Image.new(mode, (max(1, img.width // factor), max(1, img.height // factor)))
+
+
+def _paste_reduced(out, strip, factor, y):
+    """줄 묶음을 줄여 결과의 해당 위치에 붙이기"""
+    strip = reducible(strip)
+    if factor > 1:
+        strip = strip.reduce(factor)
+    if strip.mode != out.mode:
+        strip = strip.convert(out.mode)
+    out.paste(strip, (0, y // factor))
+
+
+def _png_chunks(data):
+    """PNG의 IDAT 데이터 조각들 (복사 없이 memoryview)"""
+    view = memoryview(data)
+    pos = 8
+    end = len(data)
+    while pos + 8 <= end:
+        length, = struct.unpack('>I', view[pos:pos + 4])
+        kind = bytes(view[pos + 4:pos + 8])
+        if kind == b'IDAT':
+            yield view[pos + 8:pos + 8 + length]
+        elif kind == b'IEND':
+            break
+        pos += 12 + length
+
+
+def _png_strips(asset, img, factor):
+    """PNG를 줄 묶음씩 풀기
+
+    IDAT을 직접 풀어 필터가 적용된 줄을 얻고, 줄 묶음 앞에 바로 윗줄(필터 없음)을
+    붙여 Image.frombytes의 'zip' 디코더(PNG 디코더)로 필터를 되돌립니다.
+    디코더는 zlib 스트림을 받으므로 압축하지 않는 저장 블록(수준 0)으로 감싸기만 합니다.
+    """
+    from PIL import Image
+
+    header = bytes(memoryview(asset.data)[16:29])
+    bit_depth, interlace = header[8], header[12]
+    rawmode = img.tile[0][3]
+    if isinstance(rawmode, tuple):
+        rawmode = rawmode[0]
+    if bit_depth != 8 or interlace or rawmode != img.mode or img.mode not in ('L', 'LA', 'RGB', 'RGBA', 'P'):
+        raise ImageTooLargeError(too_large_message(
+            asset, "16비트 또는 비월 주사(interlaced) PNG는 나눠 읽을 수 없습니다."))
+
+    width, height = img.size
+    stride = width * len(img.mode)
+    rows = _strip_rows(width, img.mode, factor)
+    out = _new_output(img, factor, reduced_mode(img))
+
+    inflater = zlib.decompressobj()
+    chunks = _png_chunks(asset.data)
+    previous = bytes(stride)
+    pending = b''
+    y = 0
+    while y < height:
+        n = min(rows, height - y)
+        need = n * (stride + 1)
+        while len(pending) < need:
+            # 필요한 만큼만 풂 (작은 파일이 거대하게 풀리는 압축 폭탄 방지)
+            data = inflater.unconsumed_tail or next(chunks, None)
+            if data is None:
+                break
+            pending += inflater.decompress(data, need - len(pending))
+        if len(pending) < need:
+            raise ImageTooLargeError(too_large_message(asset, "PNG 데이터가 손상되었습니다."))
+        filtered, pending = pending[:need], pending[need:]
+
+        stored = zlib.compress(b'\x00' + previous + filtered, 0)
+        strip = Image.frombytes(img.mode, (width, n + 1), stored, 'zip', img.mode)
+        previous = strip.crop((0, n, width, n + 1)).tobytes()
+
+        strip = strip.crop((0, 1, width, n + 1))
+        if img.mode == 'P':
+            strip.putpalette(img.palette)
+            strip.info.update(img.info)
+        _paste_reduced(out, strip, factor, y)
+        y += n
+    return out
+
+
+def _raw_strips(asset, img, factor):
+    """압축하지 않은 원본(BMP, TIFF 등)을 파일에서 줄 묶음씩 읽기"""
+    from PIL import Image
+
+    width, height = img.size
+    tiles = []
+    for codec, extents, offset, args in img.tile:
+        x0, y0, x1, y1 = extents
+        if isinstance(args, str):
+            args = (args,)
+        rawmode = args[0]
+        stride = args[1] if len(args) > 1 else 0
+        orientation = args[2] if len(args) > 2 else 1
+        bits = _RAW_BITS.get(rawmode)
+        if x0 != 0 or x1 != width or bits is None:
+            raise ImageTooLargeError(too_large_message(
+                asset, f"{img.format} 형식의 이 저장 방식은 나눠 읽을 수 없습니다."))
+        tiles.append((y0, y1, offset, rawmode, stride or (width * bits + 7) // 8, orientation))
+
+    rows = _strip_rows(width, img.mode, factor)
+    out = _new_output(img, factor, reduced_mode(img))
+    view = memoryview(asset.data)
+
+    for y in range(0, height, rows):
+        n = min(rows, height - y)
+        strip = Image.new(img.mode, (width, n))
+        # 이 줄 묶음과 겹치는 타일 부분만 파일에서 읽어 풀기
+        for y0, y1, offset, rawmode, stride, orientation in tiles:
+            top, bottom = max(y, y0), min(y + n, y1)
+            if top >= bottom:
+                continue
+            count = bottom - top
+            # 아래에서 위로 저장된 파일(BMP)은 파일 안의 줄 순서가 거꾸로
+            first = top - y0 if orientation > 0 else y1 - bottom
+            start = offset + first * stride
+            part = Image.frombytes(img.mode, (width, count), bytes(view[start:start + count * stride]),
+                                   'raw', rawmode, stride, orientation)
+            strip.paste(part, (0, top - y))
+        if img.mode == 'P':
+            strip.putpalette(img.palette)
+            strip.info.update(img.info)
+        _paste_reduced(out, strip, factor, y)
+    return out
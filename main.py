@@ -2,24 +2,47 @@
 이미지-텍스트-PDF 변환 및 프린터 출력 프로그램
 어르신용 간단한 UI
 """
-import tkinter as tk
-from tkinter import filedialog, messagebox, scrolledtext
-from tkinterdnd2 import DND_FILES, TkinterDnD
-from PIL import Image, ImageTk
-import os
+import startup  # 시작 시간 측정 (가장 먼저 불러옴)
+import multiprocessing
 import sys
+
+if __name__ == "__main__":
+    # 실행 파일(.exe)에서 작업 프로세스를 띄울 수 있도록 (작업 프로세스는 여기서 끝남)
+    multiprocessing.freeze_support()
+
+    # 인자가 있으면 GUI 모듈을 불러오기 전에 일괄 변환 모드로 실행 (화면이나 tkinterdnd2 없이도 동작)
+    if len(sys.argv) > 1:
+        import cli
+        sys.exit(cli.run(sys.argv[1:]))
+
+import os
+import threading
 from datetime import datetime
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.utils import ImageReader
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+import io
 import platform
 
-# Windows 프린터 지원
-if platform.system() == 'Windows':
-    import win32print
-    import win32api
+import renderer
+import job_queue
+import size_budget
+import timing
+from image_asset import get_asset
+from job_queue import Job, JobQueue
+from preview_worker import PreviewWorker
+
+# GUI 모듈은 main()에서 불러옴 (일괄 변환의 작업 프로세스가 이 파일을 다시 불러와도 tkinter를 건드리지 않도록)
+tk = filedialog = messagebox = scrolledtext = None
+
+
+# 사용할 수 있는 이미지 확장자
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif')
+
+# 작업 목록 상태별 글자색
+JOB_COLORS = {
+    job_queue.RUNNING: "#1565C0",
+    job_queue.DONE: "#2E7D32",
+    job_queue.FAILED: "#C62828",
+    job_queue.CANCELLED: "gray",
+}
 
 
 class ImageToPDFApp:
@@ -34,9 +57,9 @@ class ImageToPDFApp:
         except:
             pass  # 아이콘 파일이 없거나 오류 시 무시
         
-        # 창 크기 설정 (세로 100px 축소)
+        # 창 크기 설정 (작업 목록 포함)
         window_width = 1100
-        window_height = 900
+        window_height = 980
         
         # 화면 중앙에 위치시키기
         screen_width = root.winfo_screenwidth()
@@ -48,11 +71,28 @@ class ImageToPDFApp:
 
         # 변수 초기화
         self.image_path = None
+        self.image_paths = []  # 선택한 사진 목록 (여러 장이면 페이지마다 한 장)
+        self.captions = {}  # 사진 번호별 글귀
+        self.current_index = 0
         self.image_display = None
         self.image_ratio = 50  # 사진 비율 (기본 50%)
 
-        # 한글 폰트 설정 (Windows 기본 폰트)
-        self.setup_fonts()
+        # 한글 폰트 설정은 창이 뜬 뒤 백그라운드에서 (시작 시간 단축)
+        self.pdf_font = None
+        self.root.after_idle(self.start_warm_up)
+
+        # 미리보기 작업 스레드
+        # 한가할 때 슬라이더의 다른 비율에 쓸 사진 층을 미리 만들어 둠
+        self.preview_worker = PreviewWorker(
+            self.root,
+            renderer.render_preview,
+            self.show_preview,
+            on_error=self.show_preview_error,
+            idle=renderer.prerender_preview
+        )
+
+        # 저장/인쇄 작업 대기열 (버튼을 눌러도 창이 멈추지 않음)
+        self.job_queue = JobQueue(self.root, self.on_job_update)
 
         # UI 구성
         self.create_widgets()
@@ -63,21 +103,18 @@ class ImageToPDFApp:
         # step1_frame 저장 (드래그 앤 드롭용)
         self.step1_frame = None
 
+    def start_warm_up(self):
+        """PDF 모듈과 한글 폰트를 백그라운드 스레드에서 미리 준비"""
+        threading.Thread(target=self.setup_fonts, name="warm-up", daemon=True).start()
+
     def setup_fonts(self):
-        """한글 폰트 설정"""
-        try:
-            # Windows 기본 폰트 사용
-            if platform.system() == 'Windows':
-                font_path = "C:/Windows/Fonts/malgun.ttf"  # 맑은 고딕
-                if os.path.exists(font_path):
-                    pdfmetrics.registerFont(TTFont('korean', font_path))
-                    self.pdf_font = 'korean'
-                else:
-                    self.pdf_font = 'Helvetica'
-            else:
-                self.pdf_font = 'Helvetica'
-        except:
-            self.pdf_font = 'Helvetica'
+        """한글 폰트 설정 (PDF 모듈 불러오기 포함)"""
+        self.pdf_font = renderer.warm_up()
+        startup.mark("PDF 폰트 준비 (백그라운드)")
+
+    def get_caption(self):
+        """입력창의 글귀 (안내 문구는 제외)"""
+        return renderer.normalize_caption(self.text_input.get("1.0", "end-1c"))
 
     def create_widgets(self):
         """UI 위젯 생성"""
@@ -143,6 +180,46 @@ class ImageToPDFApp:
         )
         self.select_button.pack(anchor="center")
 
+        # 폴더의 사진을 격자로 보며 고르기
+        self.folder_button = tk.Button(
+            right_frame,
+            text="🗂️ 폴더에서 고르기",
+            font=('맑은 고딕', 11),
+            command=self.open_folder_browser,
+            cursor="hand2"
+        )
+        self.folder_button.pack(anchor="center", pady=(8, 0))
+        self.folder_browser = None
+
+        # 여러 장 선택 시 사진 넘기기 (한 장이면 숨김)
+        self.nav_frame = tk.Frame(right_frame)
+
+        self.prev_button = tk.Button(
+            self.nav_frame,
+            text="◀",
+            font=('맑은 고딕', 12, 'bold'),
+            command=lambda: self.show_photo(self.current_index - 1),
+            cursor="hand2"
+        )
+        self.prev_button.pack(side="left")
+
+        self.page_label = tk.Label(
+            self.nav_frame,
+            text="",
+            font=('맑은 고딕', 12),
+            width=7
+        )
+        self.page_label.pack(side="left")
+
+        self.next_button = tk.Button(
+            self.nav_frame,
+            text="▶",
+            font=('맑은 고딕', 12, 'bold'),
+            command=lambda: self.show_photo(self.current_index + 1),
+            cursor="hand2"
+        )
+        self.next_button.pack(side="left")
+
         # 2단계: 글귀 입력
         step2_frame = tk.LabelFrame(
             self.root,
@@ -168,7 +245,7 @@ class ImageToPDFApp:
             wrap=tk.WORD
         )
         self.text_input.pack(fill="both", expand=False)
-        self.text_input.insert("1.0", "원하는 글귀를 입력하세요...")
+        self.text_input.insert("1.0", renderer.PLACEHOLDER_TEXT)
         self.text_input.bind("<FocusIn>", self.clear_placeholder)
         self.text_input.bind("<KeyRelease>", self.update_preview)
 
@@ -206,6 +283,28 @@ class ImageToPDFApp:
             fg="gray"
         )
         self.print_preview_label.pack(fill="both", expand=True)
+
+        # 글귀가 잘릴 때 경고
+        self.fit_warning_label = tk.Label(
+            right_preview_frame,
+            text="",
+            font=('맑은 고딕', 10),
+            fg="red"
+        )
+        self.fit_warning_label.pack(pady=(3, 0))
+
+        # 시간 기록이 켜져 있으면 마지막 미리보기의 단계별 시간 표시 (F12로 숨기기)
+        self.timing_label = tk.Label(
+            right_preview_frame,
+            text="",
+            font=('맑은 고딕', 8),
+            fg="gray",
+            wraplength=220,
+            justify="left"
+        )
+        if timing.is_enabled():
+            self.timing_label.pack(pady=(3, 0))
+            self.root.bind("<F12>", self.toggle_timing_overlay)
         
         # 사진/글귀 비율 조절 슬라이더
         ratio_frame = tk.Frame(step2_frame)
@@ -265,6 +364,83 @@ class ImageToPDFApp:
         )
         info_label.pack(anchor="w", pady=10)
 
+        # 인쇄용 사진 해상도 선택 (높을수록 선명하지만 파일이 커짐)
+        dpi_frame = tk.Frame(left_info_frame)
+        dpi_frame.pack(anchor="w")
+
+        dpi_label = tk.Label(
+            dpi_frame,
+            text="사진 해상도:",
+            font=('맑은 고딕', 12)
+        )
+        dpi_label.pack(side="left")
+
+        self.output_dpi = tk.IntVar(value=renderer.DEFAULT_DPI)
+        dpi_menu = tk.OptionMenu(dpi_frame, self.output_dpi, *renderer.OUTPUT_DPI_CHOICES)
+        dpi_menu.config(font=('맑은 고딕', 12))
+        dpi_menu.pack(side="left", padx=5)
+
+        dpi_unit_label = tk.Label(
+            dpi_frame,
+            text="DPI",
+            font=('맑은 고딕', 12)
+        )
+        dpi_unit_label.pack(side="left")
+
+        # 파일 크기 제한 (큰 파일을 받지 못하는 프린터/메일용, 넘치면 사진을 줄임)
+        max_size_label = tk.Label(
+            dpi_frame,
+            text="파일 크기:",
+            font=('맑은 고딕', 12)
+        )
+        max_size_label.pack(side="left", padx=(10, 0))
+
+        self.max_size = tk.StringVar(value=size_budget.SIZE_CHOICES[0])
+        max_size_menu = tk.OptionMenu(dpi_frame, self.max_size, *size_budget.SIZE_CHOICES)
+        max_size_menu.config(font=('맑은 고딕', 12))
+        max_size_menu.pack(side="left", padx=5)
+
+        # 매수와 한 장에 넣을 장수 (같은 사진을 여러 장 인쇄할 때)
+        copies_frame = tk.Frame(left_info_frame)
+        copies_frame.pack(anchor="w", pady=(5, 0))
+
+        copies_label = tk.Label(
+            copies_frame,
+            text="매수:",
+            font=('맑은 고딕', 12)
+        )
+        copies_label.pack(side="left")
+
+        self.copies = tk.StringVar(value="1")
+        copies_spin = tk.Spinbox(
+            copies_frame,
+            from_=1,
+            to=renderer.MAX_COPIES,
+            textvariable=self.copies,
+            width=3,
+            font=('맑은 고딕', 12)
+        )
+        copies_spin.pack(side="left", padx=5)
+
+        per_sheet_label = tk.Label(
+            copies_frame,
+            text="용지 한 장에:",
+            font=('맑은 고딕', 12)
+        )
+        per_sheet_label.pack(side="left", padx=(10, 0))
+
+        self.per_sheet = tk.IntVar(value=1)
+        per_sheet_menu = tk.OptionMenu(copies_frame, self.per_sheet, *renderer.SHEET_LAYOUTS)
+        per_sheet_menu.config(font=('맑은 고딕', 12))
+        per_sheet_menu.pack(side="left", padx=5)
+
+        per_sheet_unit_label = tk.Label(
+            copies_frame,
+            text="장",
+            font=('맑은 고딕', 12)
+        )
+        per_sheet_unit_label.pack(side="left")
+
         # 오른쪽: 버튼 영역
         button_frame = tk.Frame(button_container)
         button_frame.pack(side="right", padx=(10, 0))
@@ -297,8 +473,50 @@ class ImageToPDFApp:
         )
         self.print_button.pack(side="left")
 
+        # 작업 목록: 앞 작업이 끝나기 전에도 다음 사진을 저장/인쇄할 수 있음
+        jobs_frame = tk.Frame(step3_frame)
+        jobs_frame.pack(fill="x", pady=(10, 0))
+
+        self.job_list = tk.Listbox(
+            jobs_frame,
+            font=('맑은 고딕', 11),
+            height=3,
+            activestyle="none"
+        )
+        self.job_list.pack(side="left", fill="x", expand=True)
+        self.job_list.bind("<Double-Button-1>", self.open_job_output)
+
+        job_button_frame = tk.Frame(jobs_frame)
+        job_button_frame.pack(side="right", padx=(10, 0))
+
+        cancel_button = tk.Button(
+            job_button_frame,
+            text="⏹ 작업 취소",
+            font=('맑은 고딕', 11),
+            command=self.cancel_selected_job
+        )
+        cancel_button.pack(fill="x")
+
+        clear_button = tk.Button(
+            job_button_frame,
+            text="목록 정리",
+            font=('맑은 고딕', 11),
+            command=self.clear_finished_jobs
+        )
+        clear_button.pack(fill="x", pady=(5, 0))
+
+        self.job_status_label = tk.Label(
+            step3_frame,
+            text="",
+            font=('맑은 고딕', 11),
+            fg="gray"
+        )
+        self.job_status_label.pack(anchor="w")
+
     def setup_drag_drop(self):
         """드래그 앤 드롭 설정"""
+        from tkinterdnd2 import DND_FILES
+
         # 1단계 전체 프레임에 드래그 앤 드롭 적용
         if hasattr(self, 'step1_frame') and self.step1_frame:
             self.step1_frame.drop_target_register(DND_FILES)
@@ -311,26 +529,63 @@ class ImageToPDFApp:
         self.preview_label.dnd_bind('<<Drop>>', self.drop_image)
 
     def drop_image(self, event):
-        """드래그 앤 드롭으로 이미지 추가"""
+        """드래그 앤 드롭으로 이미지 추가 (여러 장 가능)"""
         try:
             # 파일 경로 추출
-            files = self.root.tk.splitlist(event.data)
+            files = [f.strip('{}') for f in self.root.tk.splitlist(event.data)]
             if files:
-                file_path = files[0].strip('{}')
-                # 이미지 파일인지 확인
-                if file_path.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp', '.gif')):
-                    self.image_path = file_path
-                    self.display_image(file_path)
-                    # PDF 및 출력 버튼 활성화
-                    self.pdf_button.config(state="normal")
-                    self.print_button.config(state="normal")
-                    # 미리보기 업데이트
-                    self.root.after(100, self.update_preview)
+                # 이미지 파일만 사용
+                image_files = [f for f in files if f.lower().endswith(IMAGE_EXTENSIONS)]
+                if image_files:
+                    self.load_images(image_files)
                 else:
                     messagebox.showwarning("경고", "이미지 파일만 사용할 수 있습니다.\n(JPG, PNG, BMP, GIF)")
         except Exception as e:
             messagebox.showerror("오류", f"파일을 불러올 수 없습니다:\n{str(e)}")
 
+    def load_images(self, file_paths):
+        """선택한 사진들로 작업 시작 (사진마다 PDF 한 페이지)"""
+        self.image_paths = list(file_paths)
+        self.captions = {}
+        self.current_index = 0
+
+        # 여러 장이면 넘기기 버튼 표시
+        if len(self.image_paths) > 1:
+            self.nav_frame.pack(anchor="center", pady=(10, 0))
+        else:
+            self.nav_frame.pack_forget()
+
+        self.show_photo(0, save_caption=False)
+
+        # PDF 및 출력 버튼 활성화
+        self.pdf_button.config(state="normal")
+        self.print_button.config(state="normal")
+
+    def show_photo(self, index, save_caption=True):
+        """index번째 사진과 그 글귀 표시"""
+        if not 0 <= index < len(self.image_paths):
+            return
+
+        # 보고 있던 사진의 글귀 저장
+        if save_caption:
+            self.captions[self.current_index] = self.get_caption()
+
+        self.current_index = index
+        self.image_path = self.image_paths[index]
+        self.display_image(self.image_path)
+
+        if len(self.image_paths) > 1:
+            self.page_label.config(text=f"{index + 1} / {len(self.image_paths)}")
+            self.prev_button.config(state="normal" if index > 0 else "disabled")
+            self.next_button.config(state="normal" if index < len(self.image_paths) - 1 else "disabled")
+
+            # 이 사진의 글귀로 바꾸기
+            self.text_input.delete("1.0", "end")
+            self.text_input.insert("1.0", self.captions.get(index) or renderer.PLACEHOLDER_TEXT)
+
+        # 미리보기 업데이트 (약간의 지연 후 실행)
+        self.root.after(100, self.update_preview)
+
     def update_ratio_label(self, value):
         """비율 슬라이더 값 업데이트"""
         self.image_ratio = int(value)
@@ -340,167 +595,83 @@ class ImageToPDFApp:
         self.update_preview()
 
     def update_preview(self, event=None):
-        """인쇄 미리보기 업데이트"""
+        """인쇄 미리보기 업데이트 (작업 스레드에 요청)"""
         if not self.image_path:
             return
         
-        try:
-            # A4 비율 고정 (210mm x 297mm = 1:1.414)
-            display_width = 180
-            display_height = int(display_width * 1.414)  # 약 255
-            
-            # 새 이미지 생성 (A4 용지 배경)
-            from PIL import Image, ImageDraw, ImageFont
-            preview_img = Image.new('RGB', (display_width, display_height), 'white')
-            draw = ImageDraw.Draw(preview_img)
-            
-            # 원본 이미지 로드 및 비율에 따라 배치
-            img = Image.open(self.image_path)
-            
-            # 텍스트 확인
-            text_content = self.text_input.get("1.0", "end-1c").strip()
-            has_text = text_content and text_content != "원하는 글귀를 입력하세요..."
-            
-            # 공간 배분 - 글귀가 없어도 비율 적용
-            image_space_ratio = self.image_ratio / 100.0
-            
-            # 항상 비율에 따라 이미지 높이 계산
-            img_height = int((display_height - 10) * image_space_ratio)
-            
-            # 이미지 크기 조정
-            img_copy = img.copy()
-            img_copy.thumbnail((display_width - 10, img_height), Image.Resampling.LANCZOS)
-            
-            # 이미지를 중앙에 배치
-            img_x = (display_width - img_copy.width) // 2
-            img_y = 5
-            preview_img.paste(img_copy, (img_x, img_y))
-            
-            # 텍스트 추가
-            if has_text:
-                text_y = img_y + img_copy.height + 5
-                text_height = display_height - text_y - 5
-                
-                # 텍스트를 줄바꿈하여 표시
-                lines = text_content.split('\n')
-                
-                # 글자 수에 따라 기본 폰트 크기 계산
-                total_chars = len(text_content)
-                base_font_size = max(5, int(display_height / 40))  # 기본 크기
-                
-                # 글자 수가 많을수록 폰트 축소
-                if total_chars > 500:
-                    font_size = max(4, int(base_font_size * 0.5))
-                elif total_chars > 300:
-                    font_size = max(4, int(base_font_size * 0.6))
-                elif total_chars > 200:
-                    font_size = max(5, int(base_font_size * 0.7))
-                elif total_chars > 100:
-                    font_size = max(5, int(base_font_size * 0.85))
-                else:
-                    font_size = base_font_size
-                
-                try:
-                    font = ImageFont.truetype("C:/Windows/Fonts/malgun.ttf", font_size)
-                except:
-                    font = ImageFont.load_default()
-                
-                # 예상 줄 수 계산
-                line_height = font_size + 2
-                max_lines = int(text_height / line_height)
-                
-                # 실제 줄바꿈 처리
-                wrapped_lines = []
-                chars_per_line = max(10, int(display_width / (font_size * 0.6)))  # 한 줄에 들어갈 글자 수 추정
-                
-                for line in lines:
-                    if not line.strip():
-                        wrapped_lines.append("")
-                        continue
-                    
-                    # 긴 줄을 자동 줄바꿈
-                    while len(line) > chars_per_line:
-                        wrapped_lines.append(line[:chars_per_line])
-                        line = line[chars_per_line:]
-                    if line:
-                        wrapped_lines.append(line)
-                
-                # 줄 수가 여전히 많으면 추가로 폰트 축소
-                if len(wrapped_lines) > max_lines:
-                    adjustment_ratio = max_lines / len(wrapped_lines)
-                    font_size = max(4, int(font_size * adjustment_ratio * 0.95))
-                    line_height = font_size + 2
-                    
-                    try:
-                        font = ImageFont.truetype("C:/Windows/Fonts/malgun.ttf", font_size)
-                    except:
-                        font = ImageFont.load_default()
-                    
-                    # 줄바꿈 다시 계산
-                    wrapped_lines = []
-                    chars_per_line = max(10, int(display_width / (font_size * 0.6)))
-                    
-                    for line in lines:
-                        if not line.strip():
-                            wrapped_lines.append("")
-                            continue
-                        
-                        while len(line) > chars_per_line:
-                            wrapped_lines.append(line[:chars_per_line])
-                            line = line[chars_per_line:]
-                        if line:
-                            wrapped_lines.append(line)
-                
-                # 텍스트 그리기
-                y_offset = text_y
-                for line in wrapped_lines:
-                    if y_offset + line_height < display_height - 3:
-                        draw.text((5, y_offset), line, fill='black', font=font)
-                        y_offset += line_height
-                    else:
-                        break  # 공간이 부족하면 중단
-            
-            # Tkinter 이미지로 변환
-            photo = ImageTk.PhotoImage(preview_img)
-            self.print_preview_label.config(image=photo, text="")
-            self.print_preview_label.image = photo
-            
-        except Exception as e:
-            print(f"미리보기 업데이트 오류: {e}")  # 디버깅용
-            import traceback
-            traceback.print_exc()  # 상세 오류 출력
+        # 현재 입력값을 고정해서 넘김 (작업 스레드는 위젯을 읽지 않음)
+        self.preview_worker.request(
+            self.image_path,
+            self.get_caption(),
+            self.image_ratio
+        )
+
+    def show_preview(self, preview_img):
+        """완성된 미리보기를 화면에 표시 (메인 스레드)"""
+        # Tkinter 이미지로 변환
+        from PIL import ImageTk
+        photo = ImageTk.PhotoImage(preview_img)
+        self.print_preview_label.config(image=photo, text="")
+        self.print_preview_label.image = photo
+
+        # 최소 글자 크기로도 넘치면 경고 표시
+        if preview_img.info.get('truncated'):
+            self.fit_warning_label.config(text="⚠️ 글귀가 길어 일부가 잘립니다")
+        else:
+            self.fit_warning_label.config(text="")
+
+        if timing.is_enabled():
+            self.timing_label.config(text=timing.format_record(timing.last('preview')))
+
+    def show_preview_error(self, message):
+        """미리보기를 그리지 못한 이유를 미리보기 자리에 표시 (메인 스레드)"""
+        self.print_preview_label.config(
+            image="", text=f"⚠️ 미리보기를 그릴 수 없습니다\n\n{message}",
+            wraplength=max(100, self.print_preview_label.winfo_width() - 20))
+        self.print_preview_label.image = None
+        self.fit_warning_label.config(text="")
+
+    def toggle_timing_overlay(self, event=None):
+        """단계별 시간 표시 켜고 끄기 (F12)"""
+        if self.timing_label.winfo_ismapped():
+            self.timing_label.pack_forget()
+        else:
+            self.timing_label.pack(pady=(3, 0))
 
     def clear_placeholder(self, event):
         """텍스트 입력 시 placeholder 제거"""
-        if self.text_input.get("1.0", "end-1c") == "원하는 글귀를 입력하세요...":
+        if self.text_input.get("1.0", "end-1c") == renderer.PLACEHOLDER_TEXT:
             self.text_input.delete("1.0", "end")
         self.update_preview()
 
     def select_image(self):
-        """이미지 파일 선택"""
-        file_path = filedialog.askopenfilename(
-            title="사진을 선택하세요",
+        """이미지 파일 선택 (여러 장 선택 가능)"""
+        file_paths = filedialog.askopenfilenames(
+            title="사진을 선택하세요 (여러 장 선택 가능)",
             filetypes=[
                 ("이미지 파일", "*.jpg *.jpeg *.png *.bmp *.gif"),
                 ("모든 파일", "*.*")
             ]
         )
 
-        if file_path:
-            self.image_path = file_path
-            self.display_image(file_path)
-            # PDF 및 출력 버튼 활성화
-            self.pdf_button.config(state="normal")
-            self.print_button.config(state="normal")
-            # 미리보기 업데이트 (약간의 지연 후 실행)
-            self.root.after(100, self.update_preview)
+        if file_paths:
+            self.load_images(self.root.tk.splitlist(file_paths))
+
+    def open_folder_browser(self):
+        """폴더를 골라 사진 격자 창 열기"""
+        folder = filedialog.askdirectory(title="사진 폴더를 선택하세요")
+        if not folder:
+            return
+
+        from folder_browser import FolderBrowser
+
+        if self.folder_browser is None or self.folder_browser.closed:
+            self.folder_browser = FolderBrowser(self.root, self.load_images, IMAGE_EXTENSIONS)
+        self.folder_browser.show(folder)
 
     def display_image(self, image_path):
         """선택한 이미지 미리보기"""
         try:
-            # 이미지 로드
-            image = Image.open(image_path)
-
             # 미리보기 프레임의 현재 크기 가져오기
             self.preview_frame.update_idletasks()
             frame_width = self.preview_frame.winfo_width()
@@ -516,10 +687,15 @@ class ImageToPDFApp:
             display_width = frame_width - 40
             display_height = frame_height - 40
 
-            # 비율 유지하며 크기 조정
-            image.thumbnail((display_width, display_height), Image.Resampling.LANCZOS)
+            with timing.trace('display', image=os.path.basename(image_path)):
+                # 사진 자원 로드 (세션 동안 한 번만 읽고 디코딩)
+                asset = get_asset(image_path)
+
+                # 비율 유지하며 크기 조정 (작업용 축소본에서 생성)
+                image = asset.fit(display_width, display_height)
 
             # Tkinter용 이미지로 변환
+            from PIL import ImageTk
             photo = ImageTk.PhotoImage(image)
 
             # 이미지 표시
@@ -529,8 +705,41 @@ class ImageToPDFApp:
         except Exception as e:
             messagebox.showerror("오류", f"이미지를 불러올 수 없습니다:\n{str(e)}")
 
+    def snapshot_pages(self):
+        """현재 사진/글귀/비율을 작업용으로 고정 (이후 입력을 바꿔도 영향 없음)"""
+        self.captions[self.current_index] = self.get_caption()
+        return [
+            (path, self.captions.get(i, ""), self.image_ratio)
+            for i, path in enumerate(self.image_paths)
+        ]
+
+    def snapshot_sheet(self):
+        """현재 매수와 한 장에 넣을 장수 (copies, per_sheet)"""
+        try:
+            copies = int(self.copies.get())
+        except ValueError:
+            copies = 1
+        copies = max(1, min(renderer.MAX_COPIES, copies))
+        self.copies.set(str(copies))
+        return copies, self.per_sheet.get()
+
+    def snapshot_max_bytes(self):
+        """현재 파일 크기 제한 (바이트, 제한 없음이면 0)"""
+        return size_budget.parse_size(self.max_size.get()) or 0
+
+    def job_label(self, pages, sheet=(1, 1)):
+        """작업 목록에 보여줄 사진 이름"""
+        name = os.path.basename(pages[0][0])
+        label = f"{name} 외 {len(pages) - 1}장" if len(pages) > 1 else name
+        copies, per_sheet = sheet
+        if copies > 1:
+            label += f" ×{copies}"
+        if per_sheet > 1:
+            label += f" ({per_sheet}장씩)"
+        return label
+
     def create_pdf(self):
-        """PDF 파일 생성"""
+        """PDF 저장 작업을 대기열에 추가"""
         if not self.image_path:
             messagebox.showwarning("경고", "먼저 사진을 선택하세요!")
             return
@@ -546,211 +755,245 @@ class ImageToPDFApp:
         if not save_path:
             return
 
-        try:
-            self.generate_pdf(save_path)
-            
-            # 저장 완료 후 파일 열기 확인
-            response = messagebox.askyesno(
-                "저장 완료", 
-                f"PDF가 저장되었습니다!\n\n{save_path}\n\n파일을 열어보시겠습니까?"
-            )
-            
-            if response:
-                # PDF 파일 열기
-                if platform.system() == 'Windows':
-                    os.startfile(save_path)
-                else:
-                    import subprocess
-                    subprocess.call(('xdg-open', save_path))
-                    
-        except Exception as e:
-            messagebox.showerror("오류", f"PDF 생성 중 오류가 발생했습니다:\n{str(e)}")
+        pages = self.snapshot_pages()
+        dpi = self.output_dpi.get()
+        sheet = self.snapshot_sheet()
+        max_bytes = self.snapshot_max_bytes()
+
+        def work(job):
+            budget = {}
+            with timing.trace('save', pages=len(pages)):
+                embed = self.generate_pdf(save_path, pages, dpi, job.report, sheet,
+                                          max_bytes, budget)
+            job.output = save_path
+            choice = budget.get('choice')
+            if choice is not None and choice.attempts > 1:
+                # 크기 제한 때문에 줄였으면 고른 설정 안내
+                return size_budget.describe(choice)
+            # 사진을 줄여 넣었으면 절약한 용량 안내
+            if embed.resampled:
+                return (f"사진 {renderer.format_size(embed.original_bytes)} → "
+                        f"{renderer.format_size(embed.embedded_bytes)}")
+            return ""
+
+        job = Job(f"💾 {self.job_label(pages, sheet)}", work)
+        self.job_queue.submit(job)
 
     def print_pdf(self):
-        """PDF 생성 후 바로 인쇄"""
+        """인쇄 작업을 대기열에 추가 (PDF는 메모리에서 만들어 바로 전송)"""
         if not self.image_path:
             messagebox.showwarning("경고", "먼저 사진을 선택하세요!")
             return
 
-        # 임시 PDF 파일 생성
-        temp_pdf = os.path.join(
-            os.path.expanduser("~"),
-            "Documents",
-            f"temp_print_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        )
+        import printing
 
         try:
-            self.generate_pdf(temp_pdf)
+            backend = printing.get_backend()
+        except printing.PrintError as e:
+            messagebox.showerror("오류", f"인쇄할 수 없습니다:\n{str(e)}\n\nPDF를 저장한 후 수동으로 인쇄해주세요.")
+            return
 
-            if platform.system() == 'Windows':
-                self.print_windows(temp_pdf)
+        pages = self.snapshot_pages()
+        dpi = self.output_dpi.get()
+        sheet = self.snapshot_sheet()
+        max_bytes = self.snapshot_max_bytes()
+        title = f"사진_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+        def work(job):
+            if not backend.accepts_pdf:
+                return print_images(job)
+            budget = {}
+            with timing.trace('print', pages=len(pages), backend=backend.name):
+                buffer = io.BytesIO()
+                self.generate_pdf(buffer, pages, dpi, job.report, sheet, max_bytes, budget)
+                job.check()  # 프린터로 보내기 직전까지 취소 가능
+                with timing.span('spool'):
+                    backend.send(buffer.getvalue(), title)
+            choice = budget.get('choice')
+            if choice is not None and choice.attempts > 1:
+                return f"{backend.describe()} · {size_budget.describe(choice)}"
+            return backend.describe()
+
+        def print_images(job):
+            # PDF를 해석하지 못하는 프린터: 같은 배치를 용지 이미지로 그려 드라이버로 인쇄
+            copies, per_sheet = sheet
+            total = -(-len(pages) * copies // per_sheet)
+
+            def sheets():
+                images = renderer.render_sheet_images(
+                    pages, copies, per_sheet, dpi=backend.raster_dpi)
+                for done, image in enumerate(images, 1):
+                    job.check()  # 취소하면 보내던 작업도 버려짐
+                    yield image
+                    job.report(done / total)
+
+            with timing.trace('print', pages=len(pages), backend=backend.name):
+                with timing.span('spool'):
+                    backend.send_images(sheets(), title)
+            return backend.describe()
+
+        job = Job(f"🖨️ {self.job_label(pages, sheet)}", work)
+        self.job_queue.submit(job)
+
+    def generate_pdf(self, output, pages=None, dpi=None, progress=None, sheet=None,
+                     max_bytes=None, budget=None):
+        """PDF 생성 핵심 로직 (삽입한 사진 정보 반환)
+
+        output은 파일 경로 또는 쓰기 가능한 파일 객체(io.BytesIO 등)입니다.
+        pages/dpi/sheet/max_bytes를 주지 않으면 현재 입력값을 사용합니다 (메인 스레드에서만).
+        sheet는 (매수, 한 장에 넣을 장수)입니다.
+        max_bytes(0이면 제한 없음)가 있으면 그 크기 안에 들도록 사진 해상도/품질/흑백을 골라 줄이고,
+        budget에 dict를 넘기면 'choice'에 고른 설정(size_budget.BudgetChoice)을 채워 줍니다.
+        progress는 페이지를 그릴 때마다 완료 비율(0~1)로 호출됩니다.
+        """
+        if pages is None:
+            pages = self.snapshot_pages()
+        if dpi is None:
+            dpi = self.output_dpi.get()
+        if sheet is None:
+            sheet = self.snapshot_sheet()
+        if max_bytes is None:
+            max_bytes = self.snapshot_max_bytes()
+
+        copies, per_sheet = sheet
+        report = (lambda done, total: progress(done / total)) if progress else None
+
+        def render(dpi, quality, gray, extra, reencode):
+            if copies > 1 or per_sheet > 1:
+                # 여러 매/여러 장 배치: 사진은 한 번만 넣고 자리마다 참조
+                return renderer.render_copies_pdf(
+                    pages,
+                    copies,
+                    per_sheet,
+                    dpi=dpi,
+                    quality=quality,
+                    extra=extra,
+                    progress=report,
+                    gray=gray,
+                    reencode=reencode
+                )
+            if len(pages) > 1:
+                # 여러 장: 사진마다 한 페이지, 사진 준비는 병렬로
+                return renderer.render_album_pdf(
+                    pages,
+                    dpi=dpi,
+                    quality=quality,
+                    extra=extra,
+                    progress=report,
+                    gray=gray,
+                    reencode=reencode
+                )
+            image_path, caption, ratio = pages[0]
+            data = renderer.render_pdf(
+                image_path,
+                caption,
+                ratio,
+                dpi=dpi,
+                quality=quality,
+                extra=extra,
+                gray=gray,
+                reencode=reencode
+            )
+            if progress:
+                progress(1.0)
+            return data
+
+        if max_bytes:
+            # 크기 제한: 넘칠 때만 사진을 줄여 가며 다시 만듦
+            data, extra, choice = size_budget.render_within(render, max_bytes, dpi)
+            if budget is not None:
+                budget['choice'] = choice
+        else:
+            extra = {}
+            data = render(dpi, renderer.DEFAULT_JPEG_QUALITY, False, extra, False)
+        embed = renderer.total_embed(extra['embeds']) if 'embeds' in extra else extra['embed']
+        with timing.span('write'):
+            if hasattr(output, 'write'):
+                output.write(data)
             else:
-                messagebox.showinfo("알림", "Windows에서만 직접 인쇄가 가능합니다.\nPDF를 저장한 후 수동으로 인쇄해주세요.")
-
-        except Exception as e:
-            messagebox.showerror("오류", f"인쇄 중 오류가 발생했습니다:\n{str(e)}")
-
-    def generate_pdf(self, output_path):
-        """PDF 생성 핵심 로직"""
-        # PDF 캔버스 생성 (A4 크기)
-        c = canvas.Canvas(output_path, pagesize=A4)
-        width, height = A4
-
-        # 이미지 추가
-        img = Image.open(self.image_path)
-        img_width, img_height = img.size
-
-        # 텍스트 내용 확인
-        text_content = self.text_input.get("1.0", "end-1c").strip()
-        has_text = text_content and text_content != "원하는 글귀를 입력하세요..."
+                with open(output, 'wb') as f:
+                    f.write(data)
+        return embed
+
+    def on_job_update(self, job):
+        """작업 상태가 바뀌면 목록 갱신 (메인 스레드)"""
+        jobs = self.job_queue.jobs
+        if job in jobs:
+            index = jobs.index(job)
+            if index < self.job_list.size():
+                self.job_list.delete(index)
+            self.job_list.insert(index, job.describe())
+            self.job_list.itemconfig(index, fg=JOB_COLORS.get(job.status, "black"))
+
+        pending = self.job_queue.pending()
+        self.job_status_label.config(
+            text=f"남은 작업 {pending}개" if pending else "모든 작업이 끝났습니다"
+        )
 
-        # 사진 비율에 따라 공간 배분
-        image_space_ratio = self.image_ratio / 100.0
-        text_space_ratio = (100 - self.image_ratio) / 100.0
+        if job.status == job_queue.FAILED:
+            messagebox.showerror("오류", f"{job.label} 작업 중 오류가 발생했습니다:\n{job.message}")
 
-        # A4 용지에 맞게 이미지 크기 조정 (여백 절반으로 축소)
-        max_width = width - 50  # 좌우 여백 25씩 (기존 50에서 절반)
-        
-        if has_text:
-            # 텍스트가 있으면 비율에 따라 공간 분배
-            max_height = (height - 75) * image_space_ratio  # 상하 여백 75 (기존 150에서 절반)
+    def cancel_selected_job(self):
+        """목록에서 고른 작업 취소 (고르지 않으면 가장 최근 진행 중인 작업)"""
+        jobs = self.job_queue.jobs
+        selection = self.job_list.curselection()
+        if selection:
+            targets = [jobs[selection[0]]]
         else:
-            # 텍스트가 없으면 전체 공간 사용
-            max_height = height - 75
-
-        # 비율 유지하며 크기 계산
-        ratio = min(max_width / img_width, max_height / img_height)
-        new_width = img_width * ratio
-        new_height = img_height * ratio
-
-        # 이미지 중앙 배치
-        x = (width - new_width) / 2
-        y = height - 25 - new_height  # 상단에서 25 포인트 아래 (기존 50에서 절반)
-
-        c.drawImage(
-            ImageReader(self.image_path),
-            x, y,
-            width=new_width,
-            height=new_height,
-            preserveAspectRatio=True
-        )
-
-        # 텍스트 추가 (입력된 경우)
-        if has_text:
-            # 텍스트 영역 시작 위치
-            text_y_start = y - 20  # 이미지와 텍스트 간격 축소 (기존 30에서 20)
-            text_area_height = (height - 75) * text_space_ratio
-            
-            # 텍스트 줄 분리 및 길이 계산
-            lines = text_content.split('\n')
-            all_lines = []
-            
-            # 기본 폰트 크기 (1.5배 증가)
-            base_font_size = 24
-            
-            # 좌측 여백 설정
-            left_margin = 25
-            
-            # 각 줄을 적절히 분할
-            for line in lines:
-                if not line.strip():
-                    all_lines.append("")
-                    continue
-                    
-                # 한 줄이 너무 길면 자동 줄바꿈
-                if c.stringWidth(line, self.pdf_font, base_font_size) > max_width:
-                    words = line.split()
-                    current_line = ""
-                    for word in words:
-                        test_line = current_line + word + " "
-                        if c.stringWidth(test_line, self.pdf_font, base_font_size) <= max_width:
-                            current_line = test_line
-                        else:
-                            if current_line:
-                                all_lines.append(current_line.strip())
-                            current_line = word + " "
-                    if current_line:
-                        all_lines.append(current_line.strip())
-                else:
-                    all_lines.append(line)
-            
-            # 필요한 총 높이 계산 및 폰트 크기 자동 조절
-            line_spacing = base_font_size + 6
-            total_text_height = len(all_lines) * line_spacing
-            
-            # 텍스트가 영역을 초과하면 폰트 크기 축소
-            if total_text_height > text_area_height:
-                # 비율에 맞춰 폰트 축소
-                font_size = int(base_font_size * (text_area_height / total_text_height) * 0.95)  # 0.95 여유 공간
-                font_size = max(8, font_size)  # 최소 8pt
-                line_spacing = font_size + 4
-                
-                # 폰트 크기를 줄인 후 다시 줄바꿈 계산
-                all_lines = []
-                for line in lines:
-                    if not line.strip():
-                        all_lines.append("")
-                        continue
-                        
-                    if c.stringWidth(line, self.pdf_font, font_size) > max_width:
-                        words = line.split()
-                        current_line = ""
-                        for word in words:
-                            test_line = current_line + word + " "
-                            if c.stringWidth(test_line, self.pdf_font, font_size) <= max_width:
-                                current_line = test_line
-                            else:
-                                if current_line:
-                                    all_lines.append(current_line.strip())
-                                current_line = word + " "
-                        if current_line:
-                            all_lines.append(current_line.strip())
-                    else:
-                        all_lines.append(line)
-                
-                # 다시 한번 높이 체크 후 필요시 추가 축소
-                total_text_height = len(all_lines) * line_spacing
-                if total_text_height > text_area_height:
-                    font_size = int(font_size * (text_area_height / total_text_height) * 0.95)
-                    font_size = max(7, font_size)  # 최소 7pt로 더 축소
-                    line_spacing = font_size + 3
-            else:
-                font_size = base_font_size
-            
-            c.setFont(self.pdf_font, font_size)
-            
-            # 텍스트 그리기 (왼쪽 정렬)
-            text_y = text_y_start
-            for line in all_lines:
-                if text_y > 25:  # 페이지 하단 여백 확인 (기존 50에서 25)
-                    c.drawString(left_margin, text_y, line)  # 왼쪽 정렬
-                    text_y -= line_spacing
-                else:
-                    # 페이지를 벗어나는 경우 경고 (디버깅용, 실제로는 폰트가 충분히 작아져야 함)
-                    break
-
-        c.save()
+            targets = [job for job in reversed(jobs) if not job.finished][:1]
+        for job in targets:
+            self.job_queue.cancel(job)
+
+    def open_job_output(self, event=None):
+        """끝난 저장 작업을 두 번 누르면 PDF 열기"""
+        selection = self.job_list.curselection()
+        if not selection:
+            return
+        job = self.job_queue.jobs[selection[0]]
+        path = job.output
+        if job.status != job_queue.DONE or not path:
+            return
+        if platform.system() == 'Windows':
+            os.startfile(path)
+        else:
+            import subprocess
+            subprocess.call(('xdg-open', path))
+
+    def on_close(self):
+        """창 닫기 (남은 작업이 있으면 확인)"""
+        pending = self.job_queue.pending()
+        if pending and not messagebox.askyesno(
+                "확인", f"아직 끝나지 않은 작업이 {pending}개 있습니다.\n취소하고 종료하시겠습니까?"):
+            return
+        self.job_queue.close()
+        self.preview_worker.close()
+        if self.folder_browser is not None and not self.folder_browser.closed:
+            self.folder_browser.close()
+        self.root.destroy()
 
-    def print_windows(self, pdf_path):
-        """Windows에서 PDF 인쇄"""
-        try:
-            # 기본 프린터로 인쇄
-            win32api.ShellExecute(
-                0,
-                "print",
-                pdf_path,
-                None,
-                ".",
-                0
-            )
-            messagebox.showinfo("완료", "인쇄 작업이 시작되었습니다!")
-        except Exception as e:
-            messagebox.showerror("오류", f"인쇄 중 오류가 발생했습니다:\n{str(e)}")
+    def clear_finished_jobs(self):
+        """끝난 작업을 목록에서 지우기"""
+        self.job_queue.clear_finished()
+        self.job_list.delete(0, "end")
+        for index, job in enumerate(self.job_queue.jobs):
+            self.job_list.insert(index, job.describe())
+            self.job_list.itemconfig(index, fg=JOB_COLORS.get(job.status, "black"))
 
 
 def main():
+    global tk, filedialog, messagebox, scrolledtext
+    import tkinter as tk
+    from tkinter import filedialog, messagebox, scrolledtext
+    from tkinterdnd2 import TkinterDnD
+    startup.mark("모듈 불러오기")
+
     root = TkinterDnD.Tk()  # 드래그 앤 드롭 지원
     app = ImageToPDFApp(root)
+    root.protocol("WM_DELETE_WINDOW", app.on_close)
+    startup.mark("창 구성")
+
+    # 첫 화면이 그려진 뒤 시작 시간 보고 (PHOTO_PDF_STARTUP 설정 시)
+    root.after_idle(startup.first_frame)
     root.mainloop()
 
 
@@ -0,0 +1,122 @@
+"""
+백그라운드 인쇄 미리보기 렌더러
+빠른 타이핑이나 슬라이더 조작 중에도 창이 멈추지 않도록
+미리보기를 작업 스레드에서 그리고, 오래된 요청은 버립니다.
+"""
+import threading
+import time
+
+# 연속 입력을 하나로 묶는 시간 (초)
+DEBOUNCE_SECONDS = 0.04
+
+
+class PreviewWorker:
+    """최신 요청 하나만 유지하는 미리보기 작업 스레드"""
+
+    def __init__(self, root, render, on_done, on_error=None, debounce=DEBOUNCE_SECONDS, idle=None):
+        """
+        render: 작업 스레드에서 호출되는 함수 (인자 -> PIL 이미지)
+        on_done: Tk 메인 스레드에서 결과 이미지로 호출되는 함수
+        on_error: 그리지 못했을 때 Tk 메인 스레드에서 오류 설명 문자열로 호출되는 함수
+        idle: 그린 뒤 밀린 요청이 없으면 같은 인자로 호출되는 함수 (미리 그리기용)
+              stop 인자로 받은 함수가 True를 돌려주면 바로 끝내야 합니다.
+        """
+        self.root = root
+        self.render = render
+        self.on_done = on_done
+        self.on_error = on_error
+        self.debounce = debounce
+        self.idle = idle
+
+        self._cond = threading.Condition()
+        self._job = None          # 아직 처리하지 않은 최신 요청 인자
+        self._generation = 0      # 요청마다 증가, 결과가 최신인지 판단
+        self._last_request = 0.0
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name="preview-worker", daemon=True)
+        self._thread.start()
+
+    def request(self, *args):
+        """미리보기 요청 (인자는 요청 시점 값으로 고정됨)"""
+        with self._cond:
+            now = time.monotonic()
+            self._generation += 1
+            # 직전 요청과 간격이 짧을 때만 기다렸다가 묶음 처리
+            burst = now - self._last_request < self.debounce
+            self._last_request = now
+            self._job = (self._generation, args, now + self.debounce if burst else now)
+            self._cond.notify()
+
+    def close(self):
+        """작업 스레드 종료"""
+        with self._cond:
+            self._closed = True
+            self._job = None
+            self._cond.notify()
+
+    def _is_current(self, generation):
+        with self._cond:
+            return generation == self._generation and not self._closed
+
+    def _has_request(self):
+        """새 요청이 들어왔거나 종료 중인지 (미리 그리기 중단 확인용)"""
+        with self._cond:
+            return self._job is not None or self._closed
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._job is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+
+                # 입력이 잦아들 때까지 대기 (새 요청이 오면 기한 연장)
+                generation, args, due = self._job
+                while True:
+                    remaining = due - time.monotonic()
+                    if remaining <= 0 or self._closed:
+                        break
+                    self._cond.wait(remaining)
+                    generation, args, due = self._job or (generation, args, due)
+                if self._closed:
+                    return
+                self._job = None
+
+            try:
+                image = self.render(*args)
+            except Exception as e:
+                # 창 프로그램은 콘솔 출력이 보이지 않으므로 화면으로 알림
+                if self._is_current(generation) and self.on_error is not None:
+                    try:
+                        self.root.after(0, self._deliver_error, generation, str(e) or type(e).__name__)
+                    except RuntimeError:
+                        return
+                continue
+
+            # 그리는 동안 새 요청이 왔으면 결과 폐기
+            if not self._is_current(generation):
+                continue
+
+            try:
+                self.root.after(0, self._deliver, generation, image)
+            except RuntimeError:
+                return  # 메인 루프가 이미 종료됨
+
+            # 한가한 동안 다음 요청에 쓸 결과를 미리 준비
+            if self.idle is not None and not self._has_request():
+                try:
+                    self.idle(*args, stop=self._has_request)
+                except Exception:
+                    pass  # 미리 그리기는 생략해도 됨 (필요하면 요청 때 다시 그리며 오류를 알림)
+
+    def _deliver(self, generation, image):
+        """메인 스레드에서 최신 결과만 화면에 반영"""
+        if self._is_current(generation):
+            self.on_done(image)
+
+    def _deliver_error(self, generation, message):
+        """메인 스레드에서 최신 요청의 오류만 화면에 반영"""
+        if self._is_current(generation):
+            self.on_error(message)
@@ -0,0 +1,278 @@
+"""
+인쇄 백엔드
+메모리에서 만든 PDF나 용지 이미지를 임시 파일이나 PDF 보기 프로그램 없이 바로 프린터로 보냅니다.
+
+- windows: 프린터 드라이버(GDI)로 용지 이미지를 그려 인쇄 (모든 Windows 프린터)
+- windows-raw: win32print로 인쇄 대기열에 PDF를 RAW 데이터로 직접 전송
+  (PDF를 직접 해석하는 프린터만 가능, 받지 못하면 오류로 알림)
+- cups: Linux/macOS의 lp 명령에 표준 입력으로 전달
+- spool:폴더: 실제 인쇄 대신 폴더에 PDF를 차례로 저장 (시험용)
+
+PHOTO_PDF_PRINTER 환경 변수로 고를 수 있습니다.
+예) windows, windows:프린터이름, windows-raw:프린터이름, cups:프린터이름, spool:C:\\temp\\spool
+"""
+import os
+import platform
+import shutil
+import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+
+# GetDeviceCaps 항목
+_PHYSICALWIDTH = 110
+_PHYSICALHEIGHT = 111
+_PHYSICALOFFSETX = 112
+_PHYSICALOFFSETY = 113
+
+# 인쇄 작업 상태 (GetJob)
+_JOB_STATUS_ERROR = 0x0002
+_JOB_STATUS_DELETED = 0x0100
+_JOB_STATUS_BLOCKED_DEVQ = 0x0200   # 드라이버가 처리할 수 없는 데이터
+_JOB_STATUS_PRINTED = 0x0080
+_JOB_CONTROL_DELETE = 5
+
+# RAW 전송 뒤 프린터가 받아들였는지 확인하는 시간 (초)
+RAW_CHECK_SECONDS = 5.0
+
+
+class PrintError(Exception):
+    """인쇄 작업을 보낼 수 없을 때"""
+
+
+class PrintBackend(ABC):
+    """인쇄 백엔드 기본 클래스 (PdfBackend나 ImageBackend를 상속해 구현)"""
+
+    name = "none"
+
+    # True면 send로 PDF 바이트를, False면 send_images로 용지 이미지를 받음
+    accepts_pdf = True
+
+    def __init__(self, printer=None):
+        self.printer = printer or None
+
+    def describe(self):
+        """사용자에게 보여줄 프린터 설명"""
+        return self.printer or "기본 프린터"
+
+
+class PdfBackend(PrintBackend):
+    """PDF 바이트를 그대로 받는 백엔드"""
+
+    accepts_pdf = True
+
+    @abstractmethod
+    def send(self, data, title="사진 PDF"):
+        """PDF 바이트를 인쇄 대기열로 전송, 작업 번호(문자열) 반환"""
+
+
+class ImageBackend(PrintBackend):
+    """용지 이미지를 받아 그리는 백엔드 (PDF를 해석하지 못하는 프린터용)"""
+
+    accepts_pdf = False
+
+    # 용지 이미지 해상도 (DPI)
+    raster_dpi = 300
+
+    @abstractmethod
+    def send_images(self, images, title="사진 PDF"):
+        """용지 이미지(PIL, 한 장에 한 페이지)를 차례로 인쇄, 작업 번호(문자열) 반환"""
+
+
+def _windows_printer(printer):
+    """지정한 프린터 이름 (없으면 Windows 기본 프린터)"""
+    try:
+        import win32print
+    except ImportError:
+        raise PrintError("pywin32가 설치되어 있지 않습니다.")
+    try:
+        return printer or win32print.GetDefaultPrinter()
+    except Exception:
+        raise PrintError("기본 프린터가 설정되어 있지 않습니다.")
+
+
+class WindowsGdiBackend(ImageBackend):
+    """Windows 프린터 드라이버로 용지 이미지를 그려 인쇄 (PDF를 해석하지 않는 프린터도 가능)"""
+
+    name = "windows"
+
+    def describe(self):
+        try:
+            return _windows_printer(self.printer)
+        except PrintError:
+            return "기본 프린터"
+
+    def send_images(self, images, title="사진 PDF"):
+        printer = _windows_printer(self.printer)
+        try:
+            import win32ui
+            from PIL import ImageWin
+        except ImportError:
+            raise PrintError("pywin32가 설치되어 있지 않습니다.")
+
+        try:
+            dc = win32ui.CreateDC()
+            dc.CreatePrinterDC(printer)
+        except win32ui.error as e:
+            raise PrintError(f"프린터를 열 수 없습니다 ({printer}): {e}")
+        try:
+            # 좌표 원점은 인쇄 가능 영역의 왼쪽 위이므로, 용지 전체 기준으로 여백만큼 당김
+            paper = (dc.GetDeviceCaps(_PHYSICALWIDTH), dc.GetDeviceCaps(_PHYSICALHEIGHT))
+            offset = (dc.GetDeviceCaps(_PHYSICALOFFSETX), dc.GetDeviceCaps(_PHYSICALOFFSETY))
+            job = dc.StartDoc(title)
+            try:
+                for image in images:
+                    # 용지 비율이 조금 달라도(A4/Letter) 늘이지 않고 가운데에 맞춤
+                    scale = min(paper[0] / image.width, paper[1] / image.height)
+                    width, height = int(image.width * scale), int(image.height * scale)
+                    left = (paper[0] - width) // 2 - offset[0]
+                    top = (paper[1] - height) // 2 - offset[1]
+                    dc.StartPage()
+                    ImageWin.Dib(image).draw(dc.GetHandleOutput(),
+                                             (left, top, left + width, top + height))
+                    dc.EndPage()
+            except BaseException:
+                dc.AbortDoc()  # 반쯤 그린 작업이 인쇄되지 않도록
+                raise
+            dc.EndDoc()
+        except win32ui.error as e:
+            raise PrintError(f"인쇄할 수 없습니다 ({printer}): {e}")
+        finally:
+            dc.DeleteDC()
+        return str(job)
+
+
+class WindowsRawBackend(PdfBackend):
+    """Windows 인쇄 대기열에 PDF를 RAW로 직접 전송 (PDF를 해석하는 프린터 전용)"""
+
+    name = "windows-raw"
+
+    def describe(self):
+        try:
+            return f"{_windows_printer(self.printer)} (RAW)"
+        except PrintError:
+            return "기본 프린터 (RAW)"
+
+    def send(self, data, title="사진 PDF"):
+        import win32print
+
+        printer = _windows_printer(self.printer)
+        try:
+            handle = win32print.OpenPrinter(printer)
+        except Exception as e:
+            raise PrintError(f"프린터를 열 수 없습니다 ({printer}): {e}")
+        try:
+            try:
+                job = win32print.StartDocPrinter(handle, 1, (title, None, "RAW"))
+                try:
+                    win32print.StartPagePrinter(handle)
+                    win32print.WritePrinter(handle, data)
+                    win32print.EndPagePrinter(handle)
+                finally:
+                    win32print.EndDocPrinter(handle)
+            except Exception as e:
+                raise PrintError(f"인쇄 대기열에 보낼 수 없습니다 ({printer}): {e}")
+            self._check_accepted(win32print, handle, job, printer)
+        finally:
+            win32print.ClosePrinter(handle)
+        return str(job)
+
+    def _check_accepted(self, win32print, handle, job, printer):
+        """프린터가 PDF를 받지 못하면 작업을 지우고 PrintError
+
+        대기열에 들어간 것만으로는 성공이 아니므로, 잠시 작업 상태를 지켜봅니다.
+        작업이 끝나 대기열에서 사라지거나 시간 안에 오류가 없으면 성공으로 봅니다.
+        """
+        deadline = time.monotonic() + RAW_CHECK_SECONDS
+        while time.monotonic() < deadline:
+            try:
+                status = win32print.GetJob(handle, job, 1)['Status']
+            except Exception:
+                return  # 다 보내져 대기열에서 사라짐
+            if status & (_JOB_STATUS_PRINTED | _JOB_STATUS_DELETED):
+                return
+            if status & (_JOB_STATUS_ERROR | _JOB_STATUS_BLOCKED_DEVQ):
+                try:
+                    win32print.SetJob(handle, job, 0, None, _JOB_CONTROL_DELETE)
+                except Exception:
+                    pass
+                raise PrintError(
+                    f"프린터가 PDF를 직접 받지 못합니다 ({printer}). "
+                    "windows 방식(기본값)으로 인쇄하세요.")
+            time.sleep(0.25)
+
+
+class CupsBackend(PdfBackend):
+    """CUPS lp 명령으로 전송 (PDF는 표준 입력으로 전달)"""
+
+    name = "cups"
+
+    def __init__(self, printer=None, command="lp"):
+        super().__init__(printer)
+        self.command = command
+
+    def send(self, data, title="사진 PDF"):
+        if shutil.which(self.command) is None:
+            raise PrintError(f"{self.command} 명령을 찾을 수 없습니다 (CUPS 설치 필요).")
+
+        args = [self.command, "-t", title]
+        if self.printer:
+            args += ["-d", self.printer]
+        args.append("-")
+        try:
+            result = subprocess.run(args, input=data, capture_output=True, timeout=60)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise PrintError(f"{self.command} 실행 실패: {e}")
+        if result.returncode != 0:
+            message = result.stderr.decode(errors="replace").strip()
+            raise PrintError(message or f"{self.command} 종료 코드 {result.returncode}")
+        # 예: "request id is Office-12 (1 file(s))"
+        output = result.stdout.decode(errors="replace").strip()
+        return output.split(" is ", 1)[-1].split(" ", 1)[0] if " is " in output else output
+
+
+class DirectorySpoolBackend(PdfBackend):
+    """폴더에 작업을 차례로 저장하는 가짜 프린터 (시험용)"""
+
+    name = "spool"
+
+    def __init__(self, folder):
+        super().__init__(folder)
+        self.folder = folder
+        self._lock = threading.Lock()
+
+    def send(self, data, title="사진 PDF"):
+        os.makedirs(self.folder, exist_ok=True)
+        with self._lock:
+            number = 1 + sum(1 for n in os.listdir(self.folder) if n.endswith(".pdf"))
+            path = os.path.join(self.folder, f"{number:05d}.pdf")
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        return str(number)
+
+
+def get_backend(spec=None):
+    """설정 문자열(또는 PHOTO_PDF_PRINTER)로 인쇄 백엔드 선택
+
+    지정하지 않으면 Windows는 프린터 드라이버(GDI), 그 밖에는 lp 명령을 씁니다.
+    RAW 전송은 windows-raw로 직접 고를 때만 씁니다.
+    """
+    spec = spec if spec is not None else os.environ.get("PHOTO_PDF_PRINTER", "")
+    kind, _, arg = spec.partition(":")
+    kind = kind.strip().lower()
+    if not kind:
+        kind = "windows" if platform.system() == "Windows" else "cups"
+
+    if kind == "windows":
+        return WindowsGdiBackend(arg)
+    if kind in ("windows-raw", "raw"):
+        return WindowsRawBackend(arg)
+    if kind in ("cups", "lp"):
+        return CupsBackend(arg)
+    if kind == "spool":
+        if not arg:
+            raise PrintError("spool에는 저장할 폴더를 지정해야 합니다 (예: spool:C:\\temp\\spool).")
+        return DirectorySpoolBackend(arg)
+    raise PrintError(f"알 수 없는 인쇄 방식입니다: {kind} (windows, windows-raw, cups, spool 중 하나)")
@@ -0,0 +1,689 @@
+"""
+사진+글귀 페이지 렌더링 엔진
+Tk 창 없이도 PDF와 미리보기 이미지를 만들 수 있습니다.
+
+프로그램 시작을 빠르게 하려고 Pillow와 reportlab은 처음 쓸 때 불러옵니다.
+"""
+import io
+import math
+import os
+import threading
+from collections import OrderedDict, deque, namedtuple
+
+from fonts import get_font, setup_pdf_font
+from image_asset import load_asset
+from large_image import budget_scale, limit_size
+from text_layout import fit_text, get_metrics
+import timing
+
+# 글귀 입력창의 안내 문구 (실제 글귀로 취급하지 않음)
+PLACEHOLDER_TEXT = "원하는 글귀를 입력하세요..."
+
+# 용지 크기 (포인트 단위, reportlab.lib.pagesizes와 같은 값)
+_MM = 72 / 25.4
+A4 = (210 * _MM, 297 * _MM)
+A5 = (148 * _MM, 210 * _MM)
+B5 = (176 * _MM, 250 * _MM)
+LETTER = (8.5 * 72, 11 * 72)
+LEGAL = (8.5 * 72, 14 * 72)
+
+PAGE_SIZES = {
+    'A4': A4,
+    'A5': A5,
+    'B5': B5,
+    'LETTER': LETTER,
+    'LEGAL': LEGAL,
+}
+
+# 인쇄용 사진 해상도 (DPI, 0이면 원본 그대로 삽입)
+OUTPUT_DPI_CHOICES = (150, 300, 600)
+DEFAULT_DPI = 300
+DEFAULT_JPEG_QUALITY = 90
+
+# 원본이 목표 해상도보다 이 비율 이상 클 때만 줄임
+RESAMPLE_THRESHOLD = 1.1
+
+# 한 장에 여러 장 배치: 장수 -> (열, 행, 회전)
+# 회전하면 세로 카드를 눕혀서 배치 (A4에 2장이면 A5, 8장이면 A7 카드)
+SHEET_LAYOUTS = {
+    1: (1, 1, False),
+    2: (1, 2, True),
+    4: (2, 2, False),
+    8: (2, 4, True),
+}
+
+# 매수 범위
+MAX_COPIES = 99
+
+# PDF를 해석하지 못하는 프린터로 보낼 용지 이미지 해상도 (DPI)
+PRINT_RASTER_DPI = 300
+
+# 미리보기 기본 너비 (A4 비율 1:1.414)
+PREVIEW_WIDTH = 180
+
+# 비율 슬라이더 범위 (미리 그려 둘 사진 크기)
+RATIO_RANGE = range(20, 81)
+
+# 미리보기 층 캐시 크기 (사진 층: 사진 x 크기, 글귀 층: 배치 조합)
+PHOTO_LAYER_CACHE_SIZE = 256
+TEXT_LAYER_CACHE_SIZE = 32
+
+# 페이지 배치 결과 (포인트 단위, PDF 좌표계: 왼쪽 아래가 원점)
+# image_box: (x, y, 너비, 높이), text_x/text_y: 첫 줄 기준선 위치, fit: TextFit 또는 None
+PageLayout = namedtuple('PageLayout', 'page_size image_box text_x text_y fit')
+
+# PDF에 삽입한 사진 정보 (원본 파일 크기, 삽입된 크기, 삽입 픽셀 크기, 재인코딩 여부)
+EmbedInfo = namedtuple('EmbedInfo', 'original_bytes embedded_bytes pixel_size resampled')
+
+# 그리기 직전까지 준비된 페이지 (layout: PageLayout, source: drawImage 원본, embed: EmbedInfo)
+PreparedPage = namedtuple('PreparedPage', 'layout source embed')
+
+
+def normalize_caption(text):
+    """글귀 정리 (빈 글귀나 안내 문구는 빈 문자열로)"""
+    text = (text or "").strip()
+    if text == PLACEHOLDER_TEXT:
+        return ""
+    return text
+
+
+def resolve_page_size(pagesize):
+    """용지 이름 또는 (너비, 높이) 튜플을 포인트 크기로 변환"""
+    if isinstance(pagesize, str):
+        try:
+            return PAGE_SIZES[pagesize.upper()]
+        except KeyError:
+            raise ValueError(f"지원하지 않는 용지 크기입니다: {pagesize}")
+    return pagesize
+
+
+def new_canvas(output, pagesize):
+    """reportlab 캔버스 생성 (reportlab은 여기서 처음 불러옴)"""
+    from reportlab import rl_config
+    from reportlab.pdfgen import canvas
+
+    # 사진 스트림을 ASCII85로 감싸지 않음 (용량 25% 증가, 순수 파이썬 인코딩이라 매우 느림)
+    rl_config.useA85 = 0
+    return canvas.Canvas(output, pagesize=pagesize)
+
+
+def warm_up():
+    """무거운 모듈과 PDF 폰트를 미리 준비 (창이 뜬 뒤 백그라운드에서 호출)"""
+    import concurrent.futures  # noqa: F401 (여러 장 PDF용)
+    from PIL import Image, ImageDraw  # noqa: F401
+    from reportlab.lib.utils import ImageReader  # noqa: F401
+
+    new_canvas(io.BytesIO(), A4)
+    font_name = setup_pdf_font()
+    get_metrics(font_name)
+    return font_name
+
+
+def format_size(num_bytes):
+    """바이트 수를 읽기 쉬운 문자열로 (예: 1.2MB)"""
+    for unit in ('B', 'KB', 'MB'):
+        if num_bytes < 1024:
+            return f"{num_bytes:.0f}{unit}" if unit == 'B' else f"{num_bytes:.1f}{unit}"
+        num_bytes /= 1024.0
+    return f"{num_bytes:.1f}GB"
+
+
+def image_label(image):
+    """기록/표시용 사진 이름 (파일 이름, 메모리 사진은 'memory')"""
+    if isinstance(image, (str, os.PathLike)):
+        return os.path.basename(image)
+    name = getattr(image, 'name', None)
+    return os.path.basename(name) if name else 'memory'
+
+
+def image_box(image_size, has_text, ratio=50, pagesize=A4):
+    """사진 배치 상자 (x, y, 너비, 높이) 계산 (글귀 배치 없이 빠르게)"""
+    width, height = resolve_page_size(pagesize)
+    img_width, img_height = image_size
+
+    # 사진 비율에 따라 공간 배분
+    image_space_ratio = ratio / 100.0
+
+    # 용지에 맞게 이미지 크기 조정
+    max_width = width - 50  # 좌우 여백 25씩
+
+    if has_text:
+        # 텍스트가 있으면 비율에 따라 공간 분배
+        max_height = (height - 75) * image_space_ratio  # 상하 여백 75
+    else:
+        # 텍스트가 없으면 전체 공간 사용
+        max_height = height - 75
+
+    # 비율 유지하며 크기 계산
+    scale = min(max_width / img_width, max_height / img_height)
+    new_width = img_width * scale
+    new_height = img_height * scale
+
+    # 이미지 중앙 배치
+    x = (width - new_width) / 2
+    y = height - 25 - new_height  # 상단에서 25 포인트 아래
+    return x, y, new_width, new_height
+
+
+def layout_page(image, text="", ratio=50, pagesize=A4):
+    """사진과 글귀의 페이지 배치 계산 (PDF와 미리보기 공용)"""
+    width, height = resolve_page_size(pagesize)
+
+    # 이미지 크기 확인 (헤더만 읽은 메타데이터 사용)
+    asset = load_asset(image)
+
+    # 텍스트 내용 확인
+    text_content = normalize_caption(text)
+    has_text = bool(text_content)
+
+    x, y, new_width, new_height = image_box(asset.size, has_text, ratio, (width, height))
+    max_width = width - 50
+
+    # 텍스트 영역: 이미지 아래 20pt에서 시작, 하단 여백 25pt까지
+    left_margin = 25
+    text_y = y - 20
+    fit = None
+    if has_text:
+        with timing.span('font'):
+            metrics = get_metrics(setup_pdf_font())
+        with timing.span('fit'):
+            fit = fit_text(text_content, metrics, max_width, text_y - 25)
+
+    return PageLayout((width, height), (x, y, new_width, new_height), left_margin, text_y, fit)
+
+
+def embed_source(asset, box_width, box_height, dpi=DEFAULT_DPI, quality=DEFAULT_JPEG_QUALITY,
+                 gray=False, reencode=False):
+    """배치 크기와 DPI에 맞춘 drawImage용 원본과 EmbedInfo (gray면 흑백으로 넣음)
+
+    reencode면 원본을 그대로 넣을 수 있어도 항상 다시 인코딩합니다 (크기 제한용:
+    원본이 더 작다고 원본을 넣으면 낮춘 해상도와 품질이 파일 크기에 반영되지 않음).
+    """
+    original = EmbedInfo(asset.byte_size, asset.byte_size, asset.size, False)
+
+    # 원본을 그대로 넣을 수 있는지: JPEG는 풀지 않고 넣으므로 항상 가능,
+    # 그 밖에는 reportlab이 원본 전체를 풀기 때문에 메모리 한도 안이어야 함
+    direct = asset.format == 'JPEG' or budget_scale(asset.size, asset.mode) >= 1.0
+    if gray and asset.mode not in ('L', '1'):
+        direct = False  # 컬러 원본은 흑백으로 다시 인코딩
+    if reencode:
+        direct = False
+
+    if not dpi:
+        if direct:
+            return asset.pdf_source(), original
+        target = asset.size
+    else:
+        # 배치 크기(포인트)를 목표 픽셀로 환산 (1인치 = 72포인트)
+        target = (
+            max(1, math.ceil(box_width / 72.0 * dpi)),
+            max(1, math.ceil(box_height / 72.0 * dpi)),
+        )
+        if (direct and asset.width <= target[0] * RESAMPLE_THRESHOLD
+                and asset.height <= target[1] * RESAMPLE_THRESHOLD):
+            return asset.pdf_source(), original
+
+    from reportlab.lib.utils import ImageReader
+
+    target = limit_size(target)
+    data = asset.encode_jpeg(target, quality, gray)
+    if direct and asset.format == 'JPEG' and len(data) >= asset.byte_size:
+        return asset.pdf_source(), original
+    return ImageReader(io.BytesIO(data)), EmbedInfo(asset.byte_size, len(data), target, True)
+
+
+def total_embed(embeds):
+    """여러 페이지 EmbedInfo 합계"""
+    embeds = list(embeds)
+    return EmbedInfo(
+        sum(e.original_bytes for e in embeds),
+        sum(e.embedded_bytes for e in embeds),
+        None,
+        any(e.resampled for e in embeds),
+    )
+
+
+def prepare_page(image, text="", ratio=50, pagesize=A4,
+                 dpi=DEFAULT_DPI, quality=DEFAULT_JPEG_QUALITY, gray=False, reencode=False):
+    """페이지 한 장의 배치 계산과 사진 준비 (작업 스레드에서 실행 가능)"""
+    # 자원은 이 페이지가 끝날 때까지 직접 붙잡음 (다른 페이지 때문에 캐시에서 밀려나도 유효)
+    asset = load_asset(image)
+    layout = layout_page(asset, text, ratio, pagesize)
+    _, _, box_width, box_height = layout.image_box
+    source, embed = embed_source(asset, box_width, box_height, dpi, quality, gray, reencode)
+
+    # drawImage가 내부에서 다시 푸는 픽셀 데이터를 미리 풀어 둠 (결과는 캐시됨, JPEG 원본은 풀지 않음)
+    source.getRGBData()
+    return PreparedPage(layout, source, embed)
+
+
+def draw_prepared(c, page):
+    """준비된 페이지를 캔버스에 그리기 (showPage는 호출자가 담당)"""
+    layout = page.layout
+    x, y, new_width, new_height = layout.image_box
+    with timing.span('draw'):
+        c.drawImage(
+            page.source,
+            x, y,
+            width=new_width,
+            height=new_height,
+            preserveAspectRatio=True
+        )
+
+        # 텍스트 그리기 (왼쪽 정렬)
+        fit = layout.fit
+        if fit:
+            c.setFont(setup_pdf_font(), fit.font_size)
+            text_y = layout.text_y
+            for line in fit.lines:
+                c.drawString(layout.text_x, text_y, line)
+                text_y -= fit.line_spacing
+
+
+def draw_page(c, image, text="", ratio=50, pagesize=A4,
+              dpi=DEFAULT_DPI, quality=DEFAULT_JPEG_QUALITY, extra=None, gray=False, reencode=False):
+    """캔버스에 사진+글귀 한 페이지 그리기 (showPage는 호출자가 담당)
+
+    extra에 dict를 넘기면 'layout'(PageLayout)과 'embed'(EmbedInfo)를 채워 줍니다.
+    """
+    page = prepare_page(image, text, ratio, pagesize, dpi, quality, gray, reencode)
+    draw_prepared(c, page)
+
+    if extra is not None:
+        extra['layout'] = page.layout
+        extra['embed'] = page.embed
+    return page.layout
+
+
+def render_pdf(image, text="", ratio=50, pagesize=A4,
+               dpi=DEFAULT_DPI, quality=DEFAULT_JPEG_QUALITY, extra=None, gray=False, reencode=False):
+    """사진+글귀 한 페이지 PDF를 만들어 바이트로 반환"""
+    pagesize = resolve_page_size(pagesize)
+    with timing.trace('pdf', image=image_label(image), chars=len(text), dpi=dpi):
+        buffer = io.BytesIO()
+        c = new_canvas(buffer, pagesize)
+        draw_page(c, image, text, ratio, pagesize, dpi, quality, extra, gray, reencode)
+        with timing.span('save'):
+            c.save()
+    return buffer.getvalue()
+
+
+def prepare_pages(pages, pagesize=A4, dpi=DEFAULT_DPI, quality=DEFAULT_JPEG_QUALITY,
+                  workers=None, gray=False, reencode=False):
+    """여러 페이지를 스레드 풀에서 준비해 순서대로 돌려주는 제너레이터
+
+    pages는 (사진, 글귀, 비율) 목록입니다. 디코딩/축소/인코딩은 Pillow가
+    GIL을 풀고 수행하므로 스레드로도 병렬 처리됩니다. 메모리를 일정하게
+    유지하도록 작업자 수의 2배까지만 미리 준비합니다. 이 수는 사진 캐시
+    크기(image_asset.CACHE_SIZE)보다 클 수 있으며, 각 페이지가 자기 사진을
+    붙잡고 있으므로 캐시에서 밀려나도 문제없습니다.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    jobs = iter(pages)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="page") as pool:
+        pending = deque()
+
+        def submit_next():
+            job = next(jobs, None)
+            if job is not None:
+                image, text, ratio = job
+                # 시간 기록이 켜져 있으면 작업 스레드의 단계도 같은 기록에 합산
+                pending.append(pool.submit(
+                    timing.bind(prepare_page), image, text, ratio, pagesize, dpi, quality, gray,
+                    reencode))
+
+        for _ in range(workers * 2):
+            submit_next()
+        try:
+            while pending:
+                future = pending.popleft()
+                submit_next()
+                yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def render_album_pdf(pages, pagesize=A4, dpi=DEFAULT_DPI, quality=DEFAULT_JPEG_QUALITY,
+                     workers=None, extra=None, progress=None, gray=False, reencode=False):
+    """여러 사진을 한 장씩 담은 여러 페이지 PDF를 바이트로 반환
+
+    pages는 (사진, 글귀, 비율) 목록입니다. extra에 dict를 넘기면
+    'layouts'와 'embeds'에 페이지 순서대로 결과를 채워 줍니다.
+    progress가 있으면 페이지를 그릴 때마다 (완료 수, 전체 수)로 호출하며,
+    progress에서 예외를 내면 남은 페이지 준비를 취소하고 중단합니다.
+    """
+    pagesize = resolve_page_size(pagesize)
+    layouts = []
+    embeds = []
+    with timing.trace('album', pages=len(pages), dpi=dpi):
+        buffer = io.BytesIO()
+        c = new_canvas(buffer, pagesize)
+        for page in prepare_pages(pages, pagesize, dpi, quality, workers, gray, reencode):
+            draw_prepared(c, page)
+            c.showPage()
+            layouts.append(page.layout)
+            embeds.append(page.embed)
+            if progress:
+                progress(len(layouts), len(pages))
+        with timing.span('save'):
+            c.save()
+
+    if extra is not None:
+        extra['layouts'] = layouts
+        extra['embeds'] = embeds
+    return buffer.getvalue()
+
+
+def card_size(pagesize, per_sheet):
+    """용지 한 장에 per_sheet개를 배치할 때 카드 하나의 크기 (세로 방향, 포인트)"""
+    if per_sheet not in SHEET_LAYOUTS:
+        choices = ", ".join(str(n) for n in SHEET_LAYOUTS)
+        raise ValueError(f"한 장에 넣을 수 있는 장수는 {choices} 중 하나입니다: {per_sheet}")
+    width, height = resolve_page_size(pagesize)
+    cols, rows, rotate = SHEET_LAYOUTS[per_sheet]
+    cell = (width / cols, height / rows)
+    return (cell[1], cell[0]) if rotate else cell
+
+
+def _place_card(c, form, slot, per_sheet, pagesize):
+    """용지의 slot번째 칸에 카드 폼 배치 (왼쪽 위부터 가로 순서)"""
+    width, height = pagesize
+    cols, rows, rotate = SHEET_LAYOUTS[per_sheet]
+    cell_width, cell_height = width / cols, height / rows
+    x = (slot % cols) * cell_width
+    y = height - (slot // cols + 1) * cell_height
+    c.saveState()
+    if rotate:
+        # 카드 아래쪽이 칸의 오른쪽에 오도록 90도 회전
+        c.translate(x + cell_width, y)
+        c.rotate(90)
+    else:
+        c.translate(x, y)
+    c.doForm(form)
+    c.restoreState()
+
+
+def _draw_cut_lines(c, per_sheet, pagesize):
+    """여러 장 배치일 때 칸 사이에 옅은 자르는 선"""
+    width, height = pagesize
+    cols, rows, _ = SHEET_LAYOUTS[per_sheet]
+    c.saveState()
+    c.setStrokeGray(0.8)
+    c.setLineWidth(0.3)
+    for i in range(1, cols):
+        c.line(width * i / cols, 0, width * i / cols, height)
+    for i in range(1, rows):
+        c.line(0, height * i / rows, width, height * i / rows)
+    c.restoreState()
+
+
+def render_copies_pdf(pages, copies=1, per_sheet=1, pagesize=A4, dpi=DEFAULT_DPI,
+                      quality=DEFAULT_JPEG_QUALITY, workers=None, extra=None, progress=None,
+                      gray=False, reencode=False):
+    """사진마다 copies장씩, 용지 한 장에 per_sheet개씩 배치한 PDF를 바이트로 반환
+
+    pages는 (사진, 글귀, 비율) 목록입니다. 카드마다 사진과 글귀를 폼 XObject로
+    한 번만 넣고 모든 자리에서 참조하므로, 매수가 늘어도 파일 크기와
+    인쇄 전송 시간이 거의 늘지 않습니다.
+    extra와 progress는 render_album_pdf와 같습니다 (progress는 배치한 카드 수 기준).
+    """
+    pagesize = resolve_page_size(pagesize)
+    card = card_size(pagesize, per_sheet)
+    if not 1 <= copies <= MAX_COPIES:
+        raise ValueError(f"매수는 1에서 {MAX_COPIES} 사이여야 합니다: {copies}")
+
+    total = len(pages) * copies
+    layouts = []
+    embeds = []
+    with timing.trace('copies', pages=len(pages), copies=copies, per_sheet=per_sheet, dpi=dpi):
+        buffer = io.BytesIO()
+        c = new_canvas(buffer, pagesize)
+        slot = 0
+        placed = 0
+        prepared = prepare_pages(pages, card, dpi, quality, workers, gray, reencode)
+        for index, page in enumerate(prepared):
+            # 카드 한 장을 폼으로 한 번만 그림
+            form = f"card{index}"
+            c.beginForm(form, 0, 0, card[0], card[1])
+            draw_prepared(c, page)
+            c.endForm()
+            layouts.append(page.layout)
+            embeds.append(page.embed)
+
+            for _ in range(copies):
+                if slot == 0 and per_sheet > 1:
+                    _draw_cut_lines(c, per_sheet, pagesize)
+                _place_card(c, form, slot, per_sheet, pagesize)
+                slot += 1
+                placed += 1
+                if slot == per_sheet:
+                    c.showPage()
+                    slot = 0
+                if progress:
+                    progress(placed, total)
+        if slot:
+            c.showPage()
+        with timing.span('save'):
+            c.save()
+
+    if extra is not None:
+        extra['layouts'] = layouts
+        extra['embeds'] = embeds
+    return buffer.getvalue()
+
+
+class _LayerCache:
+    """미리보기 층 LRU 캐시 (미리보기 스레드와 미리 그리기가 함께 사용)"""
+
+    def __init__(self, size):
+        self.size = size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, make):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+                return value
+        value = make()
+        with self._lock:
+            self._items[key] = value
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+        return value
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+_photo_layers = _LayerCache(PHOTO_LAYER_CACHE_SIZE)
+_text_layers = _LayerCache(TEXT_LAYER_CACHE_SIZE)
+
+
+def clear_preview_cache():
+    """미리보기 사진 층과 글귀 층 캐시 비우기"""
+    _photo_layers.clear()
+    _text_layers.clear()
+
+
+def photo_layer(asset, box_width, box_height):
+    """상자에 맞춘 미리보기 사진 층 (크기별로 캐시, 공유 객체이므로 수정 금지)
+
+    사진 층은 작업용 축소본에서 만들므로 디코더를 다시 쓰지 않습니다.
+    """
+    if asset.key is None:
+        return asset.fit(box_width, box_height)  # 메모리 사진은 구별할 키가 없음
+    size = asset.fit_size(box_width, box_height)
+    return _photo_layers.get((asset.key, size), lambda: asset.fit(box_width, box_height))
+
+
+def _draw_text_mask(layout, scale, canvas_size):
+    """글귀만 그린 마스크 (L 모드, 글자 부분이 255)"""
+    from PIL import Image, ImageDraw
+
+    fit = layout.fit
+    page_height = layout.page_size[1]
+    mask = Image.new('L', canvas_size, 0)
+    draw = ImageDraw.Draw(mask)
+    font = get_font(fit.font_size * scale)
+    text_y = layout.text_y
+    # 기준선 맞춤
+    for line in fit.lines:
+        draw.text(
+            (layout.text_x * scale, (page_height - text_y) * scale),
+            line,
+            fill=255,
+            font=font,
+            anchor='ls'
+        )
+        text_y -= fit.line_spacing
+    return mask
+
+
+def text_layer(layout, scale, canvas_size):
+    """글귀만 그린 마스크 층 (배치 조합별로 캐시, 공유 객체이므로 수정 금지)"""
+    fit = layout.fit
+    key = (tuple(fit.lines), fit.font_size, fit.line_spacing,
+           layout.text_x, layout.text_y, scale, canvas_size)
+    return _text_layers.get(key, lambda: _draw_text_mask(layout, scale, canvas_size))
+
+
+def _compose_page(layout, photo, scale, canvas_size, mask=None):
+    """흰 용지에 사진(배치 상자 가운데)과 글귀 마스크를 합성한 RGB 이미지"""
+    from PIL import Image
+
+    x, y, box_width, box_height = (v * scale for v in layout.image_box)
+    page = Image.new('RGB', canvas_size, 'white')
+    img_x = int(x + (box_width - photo.width) / 2)
+    img_y = int(canvas_size[1] - y - box_height + (box_height - photo.height) / 2)
+    page.paste(photo, (img_x, img_y))
+    if mask is not None:
+        page.paste('black', (0, 0), mask)
+    return page
+
+
+def render_preview(image, text="", ratio=50, width=PREVIEW_WIDTH, pagesize=A4):
+    """인쇄 미리보기 이미지(PIL RGB)를 생성
+
+    PDF와 같은 배치를 축소해서 그리므로 줄바꿈과 글자 크기가 인쇄물과 같습니다.
+    캐시된 사진 층 위에 글귀 층을 합성하므로, 비율 슬라이더를 움직이거나
+    글귀를 고쳐도 사진을 다시 디코딩하거나 줄이지 않습니다.
+    글귀가 잘리면 결과 이미지의 info['truncated']가 True입니다.
+    """
+    with timing.trace('preview', image=image_label(image), chars=len(text)):
+        asset = load_asset(image)
+        layout = layout_page(asset, text, ratio, pagesize)
+        page_width, page_height = layout.page_size
+
+        # 용지 비율 그대로 축소
+        scale = width / page_width
+        canvas_size = (width, int(page_height * scale))
+
+        # 이미지를 배치 상자 가운데에 맞춘 크기로
+        _, _, box_width, box_height = layout.image_box
+        img_copy = photo_layer(asset, box_width * scale, box_height * scale)
+
+        with timing.span('draw'):
+            # 글귀 층 합성
+            fit = layout.fit
+            mask = text_layer(layout, scale, canvas_size) if fit else None
+            preview_img = _compose_page(layout, img_copy, scale, canvas_size, mask)
+
+    preview_img.info['truncated'] = bool(fit and fit.truncated)
+    return preview_img
+
+
+def render_page_image(image, text="", ratio=50, pagesize=A4, dpi=PRINT_RASTER_DPI):
+    """인쇄용 페이지 이미지(PIL RGB)를 dpi 해상도로 생성
+
+    PDF와 같은 배치를 미리보기처럼 그리지만, 사진은 원본에서 상자 크기에
+    맞춰 다시 만들고 층 캐시는 쓰지 않습니다 (큰 이미지로 캐시를 채우지 않도록).
+    """
+    asset = load_asset(image)
+    layout = layout_page(asset, text, ratio, pagesize)
+    scale = dpi / 72.0
+    canvas_size = tuple(max(1, round(v * scale)) for v in layout.page_size)
+    _, _, box_width, box_height = layout.image_box
+    target = limit_size((max(1, round(box_width * scale)), max(1, round(box_height * scale))))
+    photo = asset.resized(target)
+    with timing.span('draw'):
+        mask = _draw_text_mask(layout, scale, canvas_size) if layout.fit else None
+        return _compose_page(layout, photo, scale, canvas_size, mask)
+
+
+def render_sheet_images(pages, copies=1, per_sheet=1, pagesize=A4, dpi=PRINT_RASTER_DPI):
+    """render_copies_pdf와 같은 배치의 용지 이미지를 한 장씩 돌려주는 제너레이터
+
+    PDF를 해석하지 못하는 프린터로 보낼 때 씁니다. pages는 (사진, 글귀, 비율)
+    목록이며, 카드는 사진마다 한 번만 그려 자리마다 붙여 넣습니다.
+    메모리를 일정하게 유지하도록 용지를 한 장씩 만듭니다.
+    """
+    from PIL import Image, ImageDraw
+
+    pagesize = resolve_page_size(pagesize)
+    card = card_size(pagesize, per_sheet)
+    if not 1 <= copies <= MAX_COPIES:
+        raise ValueError(f"매수는 1에서 {MAX_COPIES} 사이여야 합니다: {copies}")
+    cols, rows, rotate = SHEET_LAYOUTS[per_sheet]
+    scale = dpi / 72.0
+    sheet_size = (round(pagesize[0] * scale), round(pagesize[1] * scale))
+
+    def finish(sheet):
+        # 칸 사이에 옅은 자르는 선 (_draw_cut_lines와 같은 색과 굵기)
+        draw = ImageDraw.Draw(sheet)
+        line_width = max(1, round(0.3 * scale))
+        for i in range(1, cols):
+            x = round(sheet_size[0] * i / cols)
+            draw.line([(x, 0), (x, sheet_size[1])], fill=(204, 204, 204), width=line_width)
+        for i in range(1, rows):
+            y = round(sheet_size[1] * i / rows)
+            draw.line([(0, y), (sheet_size[0], y)], fill=(204, 204, 204), width=line_width)
+        return sheet
+
+    sheet = None
+    slot = 0
+    for image, text, ratio in pages:
+        card_image = render_page_image(image, text, ratio, card, dpi)
+        if per_sheet == 1:
+            for _ in range(copies):
+                yield card_image
+            continue
+        if rotate:
+            # 카드 아래쪽이 칸의 오른쪽에 오도록 (_place_card와 같은 방향)
+            card_image = card_image.transpose(Image.Transpose.ROTATE_90)
+        for _ in range(copies):
+            if slot == 0:
+                sheet = Image.new('RGB', sheet_size, 'white')
+            sheet.paste(card_image, (round((slot % cols) * sheet_size[0] / cols),
+                                     round((slot // cols) * sheet_size[1] / rows)))
+            slot += 1
+            if slot == per_sheet:
+                yield finish(sheet)
+                slot = 0
+    if slot:
+        yield finish(sheet)
+
+
+def prerender_preview(image, text="", ratio=50, width=PREVIEW_WIDTH, pagesize=A4,
+                      stop=None):
+    """비율 슬라이더의 다른 위치에 쓸 사진 층을 미리 만들기 (가까운 값부터)
+
+    미리보기 스레드가 한가할 때 호출합니다. stop()이 True를 돌려주면 중단합니다.
+    """
+    asset = load_asset(image)
+    has_text = bool(normalize_caption(text))
+    scale = width / resolve_page_size(pagesize)[0]
+    for other in sorted(RATIO_RANGE, key=lambda r: abs(r - ratio)):
+        if stop is not None and stop():
+            return
+        _, _, box_width, box_height = image_box(asset.size, has_text, other, pagesize)
+        photo_layer(asset, box_width * scale, box_height * scale)
@@ -0,0 +1,443 @@
+"""
+로컬 HTTP 변환 서비스
+여러 대의 접수 PC가 프로그램을 각자 띄우지 않고, 한 PC에 켜 둔 서비스에 사진을
+보내 PDF나 미리보기 PNG를 받아 갑니다. 배치는 GUI의 PDF 저장과 같습니다.
+
+폰트를 미리 등록한 작업 프로세스 풀에서 변환하며, 대기 중인 요청이 많으면
+바로 503으로 거절합니다. 외부 서비스 없이 표준 라이브러리만 사용합니다.
+
+    POST /pdf        사진 -> PDF
+    POST /preview    사진 -> 인쇄 미리보기 PNG
+    GET  /health     상태 (작업자 수, 처리 중/대기 중 요청 수)
+    GET  /metrics    누적 요청 수와 처리 시간 분포
+
+사진은 요청 본문 그대로(Content-Type: image/jpeg 등) 보내고 글귀와 비율은
+주소 뒤에 붙이거나(?caption=...&ratio=60&width=600), multipart/form-data의
+image, caption, ratio, width 항목으로 보냅니다.
+
+사용 예:
+    python main.py --serve 8765 --workers 4
+    curl --data-binary @사진.jpg -H "Content-Type: image/jpeg" \\
+        "http://127.0.0.1:8765/pdf?caption=%EC%82%AC%EB%9E%91" -o 결과.pdf
+"""
+import io
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import renderer
+import timing
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# 작업자 수를 넘어 기다릴 수 있는 요청 수 (기본: 작업자 수의 2배)
+QUEUE_PER_WORKER = 2
+
+# 올릴 수 있는 사진 크기 (바이트)
+MAX_UPLOAD_BYTES = 64 * 1024 * 1024
+
+# 요청 하나의 최대 처리 시간 (초, 넘으면 504)
+REQUEST_TIMEOUT = 60
+
+# 미리보기 PNG 폭 범위 (픽셀)
+PREVIEW_WIDTH_RANGE = (100, 2000)
+
+# 처리 시간 분포를 계산할 최근 요청 수
+LATENCY_WINDOW = 1000
+
+# 작업 결과 (body는 PDF/PNG 바이트, stages는 단계별 ms)
+RenderResult = namedtuple('RenderResult', 'body truncated seconds stages')
+
+
+class BadRequest(Exception):
+    """잘못된 요청 (HTTP 상태 코드와 메시지)"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+_worker_options = {}
+
+
+def _init_worker(pagesize, dpi, quality, trace_path=None):
+    """작업 프로세스 초기화: 무거운 모듈과 한글 폰트를 미리 준비"""
+    # Ctrl+C는 부모 프로세스가 받아 풀을 정리함
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if trace_path:
+        timing.enable(trace_path)
+    _worker_options.update(pagesize=pagesize, dpi=dpi, quality=quality)
+    renderer.warm_up()
+
+
+def _ping():
+    """작업 프로세스가 준비됐는지 확인"""
+    return os.getpid()
+
+
+def _render(kind, data, caption, ratio, width):
+    """작업 프로세스에서 PDF 또는 미리보기 PNG 생성
+
+    사진이 잘못된 경우 ValueError를 돌려줍니다 (요청 오류로 처리).
+    """
+    from image_asset import ImageAsset
+
+    start = time.perf_counter()
+    try:
+        asset = ImageAsset(data, name=None)
+    except ValueError:
+        raise  # 화소 수 초과 등 (메시지 그대로 전달)
+    except Exception:
+        raise ValueError("사진을 열 수 없습니다 (지원하지 않는 형식이거나 손상된 파일).") from None
+    try:
+        pagesize = _worker_options['pagesize']
+        if kind == 'pdf':
+            extra = {}
+            body = renderer.render_pdf(
+                asset, caption, ratio, pagesize,
+                dpi=_worker_options['dpi'],
+                quality=_worker_options['quality'],
+                extra=extra
+            )
+            fit = extra['layout'].fit
+            truncated = bool(fit and fit.truncated)
+        else:
+            image = renderer.render_preview(asset, caption, ratio, width, pagesize)
+            buffer = io.BytesIO()
+            image.save(buffer, 'PNG')
+            body = buffer.getvalue()
+            truncated = bool(image.info.get('truncated'))
+    except (OSError, SyntaxError) as e:
+        # Pillow는 손상된 사진에 OSError/SyntaxError를 냄
+        raise ValueError(f"사진을 처리할 수 없습니다: {e}") from None
+    finally:
+        asset.close()
+
+    record = timing.last(kind) if timing.is_enabled() else None
+    stages = record['stages'] if record else {}
+    return RenderResult(body, truncated, time.perf_counter() - start, stages)
+
+
+class Metrics:
+    """요청 수와 처리 시간 통계 (스레드 안전)"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.counts = {}
+        self.latency = {'pdf': deque(maxlen=LATENCY_WINDOW),
+                        'preview': deque(maxlen=LATENCY_WINDOW)}
+        self._lock = threading.Lock()
+
+    def count(self, name):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def observe(self, kind, seconds):
+        with self._lock:
+            self.latency[kind].append(seconds)
+
+    def snapshot(self):
+        """JSON으로 내보낼 통계 (처리 시간은 ms 백분위수)"""
+        with self._lock:
+            counts = dict(self.counts)
+            latency = {kind: sorted(values) for kind, values in self.latency.items()}
+        result = {'uptime_s': round(time.time() - self.started, 1), 'requests': counts}
+        for kind, values in latency.items():
+            if not values:
+                continue
+            result[f'{kind}_ms'] = {
+                'count': len(values),
+                'p50': _percentile(values, 0.50),
+                'p95': _percentile(values, 0.95),
+                'p99': _percentile(values, 0.99),
+                'max': round(values[-1] * 1000, 1),
+            }
+        return result
+
+
+def _percentile(sorted_values, q):
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return round(sorted_values[index] * 1000, 1)
+
+
+class RenderService:
+    """작업 프로세스 풀과 대기열 한도
+
+    작업자 수 + max_queue개까지만 받고, 그 이상은 기다리게 하지 않고 바로 거절해
+    밀린 요청 때문에 모든 응답이 느려지지 않게 합니다.
+    """
+
+    def __init__(self, pagesize='A4', dpi=renderer.DEFAULT_DPI,
+                 quality=renderer.DEFAULT_JPEG_QUALITY, workers=None, max_queue=None):
+        self.pagesize = renderer.resolve_page_size(pagesize)
+        self.dpi = dpi
+        self.quality = quality
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = self.workers * QUEUE_PER_WORKER if max_queue is None else max_queue
+        self.metrics = Metrics()
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._lock = threading.Lock()
+        self._restart_lock = threading.Lock()   # 깨진 풀을 한 번만 다시 만들도록
+        self.active = 0
+        self.pool = None
+
+    def start(self):
+        """풀을 만들고 모든 작업 프로세스가 폰트를 준비할 때까지 대기"""
+        pool, count = self._new_pool()
+        with self._lock:
+            self.pool = pool
+        return count
+
+    def _new_pool(self):
+        """새 풀과 준비된 작업 프로세스 수 (폰트 준비를 기다리므로 _lock 밖에서 호출)"""
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.pagesize, self.dpi, self.quality, timing.log_path()),
+        )
+        pids = {f.result() for f in [pool.submit(_ping) for _ in range(self.workers)]}
+        return pool, len(pids)
+
+    def _restart(self, broken):
+        """작업 프로세스가 죽어 풀이 깨지면 새로 만듦
+
+        새 풀을 준비하는 동안 _lock을 잡지 않아 /health와 대기열 집계가 멈추지 않습니다.
+        """
+        with self._restart_lock:
+            if self.pool is not broken:
+                return  # 다른 요청이 이미 다시 만듦
+            broken.shutdown(wait=False, cancel_futures=True)
+            pool, _ = self._new_pool()
+            with self._lock:
+                self.pool = pool
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def health(self):
+        with self._lock:
+            active = self.active
+        return {
+            'status': 'ok',
+            'workers': self.workers,
+            'in_flight': min(active, self.workers),
+            'queued': max(0, active - self.workers),
+            'max_queue': self.max_queue,
+        }
+
+    def render(self, kind, data, caption, ratio, width):
+        """작업을 풀에 넣고 결과를 기다림 -> (RenderResult, 대기 시간)
+
+        대기열이 가득 차면 BadRequest(503)를 냅니다. 대기열 자리는 작업이 실제로
+        끝날 때 반납하므로, 시간 초과(504)로 먼저 응답한 작업도 끝날 때까지 자리를 차지합니다.
+        """
+        if not self._slots.acquire(blocking=False):
+            self.metrics.count('rejected')
+            raise BadRequest(503, "요청이 밀려 있습니다. 잠시 후 다시 시도하세요.")
+        with self._lock:
+            self.active += 1
+            pool = self.pool
+        submitted = time.perf_counter()
+        try:
+            future = pool.submit(_render, kind, data, caption, ratio, width)
+        except BrokenProcessPool:
+            self._release()
+            self._restart(pool)
+            raise
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        try:
+            result = future.result(timeout=REQUEST_TIMEOUT)
+        except BrokenProcessPool:
+            self._restart(pool)
+            raise
+        except FutureTimeout:
+            # 아직 시작하지 않은 작업만 취소됨 (이미 도는 작업은 끝날 때 자리를 반납)
+            future.cancel()
+            self.metrics.count('timeout')
+            raise BadRequest(504, f"{REQUEST_TIMEOUT}초 안에 처리하지 못했습니다.")
+        except ValueError as e:
+            raise BadRequest(422, str(e))
+        return result, time.perf_counter() - submitted - result.seconds
+
+    def _release(self, future=None):
+        """작업이 끝나면(또는 넣지 못하면) 대기열 자리 반납"""
+        with self._lock:
+            self.active -= 1
+        self._slots.release()
+
+
+def _parse_multipart(content_type, body):
+    """multipart/form-data 본문 -> 항목 이름: 바이트 사전"""
+    from email import policy
+    from email.parser import BytesParser
+
+    header = f"Content-Type: {content_type}\r\n\r\n".encode('latin-1')
+    message = BytesParser(policy=policy.HTTP).parsebytes(header + body)
+    if not message.is_multipart():
+        raise BadRequest(400, "multipart 본문을 해석할 수 없습니다.")
+    fields = {}
+    for part in message.iter_parts():
+        name = part.get_param('name', header='content-disposition')
+        if name:
+            fields[name] = part.get_payload(decode=True) or b''
+    return fields
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    """요청 하나 처리 (ThreadingHTTPServer가 요청마다 스레드에서 실행)"""
+
+    protocol_version = "HTTP/1.1"   # 연결 재사용 (부하 시험에 유리)
+    server_version = "PhotoPDF/1.0"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def log_message(self, format, *args):
+        # 요청마다 찍지 않음 (오류는 send_error에서 따로 출력)
+        pass
+
+    def send_body(self, status, content_type, body, headers=()):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def send_json(self, status, data, headers=()):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_body(status, "application/json; charset=utf-8", body, headers)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == '/health':
+            self.send_json(200, self.service.health())
+        elif path == '/metrics':
+            data = self.service.metrics.snapshot()
+            data.update(self.service.health())
+            self.send_json(200, data)
+        else:
+            self.send_json(404, {'error': "없는 주소입니다."})
+
+    def do_POST(self):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        kind = {'/pdf': 'pdf', '/preview': 'preview'}.get(url.path)
+        try:
+            body = self.read_body()
+            if kind is None:
+                raise BadRequest(404, "없는 주소입니다. (/pdf 또는 /preview)")
+            data, caption, ratio, width = self.read_fields(url.query, body)
+            self.service.metrics.count(kind)
+            result, waited = self.service.render(kind, data, caption, ratio, width)
+        except BadRequest as e:
+            self.service.metrics.count(f'error_{e.status}')
+            headers = [("Retry-After", "1")] if e.status == 503 else []
+            self.send_json(e.status, {'error': str(e)}, headers)
+            return
+        except Exception as e:
+            self.service.metrics.count('error_500')
+            print(f"❌ {self.path}: {e}", file=sys.stderr)
+            self.send_json(500, {'error': f"변환 중 오류가 발생했습니다: {e}"})
+            return
+
+        total = time.perf_counter() - start
+        self.service.metrics.observe(kind, total)
+        # 단계별 시간 (브라우저 개발자 도구와 부하 시험 도구에서 확인 가능)
+        timings = [f"queue;dur={waited * 1000:.1f}",
+                   f"render;dur={result.seconds * 1000:.1f}"]
+        timings += [f"{name};dur={ms:.1f}" for name, ms in result.stages.items()]
+        timings.append(f"total;dur={total * 1000:.1f}")
+        headers = [("Server-Timing", ", ".join(timings)),
+                   ("X-Caption-Truncated", "1" if result.truncated else "0")]
+        content_type = "application/pdf" if kind == 'pdf' else "image/png"
+        self.send_body(200, content_type, result.body, headers)
+
+    def read_body(self):
+        """요청 본문 읽기 (크기 제한 확인)"""
+        length = self.headers.get('Content-Length')
+        if length is None:
+            raise BadRequest(411, "Content-Length가 필요합니다.")
+        try:
+            length = int(length)
+        except ValueError:
+            raise BadRequest(400, "Content-Length가 잘못되었습니다.")
+        if length > MAX_UPLOAD_BYTES:
+            self.close_connection = True  # 본문을 읽지 않으므로 연결을 끊음
+            raise BadRequest(413, f"사진이 너무 큽니다 (최대 {renderer.format_size(MAX_UPLOAD_BYTES)}).")
+        return self.rfile.read(length)
+
+    def read_fields(self, query, body):
+        """본문과 주소 인자 -> (사진 바이트, 글귀, 비율, 미리보기 폭)"""
+        params = {k: v[-1] for k, v in parse_qs(query, keep_blank_values=True).items()}
+        content_type = self.headers.get('Content-Type', '')
+        if content_type.startswith('multipart/form-data'):
+            fields = _parse_multipart(content_type, body)
+            data = fields.pop('image', b'')
+            for name, value in fields.items():
+                try:
+                    params[name] = value.decode('utf-8')
+                except UnicodeDecodeError:
+                    raise BadRequest(400, f"{name} 항목은 UTF-8이어야 합니다.")
+        else:
+            data = body
+        if not data:
+            raise BadRequest(400, "사진이 없습니다.")
+
+        caption = renderer.normalize_caption(params.get('caption', params.get('text', '')))
+        try:
+            ratio = int(params.get('ratio', 50))
+            width = int(params.get('width', renderer.PREVIEW_WIDTH))
+        except ValueError:
+            raise BadRequest(400, "ratio와 width는 정수여야 합니다.")
+        if not 20 <= ratio <= 80:
+            raise BadRequest(400, "ratio 값은 20에서 80 사이여야 합니다.")
+        lo, hi = PREVIEW_WIDTH_RANGE
+        if not lo <= width <= hi:
+            raise BadRequest(400, f"width 값은 {lo}에서 {hi} 사이여야 합니다.")
+        return data, caption, ratio, width
+
+
+def parse_address(text):
+    """'포트' 또는 '호스트:포트' -> (호스트, 포트)"""
+    host, _, port = text.rpartition(':')
+    try:
+        return host or DEFAULT_HOST, int(port)
+    except ValueError:
+        raise ValueError(f"주소 형식이 잘못되었습니다: {text} (예: 8765, 127.0.0.1:8765)")
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, **options):
+    """서비스 실행 (Ctrl+C까지)"""
+    # 포트를 먼저 열어, 이미 쓰는 중이면 작업 프로세스를 띄우기 전에 실패
+    httpd = ThreadingHTTPServer((host, port), RenderHandler)
+    httpd.daemon_threads = True
+    service = httpd.service = RenderService(**options)
+    try:
+        started = time.perf_counter()
+        ready = service.start()
+        print(f"작업 프로세스 {ready}개 준비 ({time.perf_counter() - started:.2f}초)")
+        print(f"🌐 http://{host}:{httpd.server_port} 에서 대기 중 (Ctrl+C로 종료)")
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n종료합니다...")
+    finally:
+        httpd.server_close()
+        service.close()
+    return 0
@@ -0,0 +1,174 @@
+"""
+PDF 파일 크기 제한
+일부 프린터와 메일 서버가 큰 파일을 받지 못하므로, 정한 크기(예: 1MB) 안에 들도록
+사진의 해상도, JPEG 품질, 흑백 여부를 자동으로 고릅니다.
+
+PDF 크기는 (글귀와 폰트 등 고정 부분) + (사진 데이터)이고, 사진 데이터는 같은
+품질이면 DPI의 거듭제곱(대략 2~3제곱)에 비례합니다. 만들어 본 결과로 목표 크기에
+맞는 DPI를 계산하고, 두 번 이상 만들었으면 지수도 실측으로 고칩니다.
+지정한 설정으로 들어가면 한 번, 해상도만 낮추면 2~3번, 품질이나 흑백까지
+낮춰야 하면 보통 3~7번 만들어 봅니다
+(단계마다 최대 3번 + 여유가 남으면 해상도를 올려 보는 1번).
+
+화질을 덜 해치는 순서로 낮춥니다: 해상도(200 DPI까지) -> 품질 75 + 150 DPI까지
+-> 품질 60 + 100 DPI까지 -> 흑백 -> 품질 45 + 72 DPI까지.
+"""
+import math
+import re
+from collections import namedtuple
+
+import renderer
+
+# 낮추는 단계: (JPEG 품질, 흑백, 이 단계의 최저 DPI), 품질 None은 지정한 품질 그대로
+BUDGET_STEPS = (
+    (None, False, 200),
+    (75, False, 150),
+    (60, False, 100),
+    (60, True, 100),
+    (45, True, 72),
+)
+
+# 예측 오차를 감안해 목표 크기의 이 비율을 노림
+TARGET_RATIO = 0.97
+
+# 사진 바이트 ~ DPI^SIZE_EXPONENT (실측값이 둘 이상이면 그 값으로 대체)
+SIZE_EXPONENT = 2.5
+
+# 맞췄는데 사진이 목표의 이 비율보다 작으면 해상도를 한 번 올려 봄
+LOOSE_FIT = 0.8
+
+# 같은 품질로 예측한 DPI가 단계 최저 DPI의 이 비율보다 낮으면 그 단계를 건너뜀
+SKIP_RATIO = 0.9
+
+# 한 단계에서 DPI를 다시 계산하는 최대 횟수
+MAX_CORRECTIONS = 2
+
+# 크기 제한 선택지 (GUI)
+SIZE_CHOICES = ("제한 없음", "500KB", "1MB", "2MB", "5MB", "10MB")
+
+# 고른 설정 (dpi: 사진 해상도, 0이면 원본 그대로 / size: 최종 PDF 바이트 / attempts: 만든 횟수)
+BudgetChoice = namedtuple('BudgetChoice', 'dpi quality gray size attempts')
+
+_UNITS = {'': 1, 'B': 1, 'K': 1024, 'KB': 1024, 'M': 1024 ** 2, 'MB': 1024 ** 2}
+
+
+def parse_size(text):
+    """'1MB', '500KB', '1.5M' 같은 크기 문자열을 바이트로 ('제한 없음'이나 빈 값은 None)"""
+    text = (text or "").strip().upper().replace(' ', '')
+    if not text or text in ("0", "제한없음"):
+        return None
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([KM]?B?)', text)
+    if not match:
+        raise ValueError(f"크기 형식이 잘못되었습니다: {text} (예: 1MB, 500KB)")
+    size = int(float(match.group(1)) * _UNITS[match.group(2)])
+    if size <= 0:
+        raise ValueError(f"크기는 0보다 커야 합니다: {text}")
+    return size
+
+
+def describe(choice):
+    """표시용 요약 (예: '180 DPI, 품질 75, 컬러 -> 0.98MB (3번 시도)')"""
+    dpi = f"{choice.dpi} DPI" if choice.dpi else "원본 해상도"
+    color = "흑백" if choice.gray else "컬러"
+    return (f"{dpi}, 품질 {choice.quality}, {color} -> "
+            f"{renderer.format_size(choice.size)} ({choice.attempts}번 시도)")
+
+
+def _pages(extra):
+    """render 결과 extra의 (PageLayout, EmbedInfo) 목록 (한 장/여러 장 공통)"""
+    if 'layouts' in extra:
+        return list(zip(extra['layouts'], extra['embeds']))
+    return [(extra['layout'], extra['embed'])]
+
+
+def _image_bytes(extra):
+    return sum(embed.embedded_bytes for _, embed in _pages(extra))
+
+
+def _effective_dpi(extra):
+    """실제로 넣은 사진의 해상도 (원본을 그대로 넣었으면 원본 화소 기준)"""
+    best = 0.0
+    for layout, embed in _pages(extra):
+        box_width = layout.image_box[2]
+        if embed.pixel_size and box_width > 0:
+            best = max(best, embed.pixel_size[0] / (box_width / 72.0))
+    return best
+
+
+def _solve_dpi(points, target):
+    """(DPI, 사진 바이트) 측정값으로 사진이 target 바이트가 되는 DPI 예측"""
+    d1, b1 = points[-1]
+    k = SIZE_EXPONENT
+    for d0, b0 in reversed(points[:-1]):
+        if abs(d0 - d1) > 0.05 * d1 and b0 > 0 and b1 > 0 and b0 != b1:
+            k = min(3.5, max(1.5, math.log(b1 / b0) / math.log(d1 / d0)))
+            break
+    return d1 * (target / max(b1, 1)) ** (1.0 / k)
+
+
+def render_within(render, max_bytes, dpi=renderer.DEFAULT_DPI,
+                  quality=renderer.DEFAULT_JPEG_QUALITY):
+    """max_bytes 안에 드는 PDF를 만들어 (바이트, extra, BudgetChoice) 반환
+
+    render는 render(dpi, quality, gray, extra, reencode) -> PDF 바이트 형태의 함수로,
+    renderer.render_pdf 등을 감싸서 넘깁니다. 지정한 설정으로 먼저 만들어 보고
+    넘칠 때만 낮춥니다. 낮춘 설정으로는 reencode=True로 만들어, 다시 인코딩한 것보다
+    작은 JPEG 원본도 낮춘 설정으로 다시 인코딩합니다 (원본을 그대로 넣으면 낮춰도 줄지 않음).
+    가장 낮은 설정으로도 넘치면 ValueError를 냅니다.
+    """
+    attempts = []
+
+    def attempt(d, q, gray, reencode=True):
+        extra = {}
+        data = render(int(round(d)), q, gray, extra, reencode)
+        attempts.append(len(data))
+        return data, extra
+
+    data, extra = attempt(dpi, quality, False, reencode=False)
+    if len(data) <= max_bytes:
+        return data, extra, BudgetChoice(dpi, quality, False, len(data), len(attempts))
+
+    # 글귀, 폰트, 페이지 구조 등 사진이 아닌 부분 (설정과 관계없이 거의 일정)
+    fixed = len(data) - _image_bytes(extra)
+    target = max_bytes * TARGET_RATIO - fixed
+    if target <= 0:
+        raise ValueError(
+            f"사진을 빼고도 {renderer.format_size(fixed)}라 "
+            f"{renderer.format_size(max_bytes)} 안에 넣을 수 없습니다 (글귀나 장수를 줄이세요).")
+
+    top = _effective_dpi(extra) or dpi
+    if dpi:
+        top = min(top, dpi)
+    last = (top, _image_bytes(extra))
+    last_setting = (quality, False)
+
+    for step_quality, gray, floor in BUDGET_STEPS:
+        q = min(quality, step_quality) if step_quality else quality
+        floor = min(floor, top)
+        if (q, gray) == last_setting and _solve_dpi([last], target) < floor * SKIP_RATIO:
+            continue  # 같은 설정의 실측으로 보아 최저 DPI로도 넘침: 만들어 보지 않고 건너뜀
+        last_setting = (q, gray)
+        # 직전 결과로 목표 크기가 되는 DPI 예측 (품질이 바뀌면 이 단계의 실측으로 보정)
+        points = []
+        d = max(floor, min(top, _solve_dpi([last], target)))
+        for _ in range(MAX_CORRECTIONS + 1):
+            data, extra = attempt(d, q, gray)
+            image_bytes = _image_bytes(extra)
+            points.append((d, image_bytes))
+            last = (d, image_bytes)
+            if len(data) <= max_bytes:
+                if d < top and image_bytes < target * LOOSE_FIT:
+                    # 품질을 낮춰 여유가 많이 남음: 해상도를 한 번 올려 봄
+                    higher = min(top, _solve_dpi(points, target))
+                    better, better_extra = attempt(higher, q, gray)
+                    if len(better) <= max_bytes:
+                        d, data, extra = higher, better, better_extra
+                return data, extra, BudgetChoice(int(round(d)), q, gray, len(data), len(attempts))
+            if d <= floor:
+                break  # 이 단계로는 안 됨: 다음 단계로
+            # 실측으로 다시 계산 (같은 DPI를 되풀이하지 않도록 조금 더 낮춤)
+            d = max(floor, min(d * 0.98, _solve_dpi(points, target)))
+
+    raise ValueError(
+        f"가장 낮은 설정으로도 {renderer.format_size(min(attempts))}라 "
+        f"{renderer.format_size(max_bytes)} 안에 넣을 수 없습니다.")
@@ -0,0 +1,92 @@
+"""
+프로그램 시작 시간 측정
+PHOTO_PDF_STARTUP 환경 변수를 켜면 모듈별 불러오기 시간(-X importtime 형식)과
+첫 화면이 그려지기까지의 단계별 시간을 출력합니다.
+값이 1이면 표준 오류로, 그 밖의 값이면 그 경로의 파일에 이어서 기록합니다.
+(실행 파일(.exe)에서는 콘솔이 없으므로 파일 경로를 지정하세요.)
+
+main.py에서 가장 먼저 불러와야 정확하게 측정됩니다.
+"""
+import _thread
+import builtins
+import os
+import sys
+import time
+
+START = time.perf_counter()
+ENABLED = bool(os.environ.get("PHOTO_PDF_STARTUP"))
+
+_imports = []   # (깊이, 모듈 이름, 자체 시간, 누적 시간) 마이크로초
+_stack = []     # 불러오는 중인 모듈별 하위 모듈 시간 합계
+_marks = []     # (단계 이름, 시작부터 경과 밀리초)
+_reported = False
+_original_import = builtins.__import__
+_main_thread = _thread.get_ident()
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """새로 불러온 모듈만 시간 기록 (이미 불러온 모듈은 그대로 통과)"""
+    if (level == 0 and not fromlist and name in sys.modules) or _thread.get_ident() != _main_thread:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    before = len(sys.modules)
+    depth = len(_stack)
+    _stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = (time.perf_counter() - start) * 1e6
+        children = _stack.pop()
+        if _stack:
+            _stack[-1] += elapsed
+        if len(sys.modules) > before:
+            if level and globals:
+                name = f"{globals.get('__package__') or ''}.{name}"
+            if fromlist:
+                name = f"{name} ({', '.join(fromlist)})"
+            _imports.append((depth, name, elapsed - children, elapsed))
+
+
+def mark(label):
+    """단계 완료 시점 기록 (보고서를 낸 뒤에는 바로 출력)"""
+    if not ENABLED:
+        return
+    elapsed = (time.perf_counter() - START) * 1000
+    _marks.append((label, elapsed))
+    if _reported:
+        _write([f"startup: {label:<24} {elapsed:8.1f} ms"])
+
+
+def first_frame():
+    """첫 화면이 그려진 뒤 호출: 단계별 시간과 불러오기 내역 출력"""
+    global _reported
+    if not ENABLED or _reported:
+        return
+    mark("첫 화면 표시")
+    builtins.__import__ = _original_import
+
+    lines = ["import time: self [us] | cumulative | imported package"]
+    # -X importtime처럼 하위 모듈을 먼저, 들여쓰기로 깊이 표시
+    for depth, name, self_us, total_us in _imports:
+        lines.append(f"import time: {self_us:9.0f} | {total_us:10.0f} | {'  ' * depth}{name}")
+    lines.append("")
+    for label, elapsed in _marks:
+        lines.append(f"startup: {label:<24} {elapsed:8.1f} ms")
+    _write(lines)
+    _reported = True
+
+
+def _write(lines):
+    target = os.environ.get("PHOTO_PDF_STARTUP", "1")
+    text = "\n".join(lines) + "\n"
+    if target == "1":
+        sys.stderr.write(text)
+        sys.stderr.flush()
+    else:
+        with open(target, "a", encoding="utf-8") as f:
+            f.write(text)
+
+
+if ENABLED:
+    builtins.__import__ = _timed_import
@@ -0,0 +1,54 @@
+"""
+여러 장 PDF: 동시에 준비하는 페이지가 사진 캐시보다 많아도 깨지지 않는지 확인
+"""
+import threading
+
+import pytest
+
+import image_asset
+import renderer
+
+PAGES = 3 * image_asset.CACHE_SIZE
+WORKERS = 2 * image_asset.CACHE_SIZE
+
+
+@pytest.fixture
+def photos(tmp_path, monkeypatch):
+    """메모리 매핑으로 읽히는 PNG 사진 PAGES장"""
+    from PIL import Image
+
+    monkeypatch.setattr(image_asset, 'MMAP_THRESHOLD', 0)
+    image_asset.clear_cache()
+    paths = []
+    for index in range(PAGES):
+        path = tmp_path / f"photo{index:02d}.png"
+        Image.new('RGB', (320, 240), (index * 10, 100, 200)).save(path)
+        paths.append(str(path))
+    yield paths
+    image_asset.clear_cache()
+
+
+def test_album_with_more_pages_in_flight_than_cache(photos, monkeypatch):
+    # 첫 작업자들이 모두 사진을 연 뒤에야 배치를 계산하게 해서
+    # 캐시에서 밀려난 사진을 아직 쓰는 상황을 매번 만듦
+    barrier = threading.Barrier(WORKERS, timeout=10)
+    first_round = iter(range(WORKERS))
+    lock = threading.Lock()
+    layout_page = renderer.layout_page
+
+    def layout_after_all_loaded(*args, **kwargs):
+        with lock:
+            waits = next(first_round, None) is not None
+        if waits:
+            barrier.wait()
+        return layout_page(*args, **kwargs)
+
+    monkeypatch.setattr(renderer, 'layout_page', layout_after_all_loaded)
+
+    extra = {}
+    data = renderer.render_album_pdf(
+        [(path, "", 50) for path in photos], dpi=150, workers=WORKERS, extra=extra)
+
+    assert data.startswith(b'%PDF')
+    assert len(extra['embeds']) == PAGES
+    assert all(embed.original_bytes > 0 for embed in extra['embeds'])
@@ -0,0 +1,53 @@
+"""
+폰트 디스크 캐시: 복원한 폰트가 라이브러리와 맞지 않으면 평소처럼 해석하는지 확인
+"""
+import glob
+import io
+import os
+import pickle
+
+import pytest
+
+import font_cache
+
+FONT = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+pytestmark = pytest.mark.skipif(not os.path.exists(FONT), reason="테스트용 폰트 없음")
+
+
+def _write_pdf(font):
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfgen import canvas
+
+    pdfmetrics.registerFont(font)
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer)
+    c.setFont(font.fontName, 12)
+    c.drawString(10, 10, "Hello 123")
+    c.save()
+    return buffer.getvalue()
+
+
+def test_restored_font_writes_pdf(tmp_path, monkeypatch):
+    monkeypatch.setenv("PHOTO_PDF_CACHE", str(tmp_path))
+    font_cache.load_ttfont("CacheFirst", FONT)
+    font = font_cache.load_ttfont("CacheSecond", FONT)  # 캐시에서 복원
+    assert _write_pdf(font).startswith(b"%PDF")
+
+
+def test_mismatched_cache_falls_back_to_parsing(tmp_path, monkeypatch):
+    monkeypatch.setenv("PHOTO_PDF_CACHE", str(tmp_path))
+    font_cache.load_ttfont("CacheBase", FONT)
+    entry_path, = glob.glob(os.path.join(str(tmp_path), "fonts", "*.pickle"))
+    with open(entry_path, "rb") as f:
+        entry = pickle.load(f)
+    # 라이브러리 내부 속성이 바뀐 것처럼 항목 하나를 뺌
+    del entry["face"]["hmetrics"]
+    with open(entry_path, "wb") as f:
+        pickle.dump(entry, f)
+
+    font = font_cache.load_ttfont("CacheStale", FONT)
+    assert hasattr(font.face, "hmetrics")
+    assert _write_pdf(font).startswith(b"%PDF")
+    with open(entry_path, "rb") as f:
+        assert "hmetrics" in pickle.load(f)["face"]  # 캐시도 새로 만듦
@@ -0,0 +1,74 @@
+"""
+사진 공유 자원: PDF에 넣는 JPEG가 한 번 읽은 바이트 그대로이고 다시 디코딩하지 않는지 확인
+"""
+import io
+import os
+
+import pytest
+from PIL import Image, ImageFile
+
+import image_asset
+import renderer
+
+FONT = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+
+def _jpeg(path, color):
+    Image.new('RGB', (600, 400), color).save(path, 'JPEG', quality=80)
+
+
+@pytest.fixture(autouse=True)
+def raw_streams(monkeypatch):
+    # PDF 안에서 원본 바이트를 찾을 수 있도록 사진 스트림을 ASCII85로 감싸지 않음
+    from reportlab import rl_config
+    monkeypatch.setattr(rl_config, 'useA85', 0)
+
+
+@pytest.fixture
+def font(tmp_path, monkeypatch):
+    if not os.path.exists(FONT):
+        pytest.skip("테스트용 폰트 없음")
+    monkeypatch.setenv("PHOTO_PDF_FONT", FONT)
+    monkeypatch.setenv("PHOTO_PDF_CACHE", str(tmp_path / "cache"))
+
+
+def test_jpeg_is_embedded_without_decoding(tmp_path, font, monkeypatch):
+    path = str(tmp_path / "photo.jpg")
+    _jpeg(path, (200, 40, 40))
+    with open(path, 'rb') as f:
+        original = f.read()
+
+    loads = []
+    real_load = ImageFile.ImageFile.load
+
+    def counting_load(img):
+        if img.format == 'JPEG':
+            loads.append(img.size)
+        return real_load(img)
+
+    monkeypatch.setattr(ImageFile.ImageFile, 'load', counting_load)
+    data = renderer.render_pdf(path, "글귀", 50)
+    assert original in data
+    assert loads == []
+
+
+def test_pdf_uses_bytes_read_once(tmp_path, font):
+    # 자원을 만든 뒤 파일이 바뀌어도 PDF에는 처음 읽은 사진이 들어감
+    path = str(tmp_path / "photo.jpg")
+    _jpeg(path, (200, 40, 40))
+    asset = image_asset.ImageAsset.from_path(path)
+    first = bytes(asset.data)
+    _jpeg(path, (40, 40, 200))
+
+    data = renderer.render_pdf(asset, "", 50)
+    assert first in data
+    with open(path, 'rb') as f:
+        assert f.read() not in data
+
+
+def test_bytes_only_jpeg_is_embedded_as_is(font):
+    # 파일 이름이 없는 자원(서버 업로드 등)도 원본 JPEG를 그대로 넣음
+    buffer = io.BytesIO()
+    Image.new('RGB', (600, 400), (10, 120, 10)).save(buffer, 'JPEG', quality=80)
+    data = renderer.render_pdf(buffer.getvalue(), "", 50)
+    assert buffer.getvalue() in data
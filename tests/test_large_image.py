@@ -0,0 +1,53 @@
+"""
+메모리 한도를 넘는 사진을 줄 묶음씩 풀어 줄인 결과가 전체를 풀어 줄인 결과와 같은지 확인
+"""
+import io
+import random
+
+import pytest
+from PIL import Image
+
+import image_asset
+import large_image
+
+FACTOR = 4
+
+
+def _photo(mode, size=(2400, 1800)):
+    """필터 종류가 골고루 쓰이도록 그라데이션과 잡음을 섞은 사진"""
+    rng = random.Random(1)
+    img = Image.linear_gradient('L').resize(size).convert('RGB')
+    noise = Image.frombytes('RGB', size, rng.randbytes(size[0] * size[1] * 3))
+    img = Image.blend(img, noise, 0.3)
+    if mode == 'P':
+        return img.quantize(64)
+    return img.convert(mode)
+
+
+@pytest.mark.parametrize('fmt, mode', [
+    ('PNG', 'RGB'), ('PNG', 'RGBA'), ('PNG', 'L'), ('PNG', 'P'),
+    ('BMP', 'RGB'), ('BMP', 'L'),
+])
+def test_strip_decode_matches_full_decode(monkeypatch, fmt, mode):
+    monkeypatch.setattr(large_image, '_budget', 4 * 1024 * 1024)
+    buffer = io.BytesIO()
+    _photo(mode).save(buffer, fmt)
+    asset = image_asset.ImageAsset(buffer.getvalue())
+    # 원본을 한 번에 풀면 한도를 넘는 크기
+    assert large_image.budget_scale(asset.size, asset.mode) < 1.0
+
+    strips = large_image.decode_in_strips(asset, asset.open(), FACTOR)
+
+    full = large_image.reducible(Image.open(io.BytesIO(asset.data))).reduce(FACTOR)
+    assert strips.size == full.size
+    assert strips.mode == full.mode
+    assert strips.tobytes() == full.tobytes()
+
+
+def test_16bit_png_is_refused():
+    # 16비트 PNG는 나눠 읽지 않고 이유를 알려 줌
+    buffer = io.BytesIO()
+    _photo('L').convert('I;16').save(buffer, 'PNG')
+    asset = image_asset.ImageAsset(buffer.getvalue())
+    with pytest.raises(large_image.ImageTooLargeError):
+        large_image.decode_in_strips(asset, asset.open(), FACTOR)
@@ -0,0 +1,42 @@
+"""
+사진 화소 수 제한: Pillow 전역 설정을 바꾸지 않고 MAX_PIXELS 기준으로 검사하는지 확인
+"""
+import struct
+import zlib
+
+import pytest
+from PIL import Image
+
+import image_asset
+import large_image
+
+
+def _png_header(width, height):
+    """크기만 적힌 PNG (Image.open은 헤더만 읽으므로 큰 크기도 바로 만들 수 있음)"""
+    def chunk(kind, data):
+        return (struct.pack('>I', len(data)) + kind + data
+                + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 0, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(b''))
+            + chunk(b'IEND', b''))
+
+
+def test_large_photo_opens_without_changing_pillow_limit():
+    default = Image.MAX_IMAGE_PIXELS
+    # Pillow 기본 한도(약 1.8억 화소에서 거부)보다 크고 MAX_PIXELS보다 작은 사진
+    asset = image_asset.ImageAsset(_png_header(20000, 10000))
+    assert asset.size == (20000, 10000)
+    assert Image.MAX_IMAGE_PIXELS == default
+
+
+@pytest.mark.filterwarnings('ignore::PIL.Image.DecompressionBombWarning')
+@pytest.mark.parametrize('size', [(20000, 20000), (40000, 20000)])
+def test_photo_over_max_pixels_is_rejected(size):
+    # 한도를 넘는 사진과, Pillow가 먼저 거부하는 한도 2배 넘는 사진 모두 같은 오류
+    default = Image.MAX_IMAGE_PIXELS
+    assert size[0] * size[1] > large_image.MAX_PIXELS
+    with pytest.raises(large_image.ImageTooLargeError):
+        image_asset.ImageAsset(_png_header(*size))
+    assert Image.MAX_IMAGE_PIXELS == default
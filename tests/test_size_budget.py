@@ -0,0 +1,97 @@
+"""
+PDF 크기 제한: 설정을 낮춰 가며 목표 크기 안에 드는 PDF를 고르는지 확인
+"""
+import os
+import random
+
+import pytest
+from PIL import Image
+
+import renderer
+import size_budget
+
+FONT = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+# 가짜 PDF: 사진을 뺀 고정 부분과 300 DPI·품질 90일 때 사진 크기
+FIXED_BYTES = 30_000
+PHOTO_BYTES = 900_000
+BOX_WIDTH = 504  # 7인치 (포인트)
+
+
+class FakeRender:
+    """사진 바이트가 DPI^2.5와 품질에 비례하는 render 함수 (호출 기록)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, dpi, quality, gray, extra, reencode):
+        self.calls.append((dpi, quality, gray, reencode))
+        photo = PHOTO_BYTES * (dpi / 300) ** 2.5 * (quality / 90) ** 2 * (0.55 if gray else 1.0)
+        pixels = (int(BOX_WIDTH / 72 * dpi), int(BOX_WIDTH / 72 * dpi * 0.75))
+        extra['layout'] = renderer.PageLayout(None, (0, 0, BOX_WIDTH, BOX_WIDTH * 0.75), 0, 0, None)
+        extra['embed'] = renderer.EmbedInfo(PHOTO_BYTES, int(photo), pixels, True)
+        return bytes(FIXED_BYTES + int(photo))
+
+
+def test_parse_size():
+    assert size_budget.parse_size("1MB") == 1024 ** 2
+    assert size_budget.parse_size("500kb") == 500 * 1024
+    assert size_budget.parse_size("제한 없음") is None
+    with pytest.raises(ValueError):
+        size_budget.parse_size("1GB")
+
+
+def test_fits_without_changes():
+    render = FakeRender()
+    data, _, choice = size_budget.render_within(render, 2 * 1024 ** 2)
+    assert choice.attempts == 1
+    assert (choice.dpi, choice.quality, choice.gray) == (300, 90, False)
+    assert render.calls == [(300, 90, False, False)]
+
+
+@pytest.mark.parametrize('max_bytes', [600_000, 250_000, 100_000, 40_000])
+def test_lowers_settings_until_it_fits(max_bytes):
+    render = FakeRender()
+    data, _, choice = size_budget.render_within(render, max_bytes)
+    assert len(data) == choice.size <= max_bytes
+    assert choice.attempts == len(render.calls) <= 8
+    # 처음 한 번만 지정한 설정 그대로, 낮춘 설정은 항상 다시 인코딩
+    assert [call[3] for call in render.calls] == [False] + [True] * (len(render.calls) - 1)
+
+
+def test_lowering_dpi_alone_keeps_color_and_quality():
+    _, _, choice = size_budget.render_within(FakeRender(), 600_000)
+    assert choice.quality == 90 and not choice.gray
+    assert 200 <= choice.dpi < 300
+
+
+def test_impossible_budget_raises():
+    with pytest.raises(ValueError):
+        size_budget.render_within(FakeRender(), FIXED_BYTES // 2)
+    with pytest.raises(ValueError):
+        size_budget.render_within(FakeRender(), FIXED_BYTES + 1000)
+
+
+@pytest.mark.skipif(not os.path.exists(FONT), reason="테스트용 폰트 없음")
+def test_small_jpeg_originals_are_reencoded(tmp_path, monkeypatch):
+    # 원본이 강하게 압축된 JPEG여서 다시 인코딩하면 원본보다 커지는 앨범
+    monkeypatch.setenv("PHOTO_PDF_FONT", FONT)
+    monkeypatch.setenv("PHOTO_PDF_CACHE", str(tmp_path / "cache"))
+    rng = random.Random(1)
+    pages = []
+    for i in range(3):
+        path = str(tmp_path / f"p{i}.jpg")
+        Image.frombytes('RGB', (1200, 900), rng.randbytes(1200 * 900 * 3)).save(path, 'JPEG', quality=15)
+        pages.append((path, "글귀", 50))
+
+    def render(dpi, quality, gray, extra, reencode):
+        return renderer.render_album_pdf(pages, dpi=dpi, quality=quality, extra=extra, gray=gray,
+                                         reencode=reencode, workers=2)
+
+    full = len(render(renderer.DEFAULT_DPI, renderer.DEFAULT_JPEG_QUALITY, False, {}, False))
+    max_bytes = int(full * 0.8)
+    data, extra, choice = size_budget.render_within(render, max_bytes)
+    assert len(data) <= max_bytes
+    # 원본을 그대로 넣지 않고 낮춘 설정으로 다시 인코딩했으므로 흑백까지 가지 않음
+    assert all(embed.resampled for embed in extra['embeds'])
+    assert not choice.gray
@@ -0,0 +1,226 @@
+"""
+글귀 줄바꿈과 글자 크기 맞춤: 예전 방식과 같은 결과를 내는지 확인
+"""
+import os
+import random
+
+import pytest
+
+import text_layout
+
+FONT = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+FONT_NAME = "LayoutTestFont"
+
+WORDS = ("사랑합니다", "어머니", "늘", "건강하세요", "감사", "the", "quick", "brown",
+         "fox", "jumps", "over", "lazy", "dog", "2024년", "봄날", "Hello,", "world!")
+
+
+@pytest.fixture(scope="module")
+def metrics():
+    if not os.path.exists(FONT):
+        pytest.skip("테스트용 폰트 없음")
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    pdfmetrics.registerFont(TTFont(FONT_NAME, FONT))
+    return text_layout.get_metrics(FONT_NAME)
+
+
+def _string_width(text, size):
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    return stringWidth(text, FONT_NAME, size)
+
+
+def _old_wrap(paragraph, size, max_width):
+    """예전 줄바꿈: 단어를 하나씩 붙여 stringWidth로 다시 재고, 넘치면 새 줄
+
+    줄 끝 공백은 폭에 넣지 않습니다 (새 엔진도 공백을 줄 끝에 걸침).
+    """
+    if _string_width(paragraph, size) <= max_width:
+        return [paragraph]
+    lines = []
+    current = ""
+    for word in paragraph.split(' '):
+        if current and _string_width(current + word, size) > max_width:
+            lines.append(current.rstrip(' '))
+            current = ""
+        current += word + ' '
+    lines.append(current.rstrip(' '))
+    return lines
+
+
+def _random_caption(rng, paragraphs=3):
+    return '\n'.join(
+        ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 30)))
+        for _ in range(paragraphs))
+
+
+def test_advances_match_string_width(metrics):
+    text = "Hello, 세상! 사랑합니다 0123"
+    for size in (7, 12.5, 24):
+        assert metrics.width(text, size) == pytest.approx(_string_width(text, size))
+
+
+def test_wrap_matches_old_word_wrap(metrics):
+    rng = random.Random(5)
+    for _ in range(300):
+        caption = _random_caption(rng)
+        size = rng.choice((7, 9.5, 12, 16, 24))
+        max_width = rng.uniform(150, 500)
+        expected = []
+        for paragraph in caption.split('\n'):
+            expected.extend(_old_wrap(paragraph, size, max_width) if paragraph.strip() else [""])
+        assert text_layout.wrap_text(caption, metrics, size, max_width, cjk_break=False) == expected
+
+
+def test_wrapped_lines_fit_width(metrics):
+    rng = random.Random(6)
+    for _ in range(200):
+        caption = _random_caption(rng).replace(' ', rng.choice((' ', '')))
+        size = rng.choice((7, 12, 24))
+        max_width = rng.uniform(60, 400)
+        for line in text_layout.wrap_text(caption, metrics, size, max_width):
+            assert _string_width(line, size) <= max_width + 1e-6 or len(line) == 1
+
+
+def test_hangul_breaks_between_syllables(metrics):
+    text = "가나다라마바사아자차카타파하" * 4
+    lines = text_layout.wrap_paragraph(text, metrics, 12, 100)
+    assert len(lines) > 1
+    assert ''.join(lines) == text
+    # 한글 줄바꿈을 끄면 나눌 곳이 없는 긴 단어로 보고 글자 단위로 자름 (결과는 같음)
+    assert text_layout.wrap_paragraph(text, metrics, 12, 100, cjk_break=False) == lines
+
+
+def test_long_word_is_cut_by_character(metrics):
+    word = "Supercalifragilisticexpialidocious" * 3
+    lines = text_layout.wrap_paragraph(word, metrics, 12, 120)
+    assert ''.join(lines) == word
+    assert all(_string_width(line, 12) <= 120 for line in lines)
+
+
+def test_blank_paragraphs_are_kept(metrics):
+    assert text_layout.wrap_text("첫 줄\n\n  \n끝", metrics, 12, 300) == ["첫 줄", "", "", "끝"]
+
+
+def _sizes(max_size=text_layout.MAX_FONT_SIZE, min_size=text_layout.MIN_FONT_SIZE,
+           step=text_layout.FONT_SIZE_STEP):
+    """큰 것부터 작은 것까지 맞춤 후보 크기"""
+    count = int(round((max_size - min_size) / step))
+    return [max_size] + [min_size + k * step for k in range(count - 1, -1, -1)]
+
+
+def _linear_fit(text, metrics, max_width, max_height):
+    """예전 방식: 최대 크기부터 한 단계씩 줄여 가며 처음 들어가는 크기"""
+    leading = text_layout.LEADING
+    for size in _sizes():
+        lines = text_layout.wrap_text(text, metrics, size, max_width)
+        if (len(lines) - 1) * size * leading <= max_height:
+            return size, lines, False
+    return text_layout.MIN_FONT_SIZE, None, True
+
+
+def test_fit_matches_linear_scan(metrics):
+    rng = random.Random(7)
+    for _ in range(300):
+        caption = _random_caption(rng, paragraphs=rng.randint(1, 4))
+        max_width = rng.uniform(100, 500)
+        max_height = rng.uniform(0, 400)
+        size, lines, truncated = _linear_fit(caption, metrics, max_width, max_height)
+        fit = text_layout.fit_text(caption, metrics, max_width, max_height)
+        assert (fit.font_size, fit.truncated) == (size, truncated)
+        if not truncated:
+            assert fit.lines == lines
+            assert fit.line_spacing == size * text_layout.LEADING
+
+
+@pytest.mark.parametrize('size', _sizes())
+def test_fit_finds_every_size(metrics, size):
+    # 크기마다 딱 그 크기까지만 들어가는 높이를 주면 그 크기를 찾아야 함
+    caption = "사랑합니다 어머니 늘 건강하세요 " * 12
+    max_width = 300
+    lines = text_layout.wrap_text(caption, metrics, size, max_width)
+    max_height = (len(lines) - 1) * size * text_layout.LEADING
+    expected, _, _ = _linear_fit(caption, metrics, max_width, max_height)
+    fit = text_layout.fit_text(caption, metrics, max_width, max_height)
+    assert fit.font_size == expected >= size
+    assert not fit.truncated
+
+
+def test_short_caption_uses_max_size(metrics):
+    fit = text_layout.fit_text("사랑합니다", metrics, 400, 0)
+    assert fit.font_size == text_layout.MAX_FONT_SIZE
+    assert fit.lines == ["사랑합니다"]
+    assert not fit.truncated
+
+
+def test_min_size_fits_without_truncation(metrics):
+    caption = "사랑합니다 어머니 늘 건강하세요 " * 40
+    max_width = 300
+    lines = text_layout.wrap_text(caption, metrics, text_layout.MIN_FONT_SIZE, max_width)
+    spacing = text_layout.MIN_FONT_SIZE * text_layout.LEADING
+    fit = text_layout.fit_text(caption, metrics, max_width, (len(lines) - 1) * spacing)
+    assert fit.font_size == text_layout.MIN_FONT_SIZE
+    assert fit.lines == lines
+    assert not fit.truncated
+
+
+def test_overflow_at_min_size_is_truncated(metrics):
+    caption = "사랑합니다 어머니 늘 건강하세요 " * 40
+    max_width = 300
+    lines = text_layout.wrap_text(caption, metrics, text_layout.MIN_FONT_SIZE, max_width)
+    spacing = text_layout.MIN_FONT_SIZE * text_layout.LEADING
+    max_height = (len(lines) - 2) * spacing + spacing / 2  # 마지막 한 줄이 넘침
+    fit = text_layout.fit_text(caption, metrics, max_width, max_height)
+    assert fit.truncated
+    assert fit.font_size == text_layout.MIN_FONT_SIZE
+    assert fit.lines == lines[:len(lines) - 1]
+
+
+def test_cached_wrap_matches_fresh_wrap(metrics):
+    rng = random.Random(8)
+    captions = [_random_caption(rng) for _ in range(50)]
+    text_layout.clear_wrap_cache()
+    first = [text_layout.wrap_text(c, metrics, 12, 250) for c in captions]
+    again = [text_layout.wrap_text(c, metrics, 12, 250) for c in captions]  # 캐시에서
+    text_layout.clear_wrap_cache()
+    fresh = [text_layout.wrap_text(c, metrics, 12, 250) for c in captions]
+    assert first == again == fresh
+
+
+def test_editing_one_paragraph_rewraps_only_it(metrics, monkeypatch):
+    paragraphs = ["사랑합니다 어머니 " * 8, "늘 건강하세요 " * 8, "the quick brown fox " * 8]
+    text_layout.clear_wrap_cache()
+    text_layout.wrap_text('\n'.join(paragraphs), metrics, 12, 250)
+
+    wrapped = []
+    real_wrap = text_layout.wrap_paragraph
+
+    def counting_wrap(text, *args):
+        wrapped.append(text)
+        return real_wrap(text, *args)
+
+    monkeypatch.setattr(text_layout, 'wrap_paragraph', counting_wrap)
+    paragraphs[1] += "감사합니다"
+    lines = text_layout.wrap_text('\n'.join(paragraphs), metrics, 12, 250)
+    assert wrapped == [paragraphs[1]]
+    monkeypatch.setattr(text_layout, 'wrap_paragraph', real_wrap)
+    text_layout.clear_wrap_cache()
+    assert lines == text_layout.wrap_text('\n'.join(paragraphs), metrics, 12, 250)
+
+
+def test_cache_key_includes_size_and_width(metrics):
+    text = "사랑합니다 어머니 늘 건강하세요 " * 6
+    text_layout.clear_wrap_cache()
+    wide = text_layout.wrap_text(text, metrics, 12, 400)
+    narrow = text_layout.wrap_text(text, metrics, 12, 150)
+    large = text_layout.wrap_text(text, metrics, 20, 400)
+    assert len(narrow) > len(wide) and len(large) > len(wide)
+
+
+def test_wrap_cache_is_bounded(metrics, monkeypatch):
+    monkeypatch.setattr(text_layout, 'WRAP_CACHE_SIZE', 10)
+    text_layout.clear_wrap_cache()
+    for n in range(30):
+        text_layout.wrap_text(f"문단 {n} " * 5, metrics, 12, 200)
+    assert len(text_layout._wrap_cache) <= 10
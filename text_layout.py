@@ -0,0 +1,257 @@
+"""
+글귀 줄바꿈 엔진
+PDF와 미리보기가 같은 글자 폭 표를 써서 똑같이 줄을 나눕니다.
+글자 폭은 폰트 단위(1000 = 1em)로 한 번만 재어 두고 크기에 비례해 사용합니다.
+줄바꿈 결과는 문단별로 기억해 두므로, 글귀를 고치면 바뀐 문단만 다시 나눕니다.
+"""
+import threading
+from collections import OrderedDict, namedtuple
+
+import timing
+
+# 한글 음절 범위 (가 ~ 힣)
+HANGUL_SYLLABLES = range(0xAC00, 0xD7A4)
+
+# 글자 단위 줄바꿈을 허용하는 문자 범위 (한글, 한자, 가나, 전각 문자)
+_CJK_RANGES = (
+    (0x1100, 0x11FF),   # 한글 자모
+    (0x2E80, 0x9FFF),   # CJK 부수, 가나, 한자
+    (0xA960, 0xA97F),   # 한글 자모 확장-A
+    (0xAC00, 0xD7AF),   # 한글 음절
+    (0xD7B0, 0xD7FF),   # 한글 자모 확장-B
+    (0xF900, 0xFAFF),   # CJK 호환 한자
+    (0xFF00, 0xFFEF),   # 전각 문자
+)
+
+
+def is_cjk(ch):
+    """글자 단위 줄바꿈이 가능한 문자인지"""
+    cp = ord(ch)
+    if cp < 0x1100:
+        return False
+    for lo, hi in _CJK_RANGES:
+        if lo <= cp <= hi:
+            return True
+    return False
+
+
+def build_width_table(face):
+    """TrueType 폰트 파일의 폭 표를 글자 -> 폭 사전으로 (한글 음절 블록 미리 계산)"""
+    char_widths = face.charWidths
+    default = face.defaultWidth
+    widths = {chr(cp): char_widths.get(cp, default) for cp in HANGUL_SYLLABLES}
+    widths.update({chr(cp): w for cp, w in char_widths.items()})
+    return widths
+
+
+class FontMetrics:
+    """폰트 하나의 글자 폭 표 (폰트 단위)"""
+
+    def __init__(self, font_name):
+        from reportlab.pdfbase import pdfmetrics
+        from font_cache import cached_widths
+
+        self.font_name = font_name
+        self._widths = {}
+        self._string_width = pdfmetrics.stringWidth
+
+        # 폰트 디스크 캐시에 미리 만든 표가 있으면 그대로 사용
+        table = cached_widths(font_name)
+        if table is not None:
+            self._widths.update(table)
+            return
+
+        font = pdfmetrics.getFont(font_name)
+        face = getattr(font, 'face', None)
+        if getattr(face, 'charWidths', None) is not None:
+            # TrueType: 폰트 파일의 폭 표를 그대로 사용
+            self._widths.update(build_width_table(face))
+
+    def _measure(self, ch):
+        w = self._string_width(ch, self.font_name, 1000)
+        self._widths[ch] = w
+        return w
+
+    def advances(self, text):
+        """글자별 폭 목록 (폰트 단위)"""
+        widths = self._widths
+        get = widths.get
+        result = [get(ch) for ch in text]
+        if None in result:
+            for i, w in enumerate(result):
+                if w is None:
+                    result[i] = self._measure(text[i])
+        return result
+
+    def width(self, text, size):
+        """문자열 폭 (포인트, pdfmetrics.stringWidth와 같은 값)"""
+        return sum(self.advances(text)) * size / 1000.0
+
+
+_metrics = {}
+
+
+def get_metrics(font_name):
+    """폰트 이름별 폭 표 (프로세스당 한 번 생성)"""
+    metrics = _metrics.get(font_name)
+    if metrics is None:
+        metrics = _metrics[font_name] = FontMetrics(font_name)
+    return metrics
+
+
+def wrap_paragraph(text, metrics, size, max_width, cjk_break=True):
+    """문단 하나를 한 번의 순회로 줄바꿈
+
+    공백 뒤에서 줄을 나누고, cjk_break가 켜져 있으면 한글/한자 앞에서도
+    나눕니다. 나눌 곳이 없는 긴 단어는 글자 단위로 자릅니다.
+    """
+    if not text.strip():
+        return [""]
+
+    advances = metrics.advances(text)
+    # 폰트 단위로 비교해 글자마다 곱셈을 하지 않음
+    limit = max_width * 1000.0 / size
+    if sum(advances) <= limit:
+        return [text]
+
+    lines = []
+    n = len(text)
+    start = 0          # 현재 줄 시작 위치
+    width = 0.0        # text[start:i] 폭
+    brk = -1           # 다음 줄이 시작될 수 있는 위치
+    brk_width = 0.0    # text[start:brk] 폭
+    i = 0
+    while i < n:
+        ch = text[i]
+        w = advances[i]
+
+        if ch == ' ':
+            # 공백은 줄 끝에 걸쳐도 되므로 항상 넣고, 그 뒤를 나눌 곳으로 기록
+            width += w
+            brk = i + 1
+            brk_width = width
+            i += 1
+            continue
+
+        # 한글 음절은 범위 비교로 바로 판정 (가장 흔한 경우)
+        if cjk_break and i > start and ch >= '\u1100' and (
+                '\uac00' <= ch <= '\ud7a3' or is_cjk(ch)):
+            brk = i
+            brk_width = width
+
+        if width + w > limit and i > start:
+            if brk > start and text[start:brk].strip(' '):
+                lines.append(text[start:brk].rstrip(' '))
+                width -= brk_width
+                start = brk
+            else:
+                # 나눌 곳이 없는 긴 단어는 글자 단위로 자름
+                lines.append(text[start:i])
+                width = 0.0
+                start = i
+            brk = -1
+            continue  # 같은 글자를 새 줄에서 다시 검사
+
+        width += w
+        i += 1
+
+    if start < n:
+        lines.append(text[start:].rstrip(' '))
+    return lines
+
+
+# 문단 줄바꿈 캐시 크기 (문단 x 글자 크기 조합 수)
+WRAP_CACHE_SIZE = 4096
+
+_wrap_cache = OrderedDict()   # (문단, 폰트, 크기, 폭, cjk_break) -> 줄 튜플
+_wrap_lock = threading.Lock()
+
+
+def wrap_cached(paragraph, metrics, size, max_width, cjk_break=True):
+    """문단 하나 줄바꿈 (같은 문단/폰트/크기/폭이면 이전 결과 재사용)"""
+    if not paragraph:
+        return ("",)
+    key = (paragraph, metrics.font_name, size, max_width, cjk_break)
+    with _wrap_lock:
+        lines = _wrap_cache.get(key)
+        if lines is not None:
+            _wrap_cache.move_to_end(key)
+            return lines
+
+    lines = tuple(wrap_paragraph(paragraph, metrics, size, max_width, cjk_break))
+
+    with _wrap_lock:
+        _wrap_cache[key] = lines
+        while len(_wrap_cache) > WRAP_CACHE_SIZE:
+            _wrap_cache.popitem(last=False)
+    return lines
+
+
+def clear_wrap_cache():
+    """문단 줄바꿈 캐시 비우기"""
+    with _wrap_lock:
+        _wrap_cache.clear()
+
+
+def wrap_text(text, metrics, size, max_width, cjk_break=True):
+    """여러 문단 글귀 줄바꿈 (빈 줄은 빈 문자열로 유지)
+
+    문단별 결과를 캐시하므로 한 문단만 고친 글귀는 그 문단만 다시 나눕니다.
+    """
+    lines = []
+    with timing.span('wrap'):
+        for paragraph in text.split('\n'):
+            lines.extend(wrap_cached(paragraph, metrics, size, max_width, cjk_break))
+    return lines
+
+
+# 글자 크기 맞춤 범위 (포인트)
+MAX_FONT_SIZE = 24
+MIN_FONT_SIZE = 7
+FONT_SIZE_STEP = 0.5
+
+# 줄 간격 (글자 크기 대비)
+LEADING = 1.25
+
+TextFit = namedtuple('TextFit', 'font_size line_spacing lines truncated')
+
+
+def fit_text(text, metrics, max_width, max_height,
+             max_size=MAX_FONT_SIZE, min_size=MIN_FONT_SIZE,
+             step=FONT_SIZE_STEP, leading=LEADING):
+    """영역에 들어가는 가장 큰 글자 크기를 이진 탐색으로 찾기
+
+    max_height는 첫 줄 기준선에서 마지막 줄 기준선까지 허용되는 높이입니다.
+    최소 크기로도 넘치면 들어가는 줄까지만 담고 truncated=True를 돌려줍니다.
+    """
+    def attempt(size):
+        lines = wrap_text(text, metrics, size, max_width)
+        return (len(lines) - 1) * size * leading <= max_height, lines
+
+    # 짧은 글귀는 최대 크기 한 번으로 끝
+    ok, lines = attempt(max_size)
+    if ok:
+        return TextFit(max_size, max_size * leading, lines, False)
+
+    # 크기 단계 k -> min_size + k*step, 들어가는 가장 큰 k 탐색
+    best = None
+    lo, hi = 0, int(round((max_size - min_size) / step)) - 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        size = min_size + mid * step
+        ok, lines = attempt(size)
+        if ok:
+            best = (size, lines)
+            lo = mid + 1
+        else:
+            hi = mid - 1
+
+    if best is not None:
+        size, lines = best
+        return TextFit(size, size * leading, lines, False)
+
+    # 최소 크기로도 넘침: 들어가는 줄까지만
+    spacing = min_size * leading
+    max_lines = max(0, int(max_height // spacing) + 1)
+    lines = wrap_text(text, metrics, min_size, max_width)
+    return TextFit(min_size, spacing, lines[:max_lines], True)
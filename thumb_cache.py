@@ -0,0 +1,147 @@
+"""
+사진 축소본 디스크 캐시
+매일 같은 공유 폴더의 사진을 다시 열 때 원본을 다시 디코딩하지 않도록
+화면용 축소본(긴 변 THUMB_EDGE)을 캐시 폴더에 저장해 두고 먼저 읽습니다.
+
+항목은 사진 경로, 파일 크기, 수정 시각으로 구분하므로 사진이 바뀌면 새로 만듭니다.
+전체 크기가 한도를 넘으면 오래 쓰지 않은 것부터 지웁니다 (읽을 때마다 수정 시각 갱신).
+PHOTO_PDF_CACHE 환경 변수로 캐시 폴더를 바꾸거나 off로 끌 수 있습니다.
+"""
+import hashlib
+import io
+import os
+import threading
+
+import timing
+from font_cache import cache_dir, write_atomic
+
+# 저장 형식이 바뀌면 올려서 예전 캐시를 무시
+CACHE_VERSION = 1
+
+# 저장할 축소본의 긴 변 길이 (image_asset.WORKING_SIZES 중 하나)
+THUMB_EDGE = 1024
+
+# 축소본 JPEG 품질 (화면 표시용)
+THUMB_QUALITY = 90
+
+# 캐시 폴더 전체 크기 한도
+CACHE_LIMIT_BYTES = 200 * 1024 * 1024
+
+_lock = threading.Lock()
+_total_bytes = None   # 캐시 폴더 전체 크기 (처음 저장할 때 계산)
+
+
+def _thumb_path(key):
+    """사진 키 (경로, 수정 시각, 크기)에 해당하는 축소본 파일 경로 (꺼져 있으면 None)"""
+    folder = cache_dir("thumbs")
+    if folder is None:
+        return None
+    raw = "|".join(map(str, (CACHE_VERSION, THUMB_EDGE, os.path.normcase(key[0])) + tuple(key[1:])))
+    name = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    return os.path.join(folder, name[:2], name + ".thumb")
+
+
+def load(key):
+    """저장된 축소본 (PIL 이미지, 없거나 읽을 수 없으면 None)"""
+    path = _thumb_path(key)
+    if path is None:
+        return None
+    from PIL import Image
+
+    with timing.span('thumb'):
+        try:
+            with open(path, "rb") as f:
+                img = Image.open(io.BytesIO(f.read()))
+                img.load()
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # 깨진 파일은 지우고 다시 만듦
+            _remove(path)
+            return None
+    try:
+        os.utime(path)  # 최근 사용 표시 (오래된 것부터 지우는 기준)
+    except OSError:
+        pass
+    return img
+
+
+def store(key, img):
+    """축소본 저장 (실패해도 무시)"""
+    global _total_bytes
+    path = _thumb_path(key)
+    if path is None:
+        return
+    buffer = io.BytesIO()
+    with timing.span('thumb'):
+        try:
+            if img.mode in ("RGB", "L"):
+                img.save(buffer, "JPEG", quality=THUMB_QUALITY)
+            else:
+                img.save(buffer, "PNG", compress_level=1)  # 투명도 등 보존
+            write_atomic(path, buffer.getvalue())
+        except (OSError, ValueError):
+            return
+
+    with _lock:
+        if _total_bytes is None:
+            _total_bytes = _folder_size()
+        else:
+            _total_bytes += buffer.tell()
+        if _total_bytes > CACHE_LIMIT_BYTES:
+            _total_bytes = _prune(CACHE_LIMIT_BYTES * 3 // 4)
+
+
+def _entries():
+    """캐시 폴더의 축소본 파일 목록 [(수정 시각, 크기, 경로)]"""
+    folder = cache_dir("thumbs")
+    result = []
+    if folder is None or not os.path.isdir(folder):
+        return result
+    for sub in os.scandir(folder):
+        if not sub.is_dir():
+            continue
+        for entry in os.scandir(sub.path):
+            if entry.name.endswith(".thumb"):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                result.append((st.st_mtime, st.st_size, entry.path))
+    return result
+
+
+def _folder_size():
+    return sum(size for _, size, _ in _entries())
+
+
+def _prune(target):
+    """전체 크기가 target 이하가 될 때까지 오래 쓰지 않은 것부터 삭제, 남은 크기 반환"""
+    entries = sorted(_entries())
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total <= target:
+            break
+        if _remove(path):
+            total -= size
+    return total
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
+def clear_cache():
+    """디스크의 축소본 캐시 삭제"""
+    import shutil
+
+    global _total_bytes
+    folder = cache_dir("thumbs")
+    if folder and os.path.isdir(folder):
+        shutil.rmtree(folder, ignore_errors=True)
+    with _lock:
+        _total_bytes = None
@@ -0,0 +1,214 @@
+"""
+단계별 시간 기록
+사진 표시, 미리보기, PDF 만들기, 인쇄가 어느 단계(파일 읽기, 디코딩, 축소, 폰트,
+줄바꿈, 글자 크기 맞춤, 그리기, 저장, 전송)에서 시간이 걸리는지 기록합니다.
+
+PHOTO_PDF_TRACE 환경 변수(또는 명령줄 --trace)로 켭니다.
+값이 1이면 캐시 폴더의 trace.jsonl에, 그 밖의 값이면 그 경로에 한 줄에 하나씩
+JSON으로 기록하며, 파일이 커지면 trace.jsonl.1, .2 ... 로 넘깁니다.
+꺼져 있으면 span()이 미리 만든 빈 객체를 돌려줄 뿐이라 비용이 거의 없습니다.
+
+    with timing.trace('preview', image=name):   # 작업 하나 (최상위)
+        with timing.span('decode'):              # 그 안의 단계
+            ...
+
+단계는 겹칠 수 있고(바깥 단계가 안쪽 단계를 포함), 같은 이름은 합산하며,
+여러 스레드에서 나눠 처리한 단계도 합산합니다.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+
+# 기록 파일 하나의 최대 크기와 보관 개수
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+
+_enabled = False
+_log_path = None
+_lock = threading.Lock()
+_last = {}   # 작업 이름 -> 마지막 기록
+
+_current = contextvars.ContextVar('photo_pdf_trace', default=None)
+
+
+class _NullSpan:
+    """꺼져 있을 때 쓰는 아무 일도 하지 않는 구간"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Trace:
+    """최상위 작업 하나의 단계별 시간"""
+
+    def __init__(self, op, fields):
+        self.op = op
+        self.fields = fields
+        self.stages = {}
+        self.lock = threading.Lock()
+
+    def add(self, name, seconds):
+        with self.lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+
+class _Span:
+    """단계 하나 (끝나면 현재 작업에 시간 합산)"""
+
+    __slots__ = ('name', 'trace', 'start')
+
+    def __init__(self, name, trace):
+        self.name = name
+        self.trace = trace
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _TraceScope:
+    """최상위 작업 구간 (끝나면 기록 파일에 한 줄 저장)"""
+
+    def __init__(self, op, fields):
+        self.trace = _Trace(op, fields)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.token = _current.set(self.trace)
+        return self.trace
+
+    def __exit__(self, exc_type, exc, tb):
+        total = time.perf_counter() - self.start
+        _current.reset(self.token)
+        trace = self.trace
+        record = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'op': trace.op,
+            'total_ms': round(total * 1000, 2),
+            'stages': {k: round(v * 1000, 2) for k, v in trace.stages.items()},
+            'thread': threading.current_thread().name,
+        }
+        if exc_type is not None:
+            record['error'] = exc_type.__name__
+        record.update(trace.fields)
+        with _lock:
+            _last[trace.op] = record
+        _write(record)
+        return False
+
+
+def enable(path=None):
+    """기록 켜기 (path가 None이나 '1'이면 캐시 폴더의 trace.jsonl)"""
+    global _enabled, _log_path
+    if not path or path == '1':
+        from font_cache import cache_dir
+        folder = cache_dir() or os.path.join(os.path.expanduser('~'), '.imgtxttopdf')
+        path = os.path.join(folder, 'trace.jsonl')
+    _log_path = path
+    _enabled = True
+    return path
+
+
+def disable():
+    """기록 끄기"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def log_path():
+    """기록 파일 경로 (꺼져 있으면 None)"""
+    return _log_path if _enabled else None
+
+
+def span(name):
+    """현재 작업 안의 단계 구간 (꺼져 있거나 작업 밖이면 빈 구간)"""
+    if not _enabled:
+        return _NULL_SPAN
+    trace = _current.get()
+    if trace is None:
+        return _NULL_SPAN
+    return _Span(name, trace)
+
+
+def trace(op, **fields):
+    """최상위 작업 구간 (이미 작업 안이면 op 이름의 단계로 취급)"""
+    if not _enabled:
+        return _NULL_SPAN
+    current = _current.get()
+    if current is not None:
+        return _Span(op, current)
+    return _TraceScope(op, fields)
+
+
+def bind(func):
+    """현재 작업을 이어받아 다른 스레드에서 실행할 함수로 감싸기"""
+    if not _enabled or _current.get() is None:
+        return func
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(func, *args, **kwargs)
+
+
+def last(op):
+    """작업 이름별 마지막 기록 (dict, 없으면 None)"""
+    with _lock:
+        return _last.get(op)
+
+
+def format_record(record):
+    """화면 표시용 요약 (예: '미리보기 12.3ms · decode 4.1 · draw 3.0')"""
+    if not record:
+        return ""
+    stages = sorted(record['stages'].items(), key=lambda item: -item[1])
+    parts = [f"{record['op']} {record['total_ms']:.1f}ms"]
+    parts += [f"{name} {ms:.1f}" for name, ms in stages]
+    return " · ".join(parts)
+
+
+def _write(record):
+    """기록 파일에 한 줄 추가 (크기가 넘치면 돌려쓰기)"""
+    path = _log_path
+    if not path:
+        return
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with _lock:
+        try:
+            folder = os.path.dirname(path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            if os.path.exists(path) and os.path.getsize(path) + len(line) > LOG_MAX_BYTES:
+                _rotate(path)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(line)
+        except OSError:
+            pass  # 기록 실패가 작업을 방해하지 않도록
+
+
+def _rotate(path):
+    """trace.jsonl -> .1 -> .2 ... (가장 오래된 것은 삭제)"""
+    for i in range(LOG_BACKUPS - 1, 0, -1):
+        src = f"{path}.{i}"
+        if os.path.exists(src):
+            os.replace(src, f"{path}.{i + 1}")
+    os.replace(path, f"{path}.1")
+
+
+if os.environ.get('PHOTO_PDF_TRACE', '').lower() not in ('', '0', 'off', 'no'):
+    enable(os.environ['PHOTO_PDF_TRACE'])
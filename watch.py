@@ -0,0 +1,601 @@
+"""
+핫 폴더 감시 모드
+입력 폴더에 사진(과 같은 이름의 .txt 글귀 파일)이 들어오면 출력 폴더에 PDF를 만들고,
+원하면 바로 인쇄합니다. 창 없이 계속 켜 두는 용도입니다.
+
+- 변경 알림: Linux는 inotify, Windows는 ReadDirectoryChangesW를 ctypes로 사용해
+  폴더가 조용할 때는 알림을 기다리기만 합니다. 그 밖의 환경에서는 폴더의
+  수정 시각만 확인하고, 바뀌었을 때만 목록을 다시 읽습니다.
+- 쓰는 중인 파일: 크기와 수정 시각이 STABLE_SECONDS 동안 그대로일 때 처리합니다.
+  글귀 파일이 아직 없는 사진은 뒤따라 올 .txt를 위해 CAPTION_WAIT_SECONDS까지 기다립니다.
+- 처리 기록: 출력 폴더의 INDEX_NAME 파일에 사진별 크기, 수정 시각, 해시를
+  저장해 다시 시작해도 이미 만든 PDF는 건너뜁니다. 기록은 사진 내용 기준이라
+  PDF를 만든 뒤에 들어온 글귀 파일 때문에 다시 만들거나 인쇄하지 않습니다.
+- 작업: batch와 같은 작업 프로세스 풀에 동시에 작업자 수의 2배까지만 넣습니다.
+  작업 프로세스가 죽어 풀이 깨지면 새 풀을 만들고 그 사진들을 다시 넣습니다.
+
+사용 예:
+    python main.py --watch 받은사진 -o 완성PDF
+    python main.py --watch 받은사진 -o 완성PDF --print
+"""
+import hashlib
+import json
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import renderer
+from batch import BatchJob, _render_job, start_pool
+from font_cache import write_atomic
+
+# 사진 확장자 (main.IMAGE_EXTENSIONS와 같음)
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif')
+
+# 크기와 수정 시각이 이 시간 동안 그대로면 다 쓴 파일로 봄 (초)
+STABLE_SECONDS = 1.0
+
+# 글귀 파일이 없는 사진은 같은 이름의 .txt가 뒤따라 올 수 있도록 이만큼 기다림 (초)
+CAPTION_WAIT_SECONDS = 3.0
+
+# 작업 프로세스가 죽었을 때 같은 사진을 다시 시도하는 횟수
+POOL_RETRIES = 2
+
+# 쓰는 중인 파일을 다시 확인하는 간격 (초)
+CHECK_SECONDS = 0.25
+
+# 할 일이 없을 때 깨어나는 간격 (Ctrl+C 응답용, 폴더는 읽지 않음)
+IDLE_WAKE_SECONDS = 1.0
+
+# 알림을 쓸 수 없을 때 폴더 수정 시각을 확인하는 간격 (초)
+POLL_SECONDS = 2.0
+
+# 처리 기록 파일 이름 (출력 폴더에 저장)
+INDEX_NAME = ".photo_pdf_index.json"
+
+# 복사 프로그램의 임시 파일 (무시)
+_TEMP_SUFFIXES = ('.tmp', '.part', '.crdownload', '.partial')
+
+# 폴더 전체를 다시 읽어야 함 (알림 유실 등)
+RESCAN = None
+
+
+def file_sha1(path):
+    """파일 내용 SHA-1 (16진수)"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _is_candidate(name):
+    """처리 대상 이름인지 (사진 또는 글귀 파일, 숨김/임시 파일 제외)"""
+    lower = name.lower()
+    if name.startswith(('.', '~$')) or lower.endswith(_TEMP_SUFFIXES):
+        return False
+    return lower.endswith(IMAGE_EXTENSIONS) or lower.endswith('.txt')
+
+
+class ProcessedIndex:
+    """처리한 사진 기록 (이름 -> 크기, 수정 시각, 해시, 출력 파일)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding='utf-8') as f:
+                self.entries = json.load(f).get('files', {})
+        except (OSError, ValueError, AttributeError):
+            self.entries = {}
+
+    def output_path(self, name):
+        """이 사진으로 만든 PDF 경로 (기록이 없으면 None)"""
+        with self._lock:
+            entry = self.entries.get(name)
+        if not entry or not entry.get('output'):
+            return None
+        return os.path.join(os.path.dirname(self.path), entry['output'])
+
+    def has_output(self, name):
+        """이 사진으로 만든 PDF가 출력 폴더에 남아 있는지"""
+        path = self.output_path(name)
+        return path is not None and os.path.exists(path)
+
+    def is_done(self, name, image_path, st):
+        """이미 같은 사진으로 만든 PDF가 남아 있는지
+
+        크기와 수정 시각이 같으면 바로 판단하고, 수정 시각만 바뀌었으면
+        (다시 복사한 경우 등) 내용 해시를 비교합니다.
+        """
+        with self._lock:
+            entry = self.entries.get(name)
+        if not entry or entry.get('size') != st.st_size:
+            return False
+        if not self.has_output(name):
+            return False
+        if entry.get('mtime_ns') == st.st_mtime_ns:
+            return True
+        if entry.get('sha1') != file_sha1(image_path):
+            return False
+        with self._lock:
+            entry['mtime_ns'] = st.st_mtime_ns
+        self.save()
+        return True
+
+    def record(self, name, image_path, st, output):
+        with self._lock:
+            self.entries[name] = {
+                'size': st.st_size,
+                'mtime_ns': st.st_mtime_ns,
+                'sha1': file_sha1(image_path),
+                'output': output,
+            }
+        self.save()
+
+    def save(self):
+        """기록 파일 저장 (중간에 끊겨도 깨지지 않게 교체 방식)"""
+        with self._lock:
+            data = json.dumps({'version': 1, 'files': self.entries}, ensure_ascii=False, indent=1)
+        try:
+            write_atomic(self.path, data.encode('utf-8'))
+        except OSError as e:
+            print(f"⚠️ 처리 기록을 저장할 수 없습니다: {e}", file=sys.stderr)
+
+
+class _InotifyWatcher:
+    """Linux inotify 알림 (ctypes, 알림이 없으면 스레드가 잠들어 있음)"""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_ONLYDIR = 0x01000000
+    IN_CLOEXEC = 0o2000000
+
+    _EVENT = struct.Struct('iIII')
+
+    def __init__(self, folder, events):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        mask = (self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+                | self.IN_DELETE_SELF | self.IN_MOVE_SELF | self.IN_ONLYDIR)
+        if libc.inotify_add_watch(self.fd, os.fsencode(folder), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch 실패: {folder}")
+        self.events = events
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread = threading.Thread(target=self._run, name="watch-inotify", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        size = self._EVENT.size
+        while True:
+            ready, _, _ = select.select([self.fd, self._wake_r], [], [])
+            if self._wake_r in ready:
+                return
+            data = os.read(self.fd, 64 * 1024)
+            offset = 0
+            while offset + size <= len(data):
+                _, mask, _, length = self._EVENT.unpack_from(data, offset)
+                name = data[offset + size:offset + size + length].rstrip(b'\0')
+                offset += size + length
+                if mask & self.IN_Q_OVERFLOW:
+                    self.events.put(RESCAN)
+                elif mask & (self.IN_DELETE_SELF | self.IN_MOVE_SELF):
+                    self.events.put(RESCAN)
+                    return  # 감시 폴더가 사라짐
+                elif name:
+                    self.events.put(os.fsdecode(name))
+
+    def close(self):
+        os.write(self._wake_w, b'x')
+        self._thread.join(timeout=1)
+        for fd in (self.fd, self._wake_r, self._wake_w):
+            os.close(fd)
+
+
+class _WindowsWatcher:
+    """Windows ReadDirectoryChangesW 알림 (ctypes, 동기 호출로 대기)"""
+
+    FILE_LIST_DIRECTORY = 0x0001
+    FILE_SHARE_ALL = 0x0007
+    OPEN_EXISTING = 3
+    FILE_FLAG_BACKUP_SEMANTICS = 0x02000000
+    NOTIFY_FILTER = 0x0001 | 0x0008 | 0x0010   # 파일 이름, 크기, 마지막 쓰기
+
+    def __init__(self, folder, events):
+        import ctypes
+        from ctypes import wintypes
+
+        self.ctypes = ctypes
+        kernel32 = self.kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        kernel32.CreateFileW.restype = wintypes.HANDLE
+        kernel32.CreateFileW.argtypes = (
+            wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+            wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE)
+        kernel32.ReadDirectoryChangesW.argtypes = (
+            wintypes.HANDLE, wintypes.LPVOID, wintypes.DWORD, wintypes.BOOL,
+            wintypes.DWORD, ctypes.POINTER(wintypes.DWORD), wintypes.LPVOID, wintypes.LPVOID)
+        kernel32.CancelIoEx.argtypes = (wintypes.HANDLE, wintypes.LPVOID)
+        kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+
+        self.handle = kernel32.CreateFileW(
+            folder, self.FILE_LIST_DIRECTORY, self.FILE_SHARE_ALL, None,
+            self.OPEN_EXISTING, self.FILE_FLAG_BACKUP_SEMANTICS, None)
+        if self.handle in (None, wintypes.HANDLE(-1).value):
+            raise ctypes.WinError(ctypes.get_last_error())
+        self.events = events
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="watch-win32", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        from ctypes import wintypes
+
+        ctypes = self.ctypes
+        buffer = ctypes.create_string_buffer(64 * 1024)
+        returned = wintypes.DWORD()
+        while not self._closed:
+            ok = self.kernel32.ReadDirectoryChangesW(
+                self.handle, buffer, len(buffer), False, self.NOTIFY_FILTER,
+                ctypes.byref(returned), None, None)
+            if not ok:
+                if not self._closed:
+                    self.events.put(RESCAN)
+                return
+            if returned.value == 0:
+                self.events.put(RESCAN)  # 알림이 넘쳐 버려짐
+                continue
+            data = buffer.raw[:returned.value]
+            offset = 0
+            while True:
+                next_offset, _, length = struct.unpack_from('III', data, offset)
+                name = data[offset + 12:offset + 12 + length].decode('utf-16-le')
+                self.events.put(name)
+                if not next_offset:
+                    break
+                offset += next_offset
+
+    def close(self):
+        self._closed = True
+        self.kernel32.CancelIoEx(self.handle, None)
+        self._thread.join(timeout=1)
+        self.kernel32.CloseHandle(self.handle)
+
+
+class _PollingWatcher:
+    """알림을 쓸 수 없을 때: 폴더 수정 시각이 바뀌면 다시 읽도록 알림"""
+
+    def __init__(self, folder, events, interval=POLL_SECONDS):
+        self.folder = folder
+        self.events = events
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="watch-poll", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        last = None
+        while not self._stop.wait(self.interval):
+            try:
+                mtime = os.stat(self.folder).st_mtime_ns
+            except OSError:
+                continue
+            if last is not None and mtime != last:
+                self.events.put(RESCAN)
+            last = mtime
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(timeout=1)
+
+
+def open_watcher(folder, events):
+    """이 환경에서 쓸 수 있는 변경 알림 (이름, 감시 객체)"""
+    try:
+        if sys.platform.startswith('linux'):
+            return "inotify", _InotifyWatcher(folder, events)
+        if sys.platform == 'win32':
+            return "ReadDirectoryChangesW", _WindowsWatcher(folder, events)
+    except (OSError, AttributeError) as e:
+        print(f"⚠️ 폴더 변경 알림을 쓸 수 없어 주기적으로 확인합니다: {e}", file=sys.stderr)
+    return "폴더 시각 확인", _PollingWatcher(folder, events)
+
+
+class HotFolder:
+    """입력 폴더를 감시해 PDF를 만드는 서비스"""
+
+    def __init__(self, input_dir, output_dir, text="", ratio=50, pagesize='A4',
+                 dpi=renderer.DEFAULT_DPI, quality=renderer.DEFAULT_JPEG_QUALITY,
+                 workers=None, backend=None, log=print):
+        self.input_dir = os.path.abspath(input_dir)
+        self.output_dir = os.path.abspath(output_dir)
+        self.text = text
+        self.ratio = ratio
+        self.pagesize = renderer.resolve_page_size(pagesize)
+        self.dpi = dpi
+        self.quality = quality
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = backend      # printing.PrintBackend (None이면 저장만)
+        self.log = log
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.index = ProcessedIndex(os.path.join(self.output_dir, INDEX_NAME))
+        self.events = queue.Queue()
+        self.pending = {}           # 이름 -> (크기, 수정 시각, 마지막 변화 시각)
+        self.active = set()         # 작업 중인 이름
+        self._active_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.workers * 2)
+        self._stop = threading.Event()
+        self.finished = queue.Queue()   # (이름, stat, future) - 끝난 작업을 마무리 스레드로 넘김
+        self.pool = None
+        self.crashes = {}           # 이름 -> 작업 프로세스가 죽은 횟수 (_active_lock으로 보호)
+        self.done = 0
+        self.failed = 0
+        self._count_lock = threading.Lock()
+
+    def stop(self):
+        """감시 종료 요청 (다른 스레드에서 호출 가능)"""
+        self._stop.set()
+        self.events.put(RESCAN)
+
+    def run(self):
+        """종료 요청이나 Ctrl+C까지 감시 (진행 중인 작업은 끝까지 처리)"""
+        kind, watcher = open_watcher(self.input_dir, self.events)
+        self.log(f"👀 감시 중 ({kind}): {self.input_dir} -> {self.output_dir}")
+        if self.backend is not None:
+            self.log(f"🖨️ 완성된 PDF는 바로 인쇄합니다: {self.backend.describe()}")
+
+        self.pool = self.start_pool()
+        finisher = threading.Thread(target=self._finish_loop, name="watch-finish", daemon=True)
+        finisher.start()
+        try:
+            self.scan()  # 꺼져 있던 동안 들어온 사진 처리
+            while not self._stop.is_set():
+                timeout = CHECK_SECONDS if self.pending else IDLE_WAKE_SECONDS
+                try:
+                    item = self.events.get(timeout=timeout)
+                except queue.Empty:
+                    item = ()
+                items = [item]
+                while True:
+                    try:
+                        items.append(self.events.get_nowait())
+                    except queue.Empty:
+                        break
+                if RESCAN in items:
+                    self.scan()
+                for name in items:
+                    if isinstance(name, str):
+                        self.notice(name)
+                self.check_pending()
+        except KeyboardInterrupt:
+            self.log("\n종료합니다 (진행 중인 작업은 마저 끝냅니다)...")
+        finally:
+            watcher.close()
+            self.pool.shutdown(wait=True)
+            self.finished.put(None)  # 남은 인쇄와 기록까지 마친 뒤 종료
+            finisher.join()
+        self.log(f"완료 {self.done}장, 실패 {self.failed}장")
+
+    def start_pool(self):
+        return start_pool(self.output_dir, self.pagesize, self.dpi, self.quality, self.workers)
+
+    def _count(self, failed=False):
+        """완료/실패 수 더하기 (마무리 스레드에서 호출)"""
+        with self._count_lock:
+            if failed:
+                self.failed += 1
+            else:
+                self.done += 1
+
+    def scan(self):
+        """입력 폴더 전체 확인 (시작할 때와 알림이 유실됐을 때만)"""
+        try:
+            names = os.listdir(self.input_dir)
+        except OSError as e:
+            self.log(f"❌ 입력 폴더를 읽을 수 없습니다: {e}")
+            return
+        for name in sorted(names):
+            if not name.lower().endswith('.txt'):
+                self.notice(name)  # 글귀는 사진을 처리할 때 함께 읽음
+
+    def notice(self, name):
+        """바뀐 파일 이름 접수 (다 쓸 때까지 대기 목록에 둠)"""
+        name = os.path.basename(name)
+        if not _is_candidate(name):
+            return
+        caption = name.lower().endswith('.txt')
+        if caption:
+            image = self.image_for_caption(name)
+            if image is None:
+                return  # 사진이 들어오면 그때 함께 읽음
+            if image not in self.pending and self.index.has_output(image):
+                # 이미 만든(인쇄한) PDF는 글귀가 늦게 들어왔다고 다시 만들지 않음
+                self.log(f"⚠️ {name}: {image}의 PDF를 이미 만들어 글귀를 반영하지 않습니다 "
+                         f"(다시 만들려면 완성 PDF를 지우세요)")
+                return
+            name = image
+        try:
+            st = os.stat(os.path.join(self.input_dir, name))
+        except OSError:
+            self.pending.pop(name, None)  # 지워졌거나 옮겨짐
+            return
+        previous = self.pending.get(name)
+        if caption or previous is None or previous[:2] != (st.st_size, st.st_mtime_ns):
+            # 글귀 파일이 바뀌면 그 파일도 다 써질 때까지 사진을 다시 기다림
+            self.pending[name] = (st.st_size, st.st_mtime_ns, time.monotonic())
+
+    def image_for_caption(self, caption_name):
+        stem = os.path.splitext(caption_name)[0]
+        for ext in IMAGE_EXTENSIONS:
+            for candidate in (stem + ext, stem + ext.upper()):
+                if os.path.exists(os.path.join(self.input_dir, candidate)):
+                    return candidate
+        return None
+
+    def check_pending(self):
+        """크기와 수정 시각이 한동안 그대로인 파일을 작업으로 넘김"""
+        now = time.monotonic()
+        for name, (size, mtime, since) in list(self.pending.items()):
+            path = os.path.join(self.input_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                del self.pending[name]
+                continue
+            if (st.st_size, st.st_mtime_ns) != (size, mtime):
+                self.pending[name] = (st.st_size, st.st_mtime_ns, now)
+                continue
+            # 글귀 파일이 없으면 뒤따라 올 수 있도록 조금 더 기다림
+            wait = STABLE_SECONDS if self.caption_path(name) else CAPTION_WAIT_SECONDS
+            if now - since < wait or st.st_size == 0:
+                continue
+            try:
+                # 다른 프로그램이 쓰기 잠금 중이면(Windows) 열리지 않음
+                with open(path, 'rb'):
+                    pass
+            except OSError:
+                self.pending[name] = (size, mtime, now)
+                continue
+            del self.pending[name]
+            with self._active_lock:
+                if name in self.active:
+                    # 작업 중에 다시 바뀜: 끝난 뒤 다시 확인
+                    self.pending[name] = (size, mtime, now)
+                    continue
+            self.submit(name, st)
+
+    def caption_path(self, name):
+        """사진과 같은 이름의 .txt 글귀 파일 경로 (없으면 None)"""
+        stem = os.path.splitext(name)[0]
+        for caption_name in (stem + '.txt', stem + '.TXT'):
+            path = os.path.join(self.input_dir, caption_name)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def read_caption(self, name):
+        """사진과 같은 이름의 .txt 글귀 (없으면 기본 글귀)"""
+        path = self.caption_path(name)
+        if path is None:
+            return self.text
+        try:
+            with open(path, encoding='utf-8-sig') as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            self.log(f"⚠️ {os.path.basename(path)}: 글귀를 읽을 수 없어 기본 글귀를 씁니다 ({e})")
+        return self.text
+
+    def submit(self, name, st):
+        """처리 기록에 없으면 작업 풀에 넣기 (풀이 꽉 차면 자리가 날 때까지 대기)"""
+        image_path = os.path.join(self.input_dir, name)
+        output = os.path.splitext(name)[0] + '.pdf'
+        try:
+            if self.index.is_done(name, image_path, st):
+                return
+        except OSError:
+            return  # 확인 중에 지워짐
+
+        self._slots.acquire()
+        with self._active_lock:
+            self.active.add(name)
+        job = BatchJob(image_path, self.read_caption(name), self.ratio, output)
+        try:
+            future = self.pool.submit(_render_job, job)
+        except BrokenProcessPool:
+            # 작업 프로세스가 죽어 풀이 깨짐: 새 풀을 만들어 다시 넣음
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = self.start_pool()
+            future = self.pool.submit(_render_job, job)
+        # 풀의 결과 스레드는 큐에 넣기만 함 (인쇄와 해시 계산이 다른 작업의 완료를 막지 않게)
+        future.add_done_callback(lambda f: self.finished.put((name, st, f)))
+
+    def _finish_loop(self):
+        """끝난 작업을 차례로 마무리 (로그, 인쇄, 처리 기록, 자리 반납)"""
+        while True:
+            item = self.finished.get()
+            if item is None:
+                return
+            try:
+                self._finished(*item)
+            except Exception as e:  # 마무리 스레드가 멈추면 자리가 반납되지 않음
+                self.log(f"❌ {item[0]}: 마무리 중 오류 ({e})")
+
+    def _finished(self, name, st, future):
+        """작업 완료 처리 (마무리 스레드에서 호출)"""
+        try:
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                # 작업 프로세스가 죽음 (이 사진 때문이 아닐 수도 있음): 대기 목록으로 돌려
+                # 다음 작업을 넣을 때 새 풀에서 다시 시도
+                with self._active_lock:
+                    tries = self.crashes[name] = self.crashes.get(name, 0) + 1
+                if tries <= POOL_RETRIES:
+                    self.log(f"⚠️ {name}: 작업 프로세스가 멈춰 다시 시도합니다")
+                    self.events.put(name)
+                    return
+                with self._active_lock:
+                    self.crashes.pop(name, None)
+                self._count(failed=True)
+                self.log(f"❌ {name}: 작업 프로세스가 {tries}번 멈춰 처리하지 못했습니다")
+                return
+            except Exception as e:
+                error = e
+            else:
+                error = result.error
+            with self._active_lock:
+                self.crashes.pop(name, None)
+            if error:
+                self._count(failed=True)
+                self.log(f"❌ {name}: {error}")
+                return
+
+            out_path = os.path.join(self.output_dir, result.job.output)
+            self.log(f"✅ {name} -> {out_path} ({result.seconds:.2f}초)")
+            if result.truncated:
+                self.log(f"⚠️ {name}: 글귀가 길어 일부가 잘렸습니다")
+            if self.backend is not None:
+                import printing
+                try:
+                    self.print_result(result.job, out_path, os.path.splitext(name)[0])
+                    self.log(f"🖨️ {name}: 인쇄 대기열에 보냈습니다")
+                except (OSError, ValueError, printing.PrintError) as e:
+                    self._count(failed=True)
+                    self.log(f"❌ {name}: 인쇄 실패 ({e})")
+                    return
+            try:
+                self.index.record(name, result.job.image, st, result.job.output)
+            except OSError:
+                pass  # 사진이 그새 지워짐
+            self._count()
+        finally:
+            with self._active_lock:
+                self.active.discard(name)
+            self._slots.release()
+
+    def print_result(self, job, out_path, title):
+        """만든 PDF를 인쇄 (PDF를 해석하지 못하는 프린터는 같은 배치를 용지 이미지로 그려 보냄)"""
+        if self.backend.accepts_pdf:
+            with open(out_path, 'rb') as f:
+                self.backend.send(f.read(), title)
+            return
+        images = renderer.render_sheet_images(
+            [(job.image, job.caption, job.ratio)], pagesize=self.pagesize,
+            dpi=self.backend.raster_dpi)
+        self.backend.send_images(images, title)